@@ -0,0 +1,93 @@
+"""Micro-benchmark da formatação de resultados.
+
+Compara a formatação anterior do display (casas fixas + rstrip, com
+comparações via int() e inteiros.resumir para todo int) com
+formatacao.DISPLAY, em dois cenários:
+
+- valores distintos: cada valor é formatado uma única vez (pior caso
+  para o cache do formatador);
+- histórico reexibido: poucos milhares de valores formatados várias
+  vezes, como ao rolar o painel do histórico ou exportar de novo.
+
+    python benchmarks/bench_formatacao.py
+
+Medido (melhor de 30, três rodadas, máquina de 1 núcleo com bastante
+ruído), em relação à formatação anterior:
+
+- valores distintos: formatar 1,03x a 1,15x, lote 1,08x a 1,18x. O ganho
+  é marginal, da ordem do ruído. O arredondamento correto para 15
+  algarismos custa mais que as 10 casas fixas de antes;
+- histórico reexibido: formatar 1,1x a 1,5x, lote 1,2x a 1,55x.
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from calc import formatacao, inteiros  # noqa: E402
+
+REPETICOES = 5
+
+
+def formatar_anterior(resultado):
+    """motor.formatar_resultado antes de formatacao.py"""
+    if type(resultado) is int:
+        return inteiros.resumir(resultado)
+    if isinstance(resultado, (int, float)):
+        if abs(resultado) > 1e10 or (abs(resultado) < 1e-10 and resultado != 0):
+            return "{:.6e}".format(resultado)
+        elif resultado == int(resultado):
+            return str(int(resultado))
+        else:
+            s = "{:.10f}".format(resultado).rstrip('0').rstrip('.')
+            return s
+    return str(resultado)
+
+
+def amostra(quantidade, semente=1):
+    """Inteiros, floats inteiros, divisões, raízes, valores com centavos e extremos"""
+    aleatorio = random.Random(semente)
+    geradores = [
+        lambda: aleatorio.randint(-10_000, 10_000),
+        lambda: float(aleatorio.randint(0, 1000)),
+        lambda: aleatorio.randint(1, 1000) / aleatorio.randint(1, 1000),
+        lambda: aleatorio.random() ** 0.5,
+        lambda: round(aleatorio.uniform(-1000, 1000), 2),
+        lambda: aleatorio.random() * 10 ** aleatorio.randint(-15, 15),
+    ]
+    return [aleatorio.choice(geradores)() for _ in range(quantidade)]
+
+
+def novo_display():
+    """Formatador com a configuração do DISPLAY e cache vazio"""
+    d = formatacao.DISPLAY
+    return formatacao.FormatadorNumeros(d.digitos, d.maximo_fixo, d.minimo_fixo)
+
+
+def medir(nome, funcao, base=None, preparar=None):
+    tempos = []
+    for _ in range(REPETICOES):
+        alvo = preparar() if preparar else None
+        tempos.append(timeit.timeit(lambda: funcao(alvo), number=1))
+    melhor = min(tempos)
+    ganho = f"  ({base / melhor:.2f}x)" if base else ""
+    print(f"  {nome:<30}{melhor * 1000:9.1f} ms{ganho}")
+    return melhor
+
+
+def cenario(titulo, valores):
+    print(f"{titulo}: {len(valores)} formatações, melhor de {REPETICOES}")
+    base = medir("anterior", lambda _: [formatar_anterior(v) for v in valores])
+    medir("DISPLAY.formatar", lambda f: [f.formatar(v) for v in valores], base, novo_display)
+    medir("DISPLAY.lote", lambda f: f.lote(valores), base, novo_display)
+
+
+def main():
+    cenario("Valores distintos", amostra(100_000))
+    cenario("Histórico reexibido", amostra(4_000) * 25)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Calculadora científica GTK4.
+
+Módulos do pacote:
+
+- motor, expressao, funcoes, formatacao, inteiros, vetorizado: cálculo,
+  sem GTK;
+- historico, persistencia, busca: histórico em memória e em disco e a
+  busca indexada;
+- cache: resultados já calculados, em memória e em disco;
+- exportacao: exportadores TXT/CSV/JSONL/PDF/PNG;
+- janela, painel_historico: interface GTK4;
+- cli, gravacao, instrumentacao: linha de comando, gravação de sessões e
+  medição de latência.
+
+Nada é importado com ``import calc``: cada submódulo (e cada nome abaixo)
+é carregado no primeiro acesso, então uma sessão que só usa o teclado
+nunca importa o histórico em disco, a exportação, ReportLab ou Pillow.
+
+    >>> import calc
+    >>> calc.avaliar("2^10")
+    1024
+"""
+import importlib
+
+_SUBMODULOS = frozenset({
+    'busca', 'cache', 'cli', 'exportacao', 'expressao', 'formatacao',
+    'funcoes', 'gravacao', 'historico', 'instrumentacao', 'inteiros',
+    'janela', 'motor', 'painel_historico', 'persistencia', 'vetorizado',
+})
+
+# Nome público -> submódulo que o define
+_NOMES = {
+    'MotorCalculadora': 'motor',
+    'avaliar': 'expressao',
+    'Funcao': 'funcoes',
+    'registrar_funcao': ('funcoes', 'registrar'),
+    'formatar': 'formatacao',
+    'Historico': 'historico',
+    'ExportadorHistorico': 'exportacao',
+    'CacheResultados': 'cache',
+    'avaliar_array': 'vetorizado',
+}
+
+__all__ = sorted(_NOMES)
+
+
+def __getattr__(nome):
+    if nome in _SUBMODULOS:
+        return importlib.import_module(f"{__name__}.{nome}")
+    origem = _NOMES.get(nome)
+    if origem is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    modulo, atributo = origem if isinstance(origem, tuple) else (origem, nome)
+    valor = getattr(importlib.import_module(f"{__name__}.{modulo}"), atributo)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted({*globals(), *_SUBMODULOS, *_NOMES})
@@ -0,0 +1,6 @@
+"""``python -m calc``: o mesmo que o comando ``calc`` (ver cli.py)"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
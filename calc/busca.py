@@ -0,0 +1,447 @@
+"""Busca no histórico por palavras, valor do resultado e horário.
+
+Consultas (os filtros se combinam, todos precisam valer):
+
+    log                   expressões com uma palavra iniciada por "log"
+    log 100               ... que também tenham o número 100
+    > 1e6    <= 0    = 42 resultado comparado a um número
+    42                    o mesmo que "= 42"
+    entre 10 e 20         resultado no intervalo (também "between 10 and 20")
+    entre 10:00 e 11:00   operações de hoje nesse horário
+    > 2026-10-18          datas (AAAA-MM-DD[ HH:MM[:SS]]) também valem
+
+O IndiceHistorico é mantido por acréscimo junto com o Historico (ver
+Historico.indice e Historico.indexar), com as posições de cada operação
+nos dois lados do Historico (ver Historico.item_da_chave):
+
+- palavras das expressões (funções, constantes) -> posições, em arrays já
+  ordenados; o vocabulário é pequeno, então prefixos são resolvidos
+  percorrendo-o;
+- números das expressões -> posições, agrupados em baldes por hash (as
+  candidatas de um balde são confirmadas na expressão);
+- resultados numéricos numa lista ordenada em blocos: inserção com busca
+  binária nos máximos dos blocos (O(log n)) mais o deslocamento dentro de
+  um bloco de tamanho limitado, sem mover o resto da lista;
+- instantes: as colunas do Historico já estão em ordem, então intervalos
+  de horário são duas buscas binárias (Historico.posicoes_no_periodo).
+"""
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+LIMITE_RESULTADOS = 1000
+
+CARGA_BLOCO = 512   # elementos por bloco da lista ordenada (divide ao passar do dobro)
+
+# Números das expressões vão para um de BALDES_NUMEROS baldes (por hash):
+# poucas posições candidatas por número, sem um array por número distinto
+BALDES_NUMEROS = 1 << 14
+MAXIMO_TERMOS_EM_CACHE = 1 << 16
+
+# Palavras indexadas: letras fora de números (o "e" de 1e+20 não conta)
+_PALAVRA = re.compile(r"(?<![\w.])[^\W\d_]+|√")
+# Números indexados: sequências máximas de dígitos e pontos
+_NUMERO_EXPRESSAO = re.compile(r"[\d.]+")
+_TERMO_EXPRESSAO = re.compile(rf"{_PALAVRA.pattern}|{_NUMERO_EXPRESSAO.pattern}")
+_DIGITOS = frozenset("0123456789.")
+
+_NUMERO = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?"
+_INSTANTE = r"\d{4}-\d\d-\d\d(?:[ t]\d\d?:\d\d(?::\d\d)?)?|\d\d?:\d\d(?::\d\d)?"
+_VALOR = rf"{_INSTANTE}|{_NUMERO}"
+_DATA = re.compile(r"\d{4}-\d\d-\d\d")
+
+_ENTRE = re.compile(rf"\b(?:entre|between)\s+({_VALOR})\s+(?:e|and)\s+({_VALOR})(?![\w.:])")
+_COMPARACAO = re.compile(rf"(<=|>=|<|>|=)\s*({_VALOR})(?![\w.:])")
+_TERMO = re.compile(rf"{_NUMERO}|[^\W\d_]+|√")
+
+# Tolerância relativa de "= x" (0.1 + 0.2 aparece como 0.3 no display)
+_TOLERANCIA = 1e-12
+
+
+def palavras(expressao):
+    """Palavras indexadas de uma expressão, em minúsculas"""
+    return set(_PALAVRA.findall(expressao.lower()))
+
+
+def _como_float(valor):
+    try:
+        return float(valor)
+    except OverflowError:
+        return math.inf if valor > 0 else -math.inf
+
+
+class _ListaOrdenada:
+    """Pares ``(valor, chave)`` ordenados por valor, em blocos"""
+
+    def __init__(self, valores=(), chaves=()):
+        # ``valores`` já ordenados, ``chaves`` na mesma ordem
+        self._valores = [list(valores[i:i + CARGA_BLOCO]) for i in range(0, len(valores), CARGA_BLOCO)]
+        self._chaves = [list(chaves[i:i + CARGA_BLOCO]) for i in range(0, len(chaves), CARGA_BLOCO)]
+        self._maximos = [bloco[-1] for bloco in self._valores]
+        self._total = len(valores)
+
+    def __len__(self):
+        return self._total
+
+    def inserir(self, valor, chave):
+        self._total += 1
+        if not self._valores:
+            self._valores.append([valor])
+            self._chaves.append([chave])
+            self._maximos.append(valor)
+            return
+        i = min(bisect_left(self._maximos, valor), len(self._maximos) - 1)
+        valores, chaves = self._valores[i], self._chaves[i]
+        j = bisect_right(valores, valor)
+        valores.insert(j, valor)
+        chaves.insert(j, chave)
+        self._maximos[i] = valores[-1]
+        if len(valores) > 2 * CARGA_BLOCO:
+            self._valores[i + 1:i + 1] = [valores[CARGA_BLOCO:]]
+            self._chaves[i + 1:i + 1] = [chaves[CARGA_BLOCO:]]
+            del valores[CARGA_BLOCO:], chaves[CARGA_BLOCO:]
+            self._maximos[i:i + 1] = [valores[-1], self._valores[i + 1][-1]]
+
+    def contar(self, minimo, maximo, inclui_minimo=True, inclui_maximo=True):
+        """Quantos valores estão entre ``minimo`` e ``maximo`` (O(blocos))"""
+        inicio = bisect_left if inclui_minimo else bisect_right
+        fim = bisect_right if inclui_maximo else bisect_left
+        i = inicio(self._maximos, minimo)
+        j = min(fim(self._maximos, maximo), len(self._valores) - 1)
+        if i >= len(self._valores) or j < i:
+            return 0
+        if i == j:
+            valores = self._valores[i]
+            return max(fim(valores, maximo) - inicio(valores, minimo), 0)
+        total = len(self._valores[i]) - inicio(self._valores[i], minimo)
+        total += sum(map(len, self._valores[i + 1:j]))
+        return total + fim(self._valores[j], maximo)
+
+    def intervalo(self, minimo, maximo, inclui_minimo=True, inclui_maximo=True):
+        """Chaves dos valores entre ``minimo`` e ``maximo``"""
+        inicio = bisect_left if inclui_minimo else bisect_right
+        fim = bisect_right if inclui_maximo else bisect_left
+        encontradas = []
+        i = inicio(self._maximos, minimo)
+        j = None
+        while i < len(self._valores):
+            valores = self._valores[i]
+            if j is None:
+                j = inicio(valores, minimo)
+            k = fim(valores, maximo)
+            encontradas.extend(self._chaves[i][j:k])
+            if k < len(valores):
+                break
+            i += 1
+            j = 0
+        return encontradas
+
+
+class IndiceHistorico:
+    """Índice de palavras, números e resultados do histórico.
+
+    Palavras e números das expressões apontam para listas de posições, uma
+    para cada lado do Historico (recentes e antigos; a chave da posição p em
+    antigos é -1 - p). Como os dois lados só crescem pelo fim, essas listas
+    já nascem em ordem crescente: as operações mais recentes de uma palavra
+    saem por fatiamento, e interseções usam busca binária.
+    """
+
+    def __init__(self):
+        self._palavras = {}
+        self._numeros = {}
+        self._resultados = _ListaOrdenada()
+        # Expressões repetidas (internadas) são divididas em termos uma vez só
+        self._termos = {}
+
+    def _postagens_de(self, expressao):
+        """Listas de posições (pares recentes/antigas) de cada palavra e
+        balde de número da expressão, criadas na primeira vez"""
+        postagens = self._termos.get(expressao)
+        if postagens is None:
+            if len(self._termos) >= MAXIMO_TERMOS_EM_CACHE:
+                self._termos.clear()
+            # Por identidade: dois números podem cair no mesmo balde
+            pares = {}
+            for termo in set(_TERMO_EXPRESSAO.findall(expressao.lower())):
+                if termo[0] in _DIGITOS:
+                    termos, termo = self._numeros, hash(termo) & (BALDES_NUMEROS - 1)
+                else:
+                    termos = self._palavras
+                par = termos.get(termo)
+                if par is None:
+                    par = termos[termo] = (array('q'), array('q'))
+                pares[id(par)] = par
+            postagens = self._termos[expressao] = list(pares.values())
+        return postagens
+
+    def adicionar(self, chave, expressao, valor):
+        lado, posicao = (0, chave) if chave >= 0 else (1, -1 - chave)
+        for par in self._postagens_de(expressao):
+            par[lado].append(posicao)
+        valor = _como_float(valor)
+        if valor == valor:   # NaN não entra em comparações
+            self._resultados.inserir(valor, chave)
+
+    def acrescentar_colunas(self, colunas, inicio, fim, antigas):
+        """Indexa as posições [inicio, fim) de um lado do Historico (o mesmo
+        que ``adicionar`` para cada uma, sem chamadas por operação)"""
+        lado = 1 if antigas else 0
+        postagens_de = self._postagens_de
+        inserir = self._resultados.inserir
+        expressoes, valores, exatos = colunas.expressoes, colunas.valores, colunas.exatos
+        for posicao in range(inicio, fim):
+            for par in postagens_de(expressoes[posicao]):
+                par[lado].append(posicao)
+            valor = exatos[posicao] if posicao in exatos else valores[posicao]
+            if valor == valor:
+                inserir(_como_float(valor), -1 - posicao if antigas else posicao)
+
+    def com_palavra(self, prefixo):
+        """Posições ``(recentes, antigas)`` das expressões com alguma palavra
+        iniciada por ``prefixo``"""
+        encontradas = [postagens for palavra, postagens in self._palavras.items() if palavra.startswith(prefixo)]
+        if len(encontradas) == 1:
+            return encontradas[0]
+        return tuple(sorted(set().union(*lado)) for lado in zip((array('q'), array('q')), *encontradas))
+
+    def com_numero(self, numero):
+        """Posições candidatas para um número escrito na expressão (None se
+        ele não for indexável); podem incluir falsos positivos, a confirmar"""
+        numero = numero.lstrip('-')
+        if not _NUMERO_EXPRESSAO.fullmatch(numero):
+            return None
+        vazio = (array('q'), array('q'))
+        return self._numeros.get(hash(numero) & (BALDES_NUMEROS - 1), vazio)
+
+    def contar_resultados(self, minimo, maximo, inclui_minimo=True, inclui_maximo=True):
+        return self._resultados.contar(minimo, maximo, inclui_minimo, inclui_maximo)
+
+    def com_resultado(self, minimo, maximo, inclui_minimo=True, inclui_maximo=True):
+        """Chaves das operações com resultado no intervalo (fora de ordem)"""
+        return self._resultados.intervalo(minimo, maximo, inclui_minimo, inclui_maximo)
+
+# ===== CONSULTAS =====
+
+def _instante(texto, fim):
+    """Epoch de um horário de hoje ou de uma data (``fim``: fim do dia para datas sem hora)"""
+    texto = texto.replace('t', ' ')
+    if '-' not in texto:
+        texto = f"{date.today().isoformat()} {texto}"
+    elif ' ' not in texto:
+        dia = datetime.fromisoformat(texto)
+        return (dia + timedelta(days=1, microseconds=-1) if fim else dia).timestamp()
+    return datetime.fromisoformat(texto).timestamp()
+
+
+def _eh_instante(texto):
+    return ':' in texto or _DATA.match(texto) is not None
+
+
+class Consulta:
+    """Consulta interpretada: palavras, números nas expressões e limites
+    para o resultado e para o instante (ver o início do módulo)"""
+
+    def __init__(self, texto):
+        texto = re.sub(r"(?<=\d),(?=\d)", ".", texto.lower())
+        self.palavras = []
+        self.numeros = []
+        self.resultado = None   # [minimo, maximo, inclui_minimo, inclui_maximo]
+        self.periodo = None     # [inicio, fim], inclusivos
+
+        for a, b in _ENTRE.findall(texto):
+            if _eh_instante(a) != _eh_instante(b):
+                raise ValueError(f"Intervalo misturando número e horário: {a} e {b}")
+            self._restringir('>=', a)
+            self._restringir('<=', b)
+        texto = _ENTRE.sub(" ", texto)
+        for operador, valor in _COMPARACAO.findall(texto):
+            self._restringir(operador, valor)
+        texto = _COMPARACAO.sub(" ", texto)
+
+        for termo in _TERMO.findall(texto):
+            if termo[0].isalpha() or termo == '√':
+                self.palavras.append(termo)
+            else:
+                self.numeros.append(termo.lstrip('+'))
+
+        # Só um número: compara com o resultado
+        if self.numeros and not self.palavras and self.resultado is None and self.periodo is None:
+            for numero in self.numeros:
+                self._restringir('=', numero)
+            self.numeros = []
+
+    def _restringir(self, operador, texto):
+        if _eh_instante(texto):
+            limites = self.periodo = self.periodo or [-math.inf, math.inf]
+            # Uma data vale pelo dia inteiro: "> dia" começa depois dele e
+            # "< dia" termina antes dele
+            if operador in ('>', '>=', '='):
+                limites[0] = max(limites[0], _instante(texto, fim=operador == '>'))
+            if operador in ('<', '<=', '='):
+                limites[1] = min(limites[1], _instante(texto, fim=operador != '<'))
+            return
+        valor = float(texto)
+        if self.resultado is None:
+            self.resultado = [-math.inf, math.inf, True, True]
+        if operador == '=':
+            tolerancia = abs(valor) * _TOLERANCIA
+            self._limite_inferior(valor - tolerancia, True)
+            self._limite_superior(valor + tolerancia, True)
+        elif operador[0] == '>':
+            self._limite_inferior(valor, operador == '>=')
+        else:
+            self._limite_superior(valor, operador == '<=')
+
+    def _limite_inferior(self, valor, inclusivo):
+        limites = self.resultado
+        if valor > limites[0] or (valor == limites[0] and not inclusivo):
+            limites[0], limites[2] = valor, inclusivo
+
+    def _limite_superior(self, valor, inclusivo):
+        limites = self.resultado
+        if valor < limites[1] or (valor == limites[1] and not inclusivo):
+            limites[1], limites[3] = valor, inclusivo
+
+    def vazia(self):
+        return not (self.palavras or self.numeros or self.resultado or self.periodo)
+
+
+def _fatiar(posicoes, faixa):
+    """Posições (em ordem crescente) dentro do range ``faixa``"""
+    return posicoes[bisect_left(posicoes, faixa.start):bisect_left(posicoes, faixa.stop)]
+
+
+def _intersecao(menor, maior):
+    """Interseção de duas sequências crescentes, em ordem crescente"""
+    if len(menor) * 16 < len(maior):
+        # Poucas: busca binária de cada uma na maior
+        encontradas = []
+        tamanho = len(maior)
+        for posicao in menor:
+            i = bisect_left(maior, posicao)
+            if i < tamanho and maior[i] == posicao:
+                encontradas.append(posicao)
+        return encontradas
+    return sorted(set(menor).intersection(maior))
+
+
+def _separar(chaves):
+    """Chaves fora de ordem -> posições ``(recentes, antigas)`` crescentes"""
+    recentes = sorted(chave for chave in chaves if chave >= 0)
+    antigas = sorted(-1 - chave for chave in chaves if chave < 0)
+    return recentes, antigas
+
+
+def _mais_recentes(recentes, antigas, limite):
+    """Chaves das ``limite`` primeiras posições, da mais recente à mais antiga"""
+    chaves = list(recentes[:-limite - 1:-1]) if limite else []
+    if len(chaves) < limite:
+        chaves.extend(-1 - posicao for posicao in antigas[:limite - len(chaves)])
+    return chaves
+
+
+def _no_intervalo(minimo, maximo, inclui_minimo, inclui_maximo):
+    def dentro(valor):
+        return (
+            (minimo < valor or (inclui_minimo and minimo == valor))
+            and (valor < maximo or (inclui_maximo and valor == maximo))
+        )
+    return dentro
+
+
+def _varrer_resultados(historico, resultado, limite, maximo_varrido):
+    """As ``limite`` chaves mais recentes com resultado no intervalo,
+    percorrendo o histórico a partir do fim; None se passar de
+    ``maximo_varrido`` operações sem completá-las"""
+    dentro = _no_intervalo(*resultado)
+    valor = historico.valor_da_chave
+    recentes, antigas = historico.tamanhos()
+    chaves = []
+    for varridas, chave in enumerate(chain(range(recentes - 1, -1, -1), range(-1, -1 - antigas, -1))):
+        if varridas >= maximo_varrido:
+            return None
+        if dentro(valor(chave)):
+            chaves.append(chave)
+            if len(chaves) == limite:
+                break
+    return chaves
+
+
+def buscar(historico, texto, limite=LIMITE_RESULTADOS):
+    """Busca no histórico; devolve ``(total, chaves)``.
+
+    ``chaves`` são as das ``limite`` operações mais recentes encontradas, da
+    mais recente para a mais antiga (ver Historico.item_da_chave). Levanta
+    ValueError se a consulta for mal formada.
+
+    Cada filtro vira um par de listas crescentes de posições (ver
+    IndiceHistorico); elas são intersectadas a partir da menor, e as mais
+    recentes saem por fatiamento. Filtros que casariam com muito mais
+    operações que o menor deles são aplicados só às candidatas.
+    """
+    consulta = Consulta(texto)
+    if consulta.vazia():
+        return 0, []
+    indice = historico.indice()
+
+    listas = [indice.com_palavra(palavra) for palavra in consulta.palavras]
+    padroes = []
+    for numero in consulta.numeros:
+        padroes.append(re.compile(rf"(?<![\d.]){re.escape(numero)}(?![\d.])"))
+        candidatas = indice.com_numero(numero)
+        if candidatas is not None:
+            listas.append(candidatas)
+    if consulta.periodo is not None:
+        faixas = historico.posicoes_no_periodo(*consulta.periodo)
+        if listas:
+            listas = [tuple(map(_fatiar, lados, faixas)) for lados in listas]
+        else:
+            listas = [faixas]
+
+    resultado = consulta.resultado
+    if resultado is not None:
+        contagem = indice.contar_resultados(*resultado)
+        menor = min((len(r) + len(a) for r, a in listas), default=None)
+        if not listas and not padroes:
+            # Só o resultado: o total sai da contagem; as mais recentes, de
+            # uma varredura a partir do fim quando os resultados são comuns
+            limite_varredura = 4 * limite * len(historico) // max(contagem, 1)
+            if contagem > limite_varredura:
+                chaves = _varrer_resultados(historico, resultado, limite, limite_varredura)
+                if chaves is not None:
+                    return contagem, chaves
+            return contagem, heapq.nlargest(limite, indice.com_resultado(*resultado))
+        if menor is None or contagem <= menor:
+            listas.append(_separar(indice.com_resultado(*resultado)))
+            resultado = None
+    if not listas:
+        listas = [tuple(map(range, historico.tamanhos()))]
+
+    listas.sort(key=lambda lados: len(lados[0]) + len(lados[1]))
+    recentes, antigas = listas[0]
+    for outras_recentes, outras_antigas in listas[1:]:
+        recentes = _intersecao(recentes, outras_recentes)
+        antigas = _intersecao(antigas, outras_antigas)
+
+    # Filtros restantes, verificados em cada candidata
+    if resultado is not None or padroes:
+        dentro = _no_intervalo(*resultado) if resultado is not None else None
+        expressao, valor = historico.expressao_da_chave, historico.valor_da_chave
+
+        def aceita(chave):
+            if dentro is not None and not dentro(valor(chave)):
+                return False
+            if padroes:
+                texto = expressao(chave)
+                return all(padrao.search(texto) for padrao in padroes)
+            return True
+
+        recentes = [posicao for posicao in recentes if aceita(posicao)]
+        antigas = [posicao for posicao in antigas if aceita(-1 - posicao)]
+
+    return len(recentes) + len(antigas), _mais_recentes(recentes, antigas, limite)
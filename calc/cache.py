@@ -0,0 +1,334 @@
+"""Cache de resultados, em memória e (opcionalmente) em disco entre sessões.
+
+A chave é a operação canônica com seus operandos: ``('^', 2, 5000000)``,
+``('log', x)`` ou, para expressões, ``('expressao', texto normalizado)``.
+Floats entram na chave como ``float.hex()``, para que 2 e 2.0 (ou 0.0 e
+-0.0) não se confundam.
+
+- Memória: LRU limitada em itens e em bytes.
+- Disco: SQLite em ``$XDG_CACHE_HOME/calc/resultados.sqlite3``, limitado
+  em bytes; ao passar do limite, as entradas acessadas há mais tempo são
+  descartadas. A chave no disco é o SHA-256 da chave canônica, e um
+  conjunto com os prefixos das chaves gravadas evita ir ao disco em
+  consultas que certamente falhariam. O banco é aberto e esse conjunto é
+  carregado numa thread própria, que também faz todas as gravações em
+  lotes (resultados novos e horários de acesso); quem chama ``calcular``
+  só faz, num acerto, uma leitura pela chave primária.
+
+Só entram no cache resultados que levaram pelo menos ``limiar`` segundos
+para calcular: somas e produtos pequenos custam menos que a consulta.
+Erros nunca entram.
+"""
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+LIMIAR_SEGUNDOS = 0.001
+MAXIMO_ITENS_MEMORIA = 512
+MAXIMO_BYTES_MEMORIA = 64 << 20
+MAXIMO_BYTES_DISCO = 256 << 20
+
+# Ao passar do limite do disco, descarta até ficar nesta fração dele
+FRACAO_APOS_DESCARTE = 0.9
+
+_PREFIXO = 8   # bytes do SHA-256 guardados no conjunto em memória
+
+TAMANHO_LOTE = 500      # gravações por transação
+INTERVALO_LOTE = 0.5    # segundos de espera para juntar um lote
+
+# Comandos da fila da thread do disco
+_GRAVAR = 'gravar'
+_ACESSO = 'acesso'
+_LIMPAR = 'limpar'
+_FECHAR = 'fechar'
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    chave BLOB PRIMARY KEY,
+    valor,
+    custo REAL NOT NULL,
+    tamanho INTEGER NOT NULL,
+    acesso REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resultados_acesso ON resultados (acesso);
+"""
+
+
+def caminho_padrao():
+    """Arquivo do cache em $XDG_CACHE_HOME/calc (ou ~/.cache/calc)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'calc', 'resultados.sqlite3')
+
+
+def _canonica(chave):
+    return tuple(parte.hex() if type(parte) is float else parte for parte in chave)
+
+
+def _digest(chave):
+    import hashlib
+
+    h = hashlib.sha256()
+    for parte in chave:
+        if type(parte) is int:
+            dados = parte.to_bytes((parte.bit_length() + 8) // 8, 'little', signed=True)
+            h.update(b'i%d:' % len(dados))
+        else:
+            dados = parte.encode()
+            h.update(b's%d:' % len(dados))
+        h.update(dados)
+    return h.digest()
+
+
+class CacheResultados:
+    """Memoização de cálculos com LRU em memória e camada opcional em disco.
+
+    ``arquivo`` é o banco do cache em disco (None: só memória). O banco é
+    aberto em segundo plano por ``abrir_disco`` (ou, sem essa chamada, na
+    primeira consulta que não acerta a memória); até estar pronto, o disco
+    simplesmente não é consultado. Erros do disco ficam em ``erro_disco``;
+    se o banco não puder ser aberto, ``arquivo`` volta a None.
+    """
+
+    def __init__(self, arquivo=None, maximo_itens=MAXIMO_ITENS_MEMORIA,
+                 maximo_bytes=MAXIMO_BYTES_MEMORIA, maximo_bytes_disco=MAXIMO_BYTES_DISCO,
+                 limiar=LIMIAR_SEGUNDOS):
+        self.arquivo = arquivo
+        self.maximo_itens = maximo_itens
+        self.maximo_bytes = maximo_bytes
+        self.maximo_bytes_disco = maximo_bytes_disco
+        self.limiar = limiar
+
+        # chave canônica -> (valor, custo em segundos, tamanho em bytes)
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+
+        self._leitura = None       # conexão da thread principal (só SELECT)
+        self._fila = None
+        self._trabalhador = None
+        self._pronto = threading.Event()   # disco aberto (ou falhou ao abrir)
+        self._no_disco = set()
+        self._bytes_disco = 0
+        self.erro_disco = None
+
+        self.consultas = 0
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.segundos_economizados = 0.0
+
+    def calcular(self, chave, funcao, *args):
+        """``funcao(*args)``, ou o resultado guardado para ``chave``"""
+        chave = _canonica(chave)
+        self.consultas += 1
+        entrada = self._memoria.get(chave)
+        if entrada is not None:
+            self._memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+            self.segundos_economizados += entrada[1]
+            return entrada[0]
+        if self.arquivo is not None:
+            entrada = self._ler_disco(chave)
+            if entrada is not None:
+                valor, custo = entrada
+                self.acertos_disco += 1
+                self.segundos_economizados += custo
+                self._guardar_memoria(chave, valor, custo)
+                return valor
+
+        inicio = time.perf_counter()
+        valor = funcao(*args)
+        custo = time.perf_counter() - inicio
+        if custo >= self.limiar:
+            self._guardar_memoria(chave, valor, custo)
+            if self.arquivo is not None:
+                self._gravar_disco(chave, valor, custo)
+        return valor
+
+    # ===== MEMÓRIA =====
+
+    def _guardar_memoria(self, chave, valor, custo):
+        tamanho = sys.getsizeof(valor)
+        if tamanho > self.maximo_bytes:
+            return
+        anterior = self._memoria.pop(chave, None)
+        if anterior is not None:
+            self._bytes_memoria -= anterior[2]
+        self._memoria[chave] = (valor, custo, tamanho)
+        self._bytes_memoria += tamanho
+        while len(self._memoria) > self.maximo_itens or self._bytes_memoria > self.maximo_bytes:
+            _, (_, _, removido) = self._memoria.popitem(last=False)
+            self._bytes_memoria -= removido
+
+    # ===== DISCO =====
+
+    def abrir_disco(self):
+        """Abre e aquece o banco numa thread própria, sem bloquear"""
+        if self.arquivo is None or self._trabalhador is not None:
+            return
+        self._fila = queue.Queue()
+        self._trabalhador = threading.Thread(
+            target=self._trabalhar, name="cache-disco", daemon=True
+        )
+        self._trabalhador.start()
+
+    def _conectar(self):
+        """Conexão de gravação, com o conjunto de prefixos já carregado"""
+        import sqlite3
+
+        from .persistencia import conectar
+
+        try:
+            os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+            conexao = conectar(self.arquivo)
+            conexao.executescript(_ESQUEMA)
+            conexao.commit()
+            self._no_disco.update(
+                bytes(prefixo) for (prefixo,) in conexao.execute(
+                    "SELECT substr(chave, 1, ?) FROM resultados", (_PREFIXO,)
+                )
+            )
+            self._bytes_disco = conexao.execute(
+                "SELECT COALESCE(SUM(tamanho), 0) FROM resultados"
+            ).fetchone()[0]
+            self._leitura = conectar(self.arquivo)
+        except (sqlite3.Error, OSError) as e:
+            self.erro_disco = e
+            self.arquivo = None
+            return None
+        return conexao
+
+    def _trabalhar(self):
+        import sqlite3
+
+        conexao = self._conectar()
+        self._pronto.set()
+        if conexao is None:
+            return
+        try:
+            while True:
+                lote = [self._fila.get()]
+                while lote[-1][0] is not _FECHAR and len(lote) < TAMANHO_LOTE:
+                    try:
+                        lote.append(self._fila.get(timeout=INTERVALO_LOTE))
+                    except queue.Empty:
+                        break
+                try:
+                    self._executar_lote(conexao, lote)
+                except sqlite3.Error as e:
+                    self.erro_disco = e
+                if lote[-1][0] is _FECHAR:
+                    return
+        finally:
+            conexao.close()
+
+    def _executar_lote(self, conexao, lote):
+        """Aplica uma transação com os comandos enfileirados, na ordem"""
+        with conexao:
+            for comando, *dados in lote:
+                if comando is _ACESSO:
+                    conexao.execute("UPDATE resultados SET acesso = ? WHERE chave = ?", dados)
+                elif comando is _GRAVAR:
+                    digest, tamanho = dados[0], dados[3]
+                    anterior = conexao.execute(
+                        "SELECT tamanho FROM resultados WHERE chave = ?", (digest,)
+                    ).fetchone()
+                    conexao.execute(
+                        "INSERT OR REPLACE INTO resultados (chave, valor, custo, tamanho, acesso) "
+                        "VALUES (?, ?, ?, ?, ?)", dados
+                    )
+                    self._bytes_disco += tamanho - (anterior[0] if anterior else 0)
+                elif comando is _LIMPAR:
+                    conexao.execute("DELETE FROM resultados")
+                    self._bytes_disco = 0
+        if self._bytes_disco > self.maximo_bytes_disco:
+            self._descartar_disco(conexao)
+
+    def _ler_disco(self, chave):
+        if self._leitura is None:
+            # Ainda abrindo (ou nunca aberto): conta como falta
+            self.abrir_disco()
+            return None
+        digest = _digest(chave)
+        if digest[:_PREFIXO] not in self._no_disco:
+            return None
+        import sqlite3
+
+        from .persistencia import valor_do_banco
+
+        try:
+            linha = self._leitura.execute(
+                "SELECT valor, custo FROM resultados WHERE chave = ?", (digest,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.erro_disco = e
+            return None
+        if linha is None:
+            return None
+        self._fila.put((_ACESSO, time.time(), digest))
+        return valor_do_banco(linha[0]), linha[1]
+
+    def _gravar_disco(self, chave, valor, custo):
+        self.abrir_disco()
+        if self.arquivo is None:
+            return
+        from .persistencia import valor_para_banco
+
+        valor = valor_para_banco(valor)
+        tamanho = len(valor) if isinstance(valor, bytes) else 8
+        if tamanho > self.maximo_bytes_disco:
+            return
+        digest = _digest(chave)
+        self._fila.put((_GRAVAR, digest, valor, custo, tamanho, time.time()))
+        self._no_disco.add(digest[:_PREFIXO])
+
+    def _descartar_disco(self, conexao):
+        """Remove as entradas acessadas há mais tempo até voltar abaixo do limite"""
+        alvo = self.maximo_bytes_disco * FRACAO_APOS_DESCARTE
+        removidas = []
+        for digest, tamanho in conexao.execute("SELECT chave, tamanho FROM resultados ORDER BY acesso"):
+            if self._bytes_disco <= alvo:
+                break
+            removidas.append((digest,))
+            self._bytes_disco -= tamanho
+        with conexao:
+            conexao.executemany("DELETE FROM resultados WHERE chave = ?", removidas)
+        for (digest,) in removidas:
+            self._no_disco.discard(bytes(digest[:_PREFIXO]))
+
+    # ===== MANUTENÇÃO =====
+
+    def estatisticas(self):
+        """Consultas, acertos por nível, taxa de acertos, ocupação e tempo economizado"""
+        acertos = self.acertos_memoria + self.acertos_disco
+        return {
+            'consultas': self.consultas,
+            'acertos_memoria': self.acertos_memoria,
+            'acertos_disco': self.acertos_disco,
+            'taxa_acertos': acertos / self.consultas if self.consultas else 0.0,
+            'itens_memoria': len(self._memoria),
+            'bytes_memoria': self._bytes_memoria,
+            'itens_disco': len(self._no_disco) if self._leitura is not None else None,
+            'bytes_disco': self._bytes_disco if self._leitura is not None else None,
+            'segundos_economizados': self.segundos_economizados,
+        }
+
+    def limpar(self):
+        """Esvazia os dois níveis (as estatísticas continuam)"""
+        self._memoria.clear()
+        self._bytes_memoria = 0
+        self.abrir_disco()
+        if self.arquivo is not None:
+            self._no_disco.clear()
+            self._fila.put((_LIMPAR,))
+
+    def fechar(self):
+        """Grava o que estiver pendente e encerra a thread do disco"""
+        if self._trabalhador is not None:
+            self._fila.put((_FECHAR,))
+            self._trabalhador.join()
+            self._trabalhador = None
+        if self._leitura is not None:
+            self._leitura.close()
+            self._leitura = None
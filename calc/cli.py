@@ -0,0 +1,181 @@
+"""Ponto de entrada ``calc``: modo de linha de comando sem GTK.
+
+Com ``--cli`` (ou quando a entrada padrão é um pipe ou arquivo), lê
+expressões linha a linha da entrada padrão ou dos arquivos indicados e
+escreve um resultado por linha na saída padrão, em blocos. Sem isso, abre
+a interface gráfica; expressões passadas como argumentos são avaliadas na
+calculadora já aberta (ver janela.CalculadoraApp). O módulo ``gi`` só é
+importado no modo gráfico.
+
+    echo "2*(3+4)^2" | calc
+    calc --cli formulas.txt > resultados.txt
+    calc "2^10"
+    calc --exportar-incremental historico.csv
+"""
+import argparse
+import os
+import stat
+import sys
+import time
+
+from . import expressao, inteiros
+from .motor import ERROS_CALCULO, formatar_resultado
+
+TAMANHO_BUFFER = 1 << 20   # bytes de leitura por arquivo
+LINHAS_POR_BLOCO = 4096    # linhas acumuladas antes de cada escrita
+
+
+def formatar_completo(resultado):
+    """Como formatar_resultado, mas com todos os dígitos de inteiros enormes"""
+    if type(resultado) is int:
+        return inteiros.para_texto(resultado)
+    return formatar_resultado(resultado)
+
+
+def avaliar_linha(linha, formatar=formatar_resultado):
+    """Resultado formatado de uma linha ("" para linhas vazias, "Erro" se inválida)"""
+    if not linha or linha.isspace():
+        return ""
+    try:
+        return formatar(expressao.avaliar(linha))
+    except ERROS_CALCULO:
+        return "Erro"
+
+
+def processar(entrada, saida, interativo=False, formatar=formatar_resultado):
+    """Avalia cada linha de ``entrada`` e escreve os resultados em ``saida``.
+
+    A memória usada é constante: as linhas são lidas uma a uma e os
+    resultados são escritos em blocos de LINHAS_POR_BLOCO (ou linha a linha,
+    se ``interativo``).
+    """
+    bloco = []
+    for linha in entrada:
+        bloco.append(avaliar_linha(linha, formatar))
+        if interativo or len(bloco) >= LINHAS_POR_BLOCO:
+            bloco.append("")
+            saida.write("\n".join(bloco))
+            saida.flush()
+            bloco.clear()
+    if bloco:
+        bloco.append("")
+        saida.write("\n".join(bloco))
+    saida.flush()
+
+
+def _entrada_redirecionada():
+    """Verdadeiro se a entrada padrão é um pipe ou arquivo (e não um terminal)"""
+    try:
+        modo = os.fstat(sys.stdin.fileno()).st_mode
+    except (AttributeError, OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(modo) or stat.S_ISREG(modo)
+
+
+def executar_cli(arquivos, digitos_completos=False):
+    """Modo fluxo: avalia os arquivos (ou a entrada padrão) e escreve na saída padrão"""
+    saida = sys.stdout
+    formatar = formatar_completo if digitos_completos else formatar_resultado
+    try:
+        for caminho in arquivos or ['-']:
+            if caminho == '-':
+                processar(sys.stdin, saida, sys.stdin.isatty(), formatar)
+            else:
+                with open(caminho, encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+                    processar(f, saida, formatar=formatar)
+    except BrokenPipeError:
+        # Saída fechada antes do fim (ex.: "| head"); evita erro ao encerrar
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def exportar_incremental(caminho):
+    """Acrescenta a ``caminho`` as operações do histórico em disco gravadas
+    desde a última exportação para ele (formato pela extensão: .txt, .csv
+    ou .jsonl), para tarefas agendadas"""
+    from .exportacao import FORMATOS_INCREMENTAIS
+    from .exportacao import exportar_incremental as exportar
+    from .persistencia import HistoricoPersistente
+
+    formato = os.path.splitext(caminho)[1].lstrip('.').lower()
+    if formato not in FORMATOS_INCREMENTAIS:
+        print(f"calc: exportação incremental só para {', '.join(FORMATOS_INCREMENTAIS)}", file=sys.stderr)
+        return 2
+    persistencia = HistoricoPersistente()
+    try:
+        novas = exportar(persistencia, formato, caminho)
+    except OSError as e:
+        print(f"calc: {e}", file=sys.stderr)
+        return 1
+    finally:
+        persistencia.fechar()
+    print(f"{novas} operações novas em {caminho}")
+    return 0
+
+
+def _criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='calc',
+        description="Calculadora científica. Sem argumentos abre a interface gráfica.",
+    )
+    parser.add_argument(
+        '--cli', action='store_true',
+        help="avalia expressões linha a linha, sem interface gráfica",
+    )
+    parser.add_argument(
+        '--digitos-completos', action='store_true',
+        help="no modo --cli, escreve todos os dígitos de inteiros enormes em vez de um resumo",
+    )
+    parser.add_argument(
+        '--startup-timings', action='store_true',
+        help="mostra (na saída de erro) o tempo de cada etapa até o primeiro quadro da interface",
+    )
+    parser.add_argument(
+        '--instrumentar', action='store_true',
+        help="mede a latência das operações da interface (menu de depuração, exportável em JSON)",
+    )
+    parser.add_argument(
+        '--exportar-incremental', metavar='ARQUIVO',
+        help="acrescenta a ARQUIVO (.txt, .csv ou .jsonl) as operações do histórico "
+             "gravadas desde a última exportação para ele, sem abrir a interface",
+    )
+    parser.add_argument(
+        '--sem-cache-disco', action='store_true',
+        help="não lê nem grava o cache de resultados em disco (o cache em memória continua)",
+    )
+    parser.add_argument(
+        '--gravar-sessao', metavar='ARQUIVO',
+        help="grava as ações da interface gráfica em ARQUIVO (JSON Lines), "
+             "para reprodução com 'python -m calc.gravacao ARQUIVO'",
+    )
+    parser.add_argument(
+        'arquivos', nargs='*', metavar='ARQUIVO|EXPRESSÃO',
+        help="com --cli, arquivos de expressões ('-' para a entrada padrão); sem --cli, "
+             "expressões avaliadas na calculadora aberta, com o resultado impresso aqui",
+    )
+    return parser
+
+
+def main(argv=None):
+    inicio = time.perf_counter()
+    parser = _criar_parser()
+    args = parser.parse_args(argv)
+
+    if args.exportar_incremental:
+        return exportar_incremental(args.exportar_incremental)
+    if args.cli or (not args.arquivos and _entrada_redirecionada()):
+        return executar_cli(args.arquivos, args.digitos_completos)
+
+    # Expressões soltas vão para a instância gráfica (a já aberta, se houver)
+    tempos = [("início", inicio)] if args.startup_timings else None
+    if args.instrumentar:
+        from . import instrumentacao
+        instrumentacao.ativar()
+    from .janela import main as main_gui
+    return main_gui(tempos, args.arquivos, args.gravar_sessao, not args.sem_cache_disco)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,709 @@
+"""Exportação do histórico em vários formatos.
+
+Os exportadores aceitam qualquer iterável de registros do histórico
+(objetos com ``expressao``, ``valor``, ``resultado`` e ``timestamp``),
+inclusive geradores como ``HistoricoPersistente.iterar()``. Os formatos
+de texto (TXT, CSV, JSON Lines) são escritos em fluxo, em blocos grandes,
+com memória constante, e também podem ser exportados de forma incremental
+(``exportar_incremental``): a cada vez, só as operações novas são
+acrescentadas ao mesmo arquivo.
+
+Os formatos binários em colunas (NPZ, e Arrow/Parquet com pyarrow) são
+montados a partir de ``colunas()`` do histórico, em bloco, sem um objeto
+Python por registro; ver ``exportar_npz``.
+"""
+import csv
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+
+from json.encoder import encode_basestring
+
+from . import formatacao, inteiros
+
+# Para PDF e PNG precisaremos instalar: uv add reportlab pillow
+
+TAMANHO_BUFFER = 1 << 20   # bytes do buffer de escrita
+REGISTROS_POR_BLOCO = 4096
+
+# Acima deste número de linhas o PDF é desenhado direto no canvas, página
+# a página, em vez de uma única Table do platypus
+LIMITE_PDF_TABELA = 500
+
+# Linhas por imagem no PNG; acima disso o histórico vira várias imagens
+LINHAS_POR_PNG = 200
+
+_FONTES_DEJAVU = "/usr/share/fonts/truetype/dejavu/"
+
+
+class FormatadorHorario:
+    """strftime com cache por segundo distinto.
+
+    Registros vizinhos costumam cair no mesmo segundo, então a maior parte
+    das chamadas vira uma consulta num dicionário.
+    """
+
+    def __init__(self, formato, maximo=4096):
+        self.formato = formato
+        self.maximo = maximo
+        self._cache = {}
+
+    def __call__(self, timestamp):
+        segundo = math.floor(timestamp)
+        texto = self._cache.get(segundo)
+        if texto is None:
+            if len(self._cache) >= self.maximo:
+                self._cache.clear()
+            texto = datetime.fromtimestamp(segundo).strftime(self.formato)
+            self._cache[segundo] = texto
+        return texto
+
+
+class ExportacaoCancelada(Exception):
+    """A exportação foi interrompida pelo usuário"""
+
+
+def acompanhar(registros, progresso=None, cancelar=None, intervalo=1000):
+    """Repassa os registros, avisando o progresso e checando o cancelamento.
+
+    A cada ``intervalo`` registros chama ``progresso(quantidade)`` e, se o
+    ``threading.Event`` ``cancelar`` estiver ativo, levanta ExportacaoCancelada.
+    """
+    for i, item in enumerate(registros, 1):
+        if i % intervalo == 0:
+            if cancelar is not None and cancelar.is_set():
+                raise ExportacaoCancelada()
+            if progresso is not None:
+                progresso(i)
+        yield item
+    if cancelar is not None and cancelar.is_set():
+        raise ExportacaoCancelada()
+
+
+def _blocos(historico, tamanho=REGISTROS_POR_BLOCO, inicio=1):
+    """Divide o iterável em listas de até ``tamanho`` registros numerados
+    a partir de ``inicio``"""
+    numerados = enumerate(historico, inicio)
+    while True:
+        bloco = list(islice(numerados, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def _resultados(bloco):
+    """Resultados formatados (como no display) de um bloco de registros numerados"""
+    return formatacao.DISPLAY.lote([item.valor for _, item in bloco])
+
+
+def _valor_json(valor):
+    """Texto JSON do valor numérico ('null' se não for representável)"""
+    if type(valor) is int:
+        if inteiros.contar_digitos(valor) > inteiros.LIMITE_DIGITOS_TEXTO:
+            return 'null'
+        return str(valor)
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return 'null'
+    return repr(valor)
+
+
+def _colunas(historico):
+    """``(instantes, valores, expressoes)``: ``historico.colunas()`` quando
+    existe (Historico, HistoricoPersistente), senão montadas item a item"""
+    if hasattr(historico, 'colunas'):
+        return historico.colunas()
+    from .historico import valor_em_float
+
+    instantes, valores, expressoes = array('d'), array('d'), []
+    for item in historico:
+        instantes.append(item.timestamp)
+        valores.append(valor_em_float(item.valor))
+        expressoes.append(item.expressao)
+    return instantes, valores, expressoes
+
+
+def _colunas_numpy(np, historico):
+    """Colunas finais dos formatos binários: instantes em microssegundos
+    (int64), valores (float64), e as expressões em UTF-8 concatenadas com
+    os deslocamentos de cada uma (como uma coluna de strings do Arrow)"""
+    instantes, valores, expressoes = _colunas(historico)
+    timestamp_us = np.rint(np.frombuffer(instantes, dtype=np.float64) * 1e6).astype(np.int64)
+    valor = np.frombuffer(valores, dtype=np.float64)
+
+    # Tudo num único encode; os limites saem das posições do separador
+    texto = "\0".join(expressoes)
+    if texto.count("\0") == max(len(expressoes) - 1, 0):
+        dados = np.frombuffer(texto.encode('utf-8'), dtype=np.uint8)
+        separadores = np.flatnonzero(dados == 0)
+        offsets = np.empty(len(expressoes) + 1, dtype=np.int64)
+        offsets[0] = 0
+        offsets[1:-1] = separadores - np.arange(len(separadores))
+        offsets[-1] = len(dados) - len(separadores)
+        dados = np.delete(dados, separadores)
+    else:
+        # Alguma expressão contém o próprio separador
+        tamanhos = [len(e.encode('utf-8')) for e in expressoes]
+        offsets = np.zeros(len(expressoes) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=offsets[1:])
+        dados = np.frombuffer("".join(expressoes).encode('utf-8'), dtype=np.uint8)
+    return timestamp_us, valor, offsets, dados
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise Exception("Biblioteca numpy não instalada. Execute: uv add numpy")
+    return np
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise Exception("Biblioteca pyarrow não instalada. Execute: uv add pyarrow")
+    return pyarrow
+
+
+def _tabela_arrow(historico):
+    """pyarrow.Table com as colunas timestamp (us, UTC), valor e expressao"""
+    pa = _pyarrow()
+    timestamp_us, valor, offsets, dados = _colunas_numpy(_numpy(), historico)
+    expressao = pa.LargeStringArray.from_buffers(
+        len(valor), pa.py_buffer(offsets), pa.py_buffer(dados)
+    )
+    return pa.table({
+        'timestamp': pa.array(timestamp_us, type=pa.timestamp('us', tz='UTC')),
+        'valor': pa.array(valor, type=pa.float64()),
+        'expressao': expressao,
+    })
+
+
+def ler_expressoes(offsets, dados):
+    """Lista de expressões a partir das colunas ``expressao_offsets`` e
+    ``expressao_utf8`` de um NPZ exportado"""
+    texto = bytes(dados)
+    return [texto[a:b].decode('utf-8') for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _exportar_pdf_paginado(historico, filepath):
+    """PDF de alto volume: linhas de altura fixa desenhadas direto no canvas.
+
+    Reproduz o visual da tabela do exportar_pdf (cabeçalho cinza, linhas
+    bege com grade, Courier 10), mas sem o cálculo de layout do platypus:
+    cada página recebe um número fixo de linhas, desenhadas com um único
+    objeto de texto (uma linha de texto por registro), e só a página
+    corrente é montada por vez (as anteriores ficam comprimidas no
+    documento).
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    largura_pagina, altura_pagina = A4
+    colunas = (30, 60, 200, 100)
+    largura_tabela = sum(colunas)
+    x0 = (largura_pagina - largura_tabela) / 2
+    margem = 72
+    altura_linha = 16
+    altura_cabecalho = 26
+    tamanho_fonte = 10
+    largura_caractere = 0.6 * tamanho_fonte   # Courier é monoespaçada
+    
+    # Bordas e centros das colunas, calculados uma vez
+    bordas = [x0]
+    for largura in colunas:
+        bordas.append(bordas[-1] + largura)
+    centros = [(a + b) / 2 for a, b in zip(bordas, bordas[1:])]
+    maximos = [int((largura - 4) / largura_caractere) for largura in colunas]
+    
+    def montar_linha(celulas):
+        # Courier é monoespaçada: a linha inteira vira um único texto, com
+        # cada célula centrada na sua coluna por espaços
+        linha = ""
+        for coluna, texto in enumerate(celulas):
+            if len(texto) > maximos[coluna]:
+                texto = texto[:maximos[coluna] - 1] + "…"
+            inicio = round((centros[coluna] - x0 - len(texto) * largura_caractere / 2) / largura_caractere)
+            linha += " " * max(inicio - len(linha), 1 if linha else 0) + texto
+        return linha
+    
+    hora = FormatadorHorario('%H:%M:%S')
+    c = canvas.Canvas(filepath, pagesize=A4, pageCompression=1)
+    c.setTitle("Histórico da Calculadora")
+    
+    def desenhar_pagina(linhas, primeira):
+        topo = altura_pagina - margem
+        if primeira:
+            c.setFont('Helvetica-Bold', 18)
+            c.drawString(x0, topo - 18, "Histórico da Calculadora")
+            c.setFont('Helvetica', 10)
+            c.drawString(x0, topo - 40, f"Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+            topo -= 60
+        
+        base_cabecalho = topo - altura_cabecalho
+        base_tabela = base_cabecalho - len(linhas) * altura_linha
+        
+        # Fundos
+        c.setFillColor(colors.grey)
+        c.rect(x0, base_cabecalho, largura_tabela, altura_cabecalho, stroke=0, fill=1)
+        c.setFillColor(colors.beige)
+        c.rect(x0, base_tabela, largura_tabela, base_cabecalho - base_tabela, stroke=0, fill=1)
+        
+        # Grade
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1)
+        grade = [(x, topo, x, base_tabela) for x in bordas]
+        grade.append((x0, topo, bordas[-1], topo))
+        y = base_cabecalho
+        while y >= base_tabela - 0.01:
+            grade.append((x0, y, bordas[-1], y))
+            y -= altura_linha
+        c.lines(grade)
+        
+        # Cabeçalho
+        c.setFillColor(colors.whitesmoke)
+        c.setFont('Helvetica-Bold', 12)
+        for centro, titulo in zip(centros, ('#', 'Hora', 'Expressão', 'Resultado')):
+            c.drawCentredString(centro, base_cabecalho + 9, titulo)
+        
+        # Linhas, num único objeto de texto
+        texto = c.beginText(x0, base_cabecalho - altura_linha + 4)
+        texto.setFont('Courier', tamanho_fonte, leading=altura_linha)
+        texto.setFillColor(colors.black)
+        for celulas in linhas:
+            texto.textLine(montar_linha(celulas))
+        c.drawText(texto)
+        c.showPage()
+    
+    disponivel_primeira = altura_pagina - 2 * margem - 60 - altura_cabecalho
+    disponivel = altura_pagina - 2 * margem - altura_cabecalho
+    por_pagina_primeira = int(disponivel_primeira // altura_linha)
+    por_pagina = int(disponivel // altura_linha)
+    
+    numerados = enumerate(historico, 1)
+    primeira = True
+    while True:
+        quantidade = por_pagina_primeira if primeira else por_pagina
+        linhas = [
+            (str(i), hora(item.timestamp), item.expressao, item.resultado)
+            for i, item in islice(numerados, quantidade)
+        ]
+        if not linhas and not primeira:
+            break
+        desenhar_pagina(linhas, primeira)
+        primeira = False
+        if len(linhas) < quantidade:
+            break
+
+    c.save()
+    return True
+
+
+@lru_cache(maxsize=None)
+def _fontes_png():
+    """Fontes do PNG (título, cabeçalho, itens), carregadas uma vez por processo"""
+    from PIL import ImageFont
+
+    try:
+        return (
+            ImageFont.truetype(_FONTES_DEJAVU + "DejaVuSans-Bold.ttf", 24),
+            ImageFont.truetype(_FONTES_DEJAVU + "DejaVuSans.ttf", 14),
+            ImageFont.truetype(_FONTES_DEJAVU + "DejaVuSansMono.ttf", 14),
+        )
+    except OSError:
+        padrao = ImageFont.load_default()
+        return padrao, padrao, padrao
+
+
+def _renderizar_png(caminho, linhas, subtitulo):
+    """Desenha e grava uma imagem com as linhas dadas (roda nos processos do pool)"""
+    from PIL import Image, ImageDraw
+
+    font_title, font_header, font_item = _fontes_png()
+
+    # Dimensões
+    width = 600
+    line_height = 30
+    header_height = 80
+    padding = 20
+
+    height = header_height + (len(linhas) * line_height) + (padding * 2)
+    height = max(height, 400)  # Altura mínima
+
+    img = Image.new('RGB', (width, height), color='#1e1e1e')
+    draw = ImageDraw.Draw(img)
+
+    draw.text((padding, 20), "Histórico da Calculadora", fill='#ff9500', font=font_title)
+    draw.text((padding, 50), subtitulo, fill='#aaaaaa', font=font_header)
+
+    y = header_height
+    for text in linhas:
+        draw.text((padding, y), text, fill='#ffffff', font=font_item)
+        y += line_height
+
+    img.save(caminho, 'PNG')
+    return caminho
+
+
+def _linhas_png(historico):
+    """Textos das linhas do PNG, em listas de até LINHAS_POR_PNG"""
+    hora = FormatadorHorario('%H:%M:%S')
+    for bloco in _blocos(historico, LINHAS_POR_PNG):
+        yield [
+            f"{i}. [{hora(item.timestamp)}] {item.expressao} = {item.resultado}"
+            for i, item in bloco
+        ]
+
+
+def _contexto_processos():
+    # A exportação roda numa thread da interface: fork de um processo com
+    # várias threads não é seguro, então os processos partem do zero
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+
+
+def _exportar_png_em_partes(blocos, filepath, subtitulo, processos=None):
+    """Grava cada bloco numa imagem ``nome_0001.png``, ``nome_0002.png``...
+
+    As imagens são desenhadas em paralelo; no máximo duas por processo
+    ficam pendentes, então a memória não depende do tamanho do histórico.
+    Se algo falhar (ou a exportação for cancelada), as imagens já gravadas
+    são removidas.
+    """
+    processos = processos or os.process_cpu_count() or 1
+    base = Path(filepath)
+    gravados = []
+    pendentes = set()
+    with ProcessPoolExecutor(processos, mp_context=_contexto_processos()) as pool:
+        try:
+            for parte, linhas in enumerate(blocos, 1):
+                if len(pendentes) >= 2 * processos:
+                    concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        futuro.result()
+                caminho = str(base.with_name(f"{base.stem}_{parte:04d}{base.suffix}"))
+                gravados.append(caminho)
+                pendentes.add(pool.submit(
+                    _renderizar_png, caminho, linhas, f"{subtitulo} — parte {parte}"
+                ))
+            for futuro in pendentes:
+                futuro.result()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            for caminho in gravados:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+            raise
+    return gravados
+
+
+class ExportadorHistorico:
+    """Classe responsável por exportar o histórico em vários formatos"""
+    
+    @staticmethod
+    def exportar_txt(historico, filepath, acrescentar=False, inicio=1):
+        """Exporta para TXT.
+
+        Com ``acrescentar``, as linhas (numeradas a partir de ``inicio``) vão
+        para o fim do arquivo, sem cabeçalho; o mesmo vale para CSV e JSONL.
+        """
+        hora = FormatadorHorario('%H:%M:%S')
+        with open(filepath, 'a' if acrescentar else 'w', encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+            if not acrescentar:
+                f.write("HISTÓRICO DA CALCULADORA\n")
+                f.write("=" * 50 + "\n")
+                f.write(f"Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n\n")
+            
+            for bloco in _blocos(historico, inicio=inicio):
+                resultados = _resultados(bloco)
+                f.write("".join([
+                    f"{i}. [{hora(item.timestamp)}] {item.expressao} = {resultado}\n"
+                    for (i, item), resultado in zip(bloco, resultados)
+                ]))
+        
+        return True
+    
+    @staticmethod
+    def exportar_csv(historico, filepath, acrescentar=False, inicio=1):
+        """Exporta para CSV"""
+        data_hora = FormatadorHorario('%d/%m/%Y %H:%M:%S')
+        with open(filepath, 'a' if acrescentar else 'w', newline='', encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+            writer = csv.writer(f)
+            if not acrescentar:
+                writer.writerow(['#', 'Data/Hora', 'Expressão', 'Resultado'])
+            
+            for bloco in _blocos(historico, inicio=inicio):
+                resultados = _resultados(bloco)
+                writer.writerows([
+                    (i, data_hora(item.timestamp), item.expressao, resultado)
+                    for (i, item), resultado in zip(bloco, resultados)
+                ])
+        
+        return True
+    
+    @staticmethod
+    def exportar_jsonl(historico, filepath, acrescentar=False, inicio=1):
+        """Exporta para JSON Lines (um objeto JSON por linha)"""
+        data_hora = FormatadorHorario('%Y-%m-%dT%H:%M:%S')
+        with open(filepath, 'a' if acrescentar else 'w', encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+            for bloco in _blocos(historico, inicio=inicio):
+                # Montado direto em texto: só as strings passam pelo escape do
+                # módulo json (em C), sem criar um dicionário por registro
+                resultados = _resultados(bloco)
+                f.write("".join([
+                    f'{{"n": {i}, "timestamp": {item.timestamp!r}, '
+                    f'"data_hora": "{data_hora(item.timestamp)}", '
+                    f'"expressao": {encode_basestring(item.expressao)}, '
+                    f'"resultado": {encode_basestring(resultado)}, '
+                    f'"valor": {_valor_json(item.valor)}}}\n'
+                    for (i, item), resultado in zip(bloco, resultados)
+                ]))
+        
+        return True
+    
+    @staticmethod
+    def exportar_pdf(historico, filepath):
+        """Exporta para PDF usando ReportLab"""
+        try:
+            from reportlab.lib import colors
+            from reportlab.lib.pagesizes import A4
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.lib.styles import getSampleStyleSheet
+            
+            # Históricos grandes: layout de linhas fixas, página a página
+            registros = iter(historico)
+            inicio = list(islice(registros, LIMITE_PDF_TABELA + 1))
+            if len(inicio) > LIMITE_PDF_TABELA:
+                return _exportar_pdf_paginado(chain(inicio, registros), filepath)
+            historico = inicio
+            
+            doc = SimpleDocTemplate(filepath, pagesize=A4)
+            elements = []
+            styles = getSampleStyleSheet()
+            
+            # Título
+            title = Paragraph("<b>Histórico da Calculadora</b>", styles['Heading1'])
+            elements.append(title)
+            
+            # Data
+            date_para = Paragraph(
+                f"Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 
+                styles['Normal']
+            )
+            elements.append(date_para)
+            elements.append(Spacer(1, 20))
+            
+            # Tabela
+            hora = FormatadorHorario('%H:%M:%S')
+            data = [['#', 'Hora', 'Expressão', 'Resultado']]
+            for i, item in enumerate(historico, 1):
+                data.append([
+                    str(i),
+                    hora(item.timestamp),
+                    item.expressao,
+                    item.resultado
+                ])
+            
+            table = Table(data, colWidths=[30, 60, 200, 100])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('FONTNAME', (0, 1), (-1, -1), 'Courier'),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ]))
+            
+            elements.append(table)
+            doc.build(elements)
+            return True
+            
+        except ImportError:
+            raise Exception("Biblioteca reportlab não instalada. Execute: uv add reportlab")
+    
+    @staticmethod
+    def exportar_npz(historico, filepath):
+        """Exporta as colunas para um NPZ do NumPy (sem compressão).
+
+        Arrays: ``timestamp_us`` (int64, microssegundos desde a época),
+        ``valor`` (float64; inteiros grandes demais viram ±inf),
+        ``expressao_utf8`` (uint8) e ``expressao_offsets`` (int64): a
+        expressão i é ``expressao_utf8[offsets[i]:offsets[i + 1]]`` (ver
+        ler_expressoes). Nada exige pickle, então ``np.load`` é imediato.
+        Ordem: do mais recente ao mais antigo, como nos outros formatos.
+        """
+        np = _numpy()
+        timestamp_us, valor, offsets, dados = _colunas_numpy(np, historico)
+        with open(filepath, 'wb') as f:
+            np.savez(
+                f, timestamp_us=timestamp_us, valor=valor,
+                expressao_offsets=offsets, expressao_utf8=dados,
+            )
+        return True
+    
+    @staticmethod
+    def exportar_arrow(historico, filepath):
+        """Exporta as colunas em Arrow IPC (arquivo Feather v2), com pyarrow"""
+        tabela = _tabela_arrow(historico)
+        import pyarrow.feather as feather
+        
+        feather.write_feather(tabela, filepath, compression='uncompressed')
+        return True
+    
+    @staticmethod
+    def exportar_parquet(historico, filepath):
+        """Exporta as colunas em Parquet, com pyarrow"""
+        tabela = _tabela_arrow(historico)
+        import pyarrow.parquet as pq
+        
+        pq.write_table(tabela, filepath)
+        return True
+    
+    @staticmethod
+    def exportar_png(historico, filepath, processos=None):
+        """Exporta para PNG como imagem renderizada.
+
+        Até LINHAS_POR_PNG operações cabem numa única imagem em ``filepath``.
+        Históricos maiores viram uma sequência de imagens (``nome_0001.png``,
+        ``nome_0002.png``...), desenhadas em paralelo por ``processos``
+        processos. Devolve a lista de arquivos gravados.
+        """
+        if importlib.util.find_spec('PIL') is None:
+            raise Exception("Biblioteca Pillow não instalada. Execute: uv add pillow")
+        
+        subtitulo = f"Exportado: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+        blocos = _linhas_png(historico)
+        primeiro = next(blocos, [])
+        segundo = next(blocos, None)
+        if segundo is None:
+            _renderizar_png(filepath, primeiro, subtitulo)
+            return [filepath]
+        return _exportar_png_em_partes(
+            chain((primeiro, segundo), blocos), filepath, subtitulo, processos
+        )
+
+
+
+# Formatos que aceitam exportação incremental (só acréscimo ao fim do arquivo)
+FORMATOS_INCREMENTAIS = ('txt', 'csv', 'jsonl')
+
+
+class MarcaExportacao:
+    """Marca d'água de uma exportação incremental, gravada ao lado do
+    arquivo exportado (``historico.csv`` -> ``historico.csv.marca``).
+
+    Guarda o id e o instante do último registro exportado, quantas linhas
+    já foram numeradas e o tamanho do arquivo ao fim da exportação: se o
+    arquivo tiver sido mexido, ou o histórico limpo, a marca não vale mais.
+    """
+
+    def __init__(self, formato, ultimo_id, instante, linhas, tamanho):
+        self.formato = formato
+        self.ultimo_id = ultimo_id
+        self.instante = instante
+        self.linhas = linhas
+        self.tamanho = tamanho
+
+    @staticmethod
+    def caminho(filepath):
+        return f"{filepath}.marca"
+
+    @classmethod
+    def ler(cls, filepath):
+        """Marca do arquivo, ou None se não houver (ou estiver ilegível)"""
+        try:
+            with open(cls.caminho(filepath), encoding='utf-8') as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def gravar(self, filepath):
+        caminho = self.caminho(filepath)
+        temporario = caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(vars(self), f)
+        os.replace(temporario, caminho)
+
+    def vale_para(self, formato, filepath, persistencia):
+        """Verdadeiro se dá para só acrescentar ao arquivo a partir desta marca"""
+        try:
+            tamanho = os.path.getsize(filepath)
+        except OSError:
+            return False
+        return (
+            self.formato == formato
+            and self.tamanho == tamanho
+            and persistencia.instante_do_registro(self.ultimo_id) == self.instante
+        )
+
+
+def exportar_incremental(persistencia, formato, filepath, progresso=None, cancelar=None):
+    """Acrescenta a ``filepath`` só os registros gravados desde a última
+    exportação para ele (ver MarcaExportacao); devolve quantos foram escritos.
+
+    O arquivo fica em ordem cronológica (o mais antigo é o nº 1), já que
+    cresce pelo fim. Sem marca válida, é reescrito do zero. O custo é
+    proporcional aos registros novos: a leitura parte do último id
+    exportado. ``progresso(exportados, total)`` e ``cancelar`` funcionam
+    como em ``acompanhar``; se a exportação falhar ou for cancelada, o
+    arquivo fica como era (um acréscimo é desfeito; uma reescrita só
+    substitui o arquivo ao terminar).
+    """
+    if formato not in FORMATOS_INCREMENTAIS:
+        raise ValueError(f"exportação incremental não disponível para {formato}")
+    persistencia.sincronizar()
+    ultimo = persistencia.ultimo_registro()
+    marca = MarcaExportacao.ler(filepath)
+    if marca is None or not marca.vale_para(formato, filepath, persistencia):
+        marca = MarcaExportacao(formato, 0, None, 0, 0)
+        acrescentar = False
+    else:
+        acrescentar = True
+    if ultimo is None or ultimo[0] <= marca.ultimo_id:
+        if acrescentar:
+            return 0
+        ultimo = (0, None)   # histórico vazio: só o cabeçalho
+
+    total = persistencia.contar(marca.ultimo_id, ultimo[0])
+    registros = acompanhar(
+        persistencia.iterar_cronologico(marca.ultimo_id, ultimo[0]),
+        None if progresso is None else (lambda n: progresso(n, total)),
+        cancelar,
+    )
+    exportar = getattr(ExportadorHistorico, f"exportar_{formato}")
+    # Reescrita completa: num arquivo à parte, que só substitui o original
+    # no fim; assim uma falha não apaga a exportação anterior
+    destino = filepath if acrescentar else filepath + ".tmp"
+    try:
+        exportar(registros, destino, acrescentar, marca.linhas + 1)
+    except BaseException:
+        if acrescentar:
+            os.truncate(filepath, marca.tamanho)
+        else:
+            try:
+                os.remove(destino)
+            except OSError:
+                pass
+        raise
+    if not acrescentar:
+        os.replace(destino, filepath)
+
+    MarcaExportacao(
+        formato, ultimo[0], ultimo[1], marca.linhas + total, os.path.getsize(filepath)
+    ).gravar(filepath)
+    return total
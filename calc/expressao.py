@@ -0,0 +1,227 @@
+"""Avaliação de expressões digitadas, como ``2*(3+4)^2 - log(100)``.
+
+O texto é normalizado, convertido em tokens e analisado respeitando a
+precedência dos operadores. A árvore resultante é compilada em funções
+Python aninhadas e guardada num cache LRU, indexado pelo texto
+normalizado, para que fórmulas repetidas não sejam reanalisadas.
+"""
+import math
+import re
+from functools import lru_cache
+
+from . import funcoes, inteiros, motor
+
+TAMANHO_CACHE = 512
+
+# Parênteses, menos unários, raízes e potências encadeadas além disso são
+# recusados: a análise é recursiva e estouraria a pilha do Python. Somas e
+# produtos em sequência (1+1+…+1) não contam: viram uma cadeia avaliada
+# num laço
+MAXIMO_ANINHAMENTO = 200
+
+
+class ErroSintaxe(ValueError):
+    """Expressão mal formada"""
+
+
+# Símbolos não ASCII aceitos na entrada -> forma canônica
+_NORMALIZACAO = str.maketrans({'×': '*', '·': '*', '÷': '/', '−': '-'})
+
+_TOKEN = re.compile(r"""
+    (?P<num>(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)
+  | (?P<nome>[a-zπ_][a-z0-9_]*)
+  | (?P<op>[-+*/^()√²])
+  | (?P<invalido>.)
+""", re.VERBOSE | re.DOTALL)
+
+CONSTANTES = {
+    'pi': math.pi,
+    'π': math.pi,
+    'e': math.e,
+}
+
+# Operador na expressão -> operação do motor (ver motor.OPERACOES)
+_OPERADORES = {'+': '+', '-': '-', '*': '×', '/': '÷', '^': '^'}
+
+
+def normalizar(texto):
+    """Forma canônica do texto, usada como chave do cache"""
+    texto = ''.join(texto.lower().split())
+    if not texto.isascii():
+        texto = texto.translate(_NORMALIZACAO)
+    return texto.replace(',', '.').replace('**', '^')
+
+
+def tokenizar(texto):
+    """Divide um texto já normalizado em tokens ``(tipo, valor)``"""
+    tokens = []
+    for num, nome, op, invalido in _TOKEN.findall(texto):
+        if num:
+            tokens.append(('num', num))
+        elif nome:
+            tokens.append(('nome', nome))
+        elif op:
+            tokens.append(('op', op))
+        else:
+            raise ErroSintaxe(f"Caractere inesperado: {invalido!r}")
+    return tokens
+
+# ===== ANÁLISE SINTÁTICA =====
+#
+# Análise por precedência de operadores:
+#
+#   + -   (1, à esquerda)     * /   (2, à esquerda)     ^   (3, à direita)
+#
+# O menos unário se liga mais fraco que ^ (-2^2 = -4) e mais forte que * /.
+# primario := NUM | CONST | FUNC '(' expr ')' | '√' primario | '(' expr ')',
+# seguido de zero ou mais '²'.
+#
+# Nós da árvore: ('num', v), ('cadeia', a, ((op, b), ...)), ('neg', a),
+# ('func', nome, a). A cadeia aplica as operações da esquerda para a direita:
+# 1-2*3+4 é ('cadeia', 1, (('-', 2*3), ('+', 4)))
+
+_FIM = (None, None)
+
+_PRECEDENCIA = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+
+
+class _Analisador:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.tokens.append(_FIM)
+        self.pos = 0
+        self.profundidade = 0
+
+    def _entrar(self):
+        self.profundidade += 1
+        if self.profundidade > MAXIMO_ANINHAMENTO:
+            raise ErroSintaxe("Expressão aninhada demais")
+
+    def _consumir(self, valor):
+        if self.tokens[self.pos][1] != valor:
+            raise ErroSintaxe(f"Esperado {valor!r}")
+        self.pos += 1
+
+    def analisar(self):
+        if self.tokens[0] is _FIM:
+            raise ErroSintaxe("Expressão vazia")
+        no = self._expr(1)
+        if self.tokens[self.pos] is not _FIM:
+            raise ErroSintaxe(f"Token inesperado: {self.tokens[self.pos][1]!r}")
+        return no
+
+    def _expr(self, minimo):
+        self._entrar()
+        tokens = self.tokens
+        op = tokens[self.pos][1]
+        if op == '-':
+            self.pos += 1
+            no = ('neg', self._expr(3))
+        elif op == '+':
+            self.pos += 1
+            no = self._expr(3)
+        else:
+            no = self._primario()
+
+        operacoes = []
+        while True:
+            tipo, op = tokens[self.pos]
+            precedencia = _PRECEDENCIA.get(op) if tipo == 'op' else None
+            if precedencia is None or precedencia < minimo:
+                self.profundidade -= 1
+                return ('cadeia', no, tuple(operacoes)) if operacoes else no
+            self.pos += 1
+            # ^ é associativo à direita; os demais, à esquerda
+            operacoes.append((op, self._expr(3 if op == '^' else precedencia + 1)))
+
+    def _primario(self):
+        tipo, valor = self.tokens[self.pos]
+        if tipo is None:
+            raise ErroSintaxe("Fim inesperado da expressão")
+        self.pos += 1
+
+        if tipo == 'num':
+            # Inteiros literais ficam exatos (ver motor.OPERACOES)
+            numero = inteiros.de_texto(valor) if valor.isdecimal() else float(valor)
+            if numero == math.inf:
+                raise OverflowError(f"Número fora do intervalo: {valor}")
+            no = ('num', numero)
+        elif valor == '(':
+            no = self._expr(1)
+            self._consumir(')')
+        elif valor == '√':
+            self._entrar()
+            no = ('func', 'raiz', self._primario())
+            self.profundidade -= 1
+        elif tipo == 'nome':
+            # Constantes primeiro: nomes de função desconhecidos disparam a
+            # busca por plugins (ver funcoes.buscar)
+            if valor in CONSTANTES:
+                no = ('num', CONSTANTES[valor])
+            else:
+                funcao = funcoes.buscar(valor)
+                if funcao is None:
+                    raise ErroSintaxe(f"Nome desconhecido: {valor}")
+                self._consumir('(')
+                no = ('func', funcao.nome, self._expr(1))
+                self._consumir(')')
+        else:
+            raise ErroSintaxe(f"Token inesperado: {valor!r}")
+
+        while self.tokens[self.pos][1] == '²':
+            self.pos += 1
+            no = ('func', 'quadrado', no)
+        return no
+
+
+def analisar(texto):
+    """Converte um texto já normalizado na árvore sintática"""
+    return _Analisador(tokenizar(texto)).analisar()
+
+# ===== COMPILAÇÃO =====
+
+def _compilar_no(no):
+    tipo = no[0]
+    if tipo == 'num':
+        valor = no[1]
+        return lambda: valor
+    if tipo == 'neg':
+        operando = _compilar_no(no[1])
+        return lambda: -operando()
+    if tipo == 'func':
+        funcao = funcoes.obter(no[1]).aplicar
+        argumento = _compilar_no(no[2])
+        return lambda: funcao(argumento())
+    primeiro = _compilar_no(no[1])
+    passos = tuple((motor.OPERACOES[_OPERADORES[op]], _compilar_no(operando))
+                   for op, operando in no[2])
+    if len(passos) == 1:
+        (funcao, direita), = passos
+        return lambda: funcao(primeiro(), direita())
+
+    def cadeia():
+        valor = primeiro()
+        for funcao, operando in passos:
+            valor = funcao(valor, operando())
+        return valor
+    return cadeia
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _compilar_normalizado(normalizado):
+    return _compilar_no(analisar(normalizado))
+
+
+def compilar(texto):
+    """Devolve uma função sem argumentos que avalia a expressão (com cache)"""
+    return _compilar_normalizado(normalizar(texto))
+
+
+def avaliar(texto):
+    """Avalia a expressão; levanta ErroSintaxe, ValueError ou ArithmeticError"""
+    return compilar(texto)()
+
+
+def info_cache():
+    """Estatísticas do cache de expressões compiladas"""
+    return _compilar_normalizado.cache_info()
@@ -0,0 +1,185 @@
+"""Formatação de números para o display, o histórico e as exportações.
+
+Floats são escritos a partir da menor representação que volta exatamente
+ao mesmo valor (``repr``), ou arredondados a um número configurável de
+algarismos significativos, e então dispostos em notação fixa ou
+científica conforme os limites do formatador. Não há reconversão com
+``float()`` nem formatação com casas fixas seguida de ``rstrip``.
+Inteiros exatos vão direto para ``inteiros.resumir``.
+
+    >>> DISPLAY(0.1 + 0.2), EXATO(0.1 + 0.2)
+    ('0.3', '0.30000000000000004')
+"""
+import math
+
+from . import inteiros
+
+# Inteiros até este tamanho (~3900 dígitos) vão direto para str(), sem
+# passar pela contagem de dígitos de inteiros.resumir
+_BITS_TEXTO_DIRETO = 13000
+
+# Floats inteiros até 10^15 são exatos e saem como str(int(x))
+_MAIOR_FLOAT_INTEIRO = 1e15
+
+
+def _decompor(texto):
+    """'-1.25e-07' -> ('-', '125', -7): sinal, dígitos significativos e
+    expoente do primeiro dígito"""
+    sinal = ''
+    if texto[0] == '-':
+        sinal, texto = '-', texto[1:]
+    mantissa, _, expoente = texto.partition('e')
+    expoente = int(expoente) if expoente else 0
+    inteira, _, fracao = mantissa.partition('.')
+    inteira = inteira.lstrip('0')
+    if inteira:
+        expoente += len(inteira) - 1
+        digitos = inteira + fracao
+    else:
+        significativa = fracao.lstrip('0')
+        expoente -= len(fracao) - len(significativa) + 1
+        digitos = significativa
+    return sinal, digitos.rstrip('0') or '0', expoente
+
+
+def _montar(sinal, digitos, expoente, cientifico):
+    """Texto do número em notação científica ou fixa"""
+    if cientifico:
+        if len(digitos) > 1:
+            return f"{sinal}{digitos[0]}.{digitos[1:]}e{expoente:+03d}"
+        return f"{sinal}{digitos}e{expoente:+03d}"
+    if expoente < 0:
+        return f"{sinal}0.{'0' * (-expoente - 1)}{digitos}"
+    if len(digitos) <= expoente + 1:
+        return sinal + digitos + '0' * (expoente + 1 - len(digitos))
+    return f"{sinal}{digitos[:expoente + 1]}.{digitos[expoente + 1:]}"
+
+
+class FormatadorNumeros:
+    """Formata números com a menor representação possível.
+
+    ``digitos`` limita os algarismos significativos de floats (None: todos
+    os necessários para a ida e volta exata). Valores com módulo acima de
+    ``maximo_fixo`` ou abaixo de ``minimo_fixo`` (exceto zero) saem em
+    notação científica.
+    """
+
+    def __init__(self, digitos=None, maximo_fixo=1e16, minimo_fixo=1e-4, maximo_cache=4096):
+        self.digitos = digitos
+        self.maximo_fixo = maximo_fixo
+        self.minimo_fixo = minimo_fixo
+        self.maximo_cache = maximo_cache
+        self._cache = {}
+        # A partir de 17 algarismos, repr já é exato
+        self._formato = f".{digitos}g" if digitos is not None and digitos < 17 else None
+        self._maior_inteiro_fixo = min(_MAIOR_FLOAT_INTEIRO, maximo_fixo) if minimo_fixo <= 1 else 0
+        # -0.0: o display mostra 0; na ida e volta exata o sinal é mantido
+        self._menos_zero = '-0' if self._formato is None else '0'
+        # Faixa em que '%.Ng' (ou repr) já sai em notação fixa, sem '.0' e
+        # sem zeros à direita: ali o texto é o resultado, sem _decompor
+        if self._formato is None:
+            self._rapido = '%r'
+            self._cientifico = None
+            maximo_rapido = self._maior_inteiro_fixo
+        else:
+            self._rapido = f'%.{digitos}g'
+            self._cientifico = f'%.{max(digitos - 1, 0)}e'
+            maximo_rapido = 10.0 ** (digitos - 1)
+        self._faixa_rapida = (max(minimo_fixo, 1e-4), min(maximo_fixo, maximo_rapido))
+
+    def formatar(self, valor):
+        """Texto de um valor (int, float ou outro, via str)"""
+        tipo = type(valor)
+        if tipo is int:
+            if valor.bit_length() < _BITS_TEXTO_DIRETO:
+                return str(valor)
+            return inteiros.resumir(valor)
+        if tipo is not float:
+            if isinstance(valor, int):
+                return self.formatar(int(valor))
+            if not isinstance(valor, float):
+                return str(valor)
+
+        modulo = abs(valor)
+        if modulo <= self._maior_inteiro_fixo and valor.is_integer():
+            if valor or math.copysign(1.0, valor) > 0:
+                return str(int(valor))
+            return self._menos_zero
+        minimo, maximo = self._faixa_rapida
+        if minimo <= modulo < maximo:
+            return self._rapido % valor
+
+        # Fora da faixa rápida o texto é remontado; o mesmo resultado
+        # costuma ser formatado várias vezes (display, linhas do histórico
+        # recicladas na rolagem, exportações)
+        texto = self._cache.get(valor)
+        if texto is None:
+            if len(self._cache) >= self.maximo_cache:
+                self._cache.clear()
+            texto = self._cache[valor] = self._formatar_float(valor, modulo)
+        return texto
+
+    __call__ = formatar
+
+    def _formatar_float(self, valor, modulo):
+        texto = self._rapido % valor
+        cientifico = modulo > self.maximo_fixo or modulo < self.minimo_fixo
+        if ('e' in texto) is cientifico:
+            # Caso comum: repr/'%.Ng' já escolheram a notação desejada
+            if cientifico or texto[-2:] != '.0':
+                return texto
+            return texto[:-2]
+        if not math.isfinite(valor):
+            return texto
+        if self._cientifico is None:
+            return _montar(*_decompor(texto), cientifico)
+        if cientifico:
+            # Os mesmos N algarismos em '%.{N-1}e', sem os zeros à direita
+            mantissa, _, expoente = (self._cientifico % valor).partition('e')
+            return f"{mantissa.rstrip('0').rstrip('.')}e{expoente}"
+        # '%.Ng' em notação científica já vem sem zeros à direita
+        mantissa, _, expoente = texto.partition('e')
+        sinal = '-' if mantissa[0] == '-' else ''
+        return _montar(sinal, mantissa.lstrip('-').replace('.', ''), int(expoente), False)
+
+    def lote(self, valores):
+        """Lista com os textos de vários valores (usada pelos exportadores)
+
+        Mesmo resultado de ``formatar`` valor a valor, com os casos comuns
+        (int, float inteiro, float na faixa rápida) resolvidos no laço.
+        """
+        formatar = self.formatar
+        rapido = self._rapido
+        maior_inteiro = self._maior_inteiro_fixo
+        minimo, maximo = self._faixa_rapida
+        textos = []
+        acrescentar = textos.append
+        for valor in valores:
+            tipo = type(valor)
+            if tipo is float:
+                modulo = abs(valor)
+                if modulo <= maior_inteiro and valor.is_integer():
+                    if valor or math.copysign(1.0, valor) > 0:
+                        acrescentar(str(int(valor)))
+                    else:
+                        acrescentar(self._menos_zero)
+                elif minimo <= modulo < maximo:
+                    acrescentar(rapido % valor)
+                else:
+                    acrescentar(formatar(valor))
+            elif tipo is int and valor.bit_length() < _BITS_TEXTO_DIRETO:
+                acrescentar(str(valor))
+            else:
+                acrescentar(formatar(valor))
+        return textos
+
+
+# Display e histórico: 15 algarismos (0.1 + 0.2 aparece como 0.3) e
+# notação científica fora de [1e-10, 1e10]
+DISPLAY = FormatadorNumeros(digitos=15, maximo_fixo=1e10, minimo_fixo=1e-10)
+
+# Ida e volta exata: float(EXATO(x)) == x
+EXATO = FormatadorNumeros()
+
+formatar = DISPLAY.formatar
+formatar_exato = EXATO.formatar
@@ -0,0 +1,191 @@
+"""Registro das funções científicas da calculadora.
+
+Cada função é declarada uma única vez, com tudo o que a calculadora
+precisa dela: verificação de domínio, implementação escalar (motor e
+expressões), implementação NumPy opcional (vetorizado.avaliar_array),
+formato da linha do histórico e posição do botão no teclado científico.
+Sem implementação NumPy, a avaliação em lote usa a escalar elemento a
+elemento, então toda função registrada funciona em lote.
+
+Funções de terceiros são plugins no grupo de entry points
+``calc.funcoes``: o nome do entry point é o nome da função nas
+expressões e o objeto apontado é uma ``Funcao``. Os plugins só são
+procurados quando um nome desconhecido é usado, e só o plugin pedido é
+importado; sem uso, não custam nada na abertura.
+
+    # pyproject.toml do plugin
+    [project.entry-points."calc.funcoes"]
+    cosh = "meu_plugin:COSH"
+
+    # meu_plugin.py
+    from calc.funcoes import Funcao
+    COSH = Funcao('cosh', "cosh({})", math.cosh, vetorizada=lambda np: np.cosh)
+"""
+import math
+
+from . import inteiros
+
+GRUPO_PLUGINS = 'calc.funcoes'
+
+# Exceções que representam um cálculo inválido ("Erro" no display)
+ERROS_CALCULO = (ValueError, ArithmeticError, TypeError)
+
+
+class Funcao:
+    """Função científica de um argumento.
+
+    - ``nome``: nome canônico, usado nas ações do motor e nas expressões;
+    - ``historico``: formato da expressão no histórico, como ``"√({})"``;
+    - ``escalar``: implementação para um int ou float;
+    - ``fora_do_dominio``: predicado dos valores inválidos, escrito só
+      com comparações para valer tanto para escalares quanto para arrays
+      (ex.: ``lambda x: x < 0``);
+    - ``vetorizada``: recebe o módulo numpy e devolve a ufunc equivalente
+      (ex.: ``lambda np: np.sqrt``), sem importar NumPy no registro;
+    - ``rotulo``: texto do botão (padrão: o nome);
+    - ``posicao``: ``(linha, coluna)`` no teclado científico, ou None
+      para uma função só de expressões e lote;
+    - ``apelidos``: outros nomes aceitos.
+    """
+
+    def __init__(self, nome, historico, escalar, fora_do_dominio=None, vetorizada=None,
+                 rotulo=None, posicao=None, apelidos=()):
+        self.nome = nome
+        self.historico = historico
+        self.escalar = escalar
+        self.fora_do_dominio = fora_do_dominio
+        self._vetorizada = vetorizada
+        self.rotulo = rotulo or nome
+        self.posicao = posicao
+        self.apelidos = tuple(apelidos)
+
+    def __repr__(self):
+        return f"Funcao({self.nome!r})"
+
+    def aplicar(self, valor):
+        """Aplica a função; levanta ValueError/ArithmeticError se inválida"""
+        if self.fora_do_dominio is not None and self.fora_do_dominio(valor):
+            raise ValueError(f"{self.nome}: valor fora do domínio")
+        resultado = self.escalar(valor)
+        if type(resultado) is float and not math.isfinite(resultado):
+            raise OverflowError(f"{self.nome}: resultado fora do intervalo")
+        return resultado
+
+    def vetorizada(self, np):
+        """Implementação elemento a elemento para arrays (NaN onde inválida)"""
+        if self._vetorizada is not None:
+            return self._vetorizada(np)
+        aplicar = self.aplicar
+
+        def elemento(x):
+            try:
+                return float(aplicar(x))
+            except ERROS_CALCULO:
+                return math.nan
+        return np.vectorize(elemento, otypes=[np.float64])
+
+
+# Nome canônico -> Funcao, na ordem de registro
+_funcoes = {}
+
+# Nome, rótulo ou apelido -> Funcao
+_nomes = {}
+
+# Nome -> entry point ainda não carregado (None até a primeira busca)
+_plugins = None
+
+
+def registrar(funcao):
+    """Registra uma Funcao pelo nome, rótulo e apelidos; devolve a própria função"""
+    nomes = (funcao.nome, funcao.rotulo, *funcao.apelidos)
+    for nome in nomes:
+        existente = _nomes.get(nome)
+        if existente is not None and existente is not funcao:
+            raise ValueError(f"Nome de função já registrado: {nome}")
+    _funcoes[funcao.nome] = funcao
+    for nome in nomes:
+        _nomes[nome] = funcao
+    return funcao
+
+
+def _pontos_de_entrada():
+    global _plugins
+    if _plugins is None:
+        from importlib.metadata import entry_points
+
+        _plugins = {ponto.name: ponto for ponto in entry_points(group=GRUPO_PLUGINS)}
+    return _plugins
+
+
+def _carregar_plugin(nome):
+    ponto = _pontos_de_entrada().pop(nome, None)
+    if ponto is None:
+        return None
+    try:
+        funcao = ponto.load()
+        if not isinstance(funcao, Funcao):
+            raise TypeError(f"{ponto.value} não é uma Funcao")
+        return registrar(funcao)
+    except Exception as e:
+        raise ValueError(f"Plugin de função {nome!r} inválido: {e}") from e
+
+
+def buscar(nome):
+    """Funcao registrada com esse nome (carregando o plugin, se houver), ou None"""
+    funcao = _nomes.get(nome)
+    if funcao is None:
+        funcao = _carregar_plugin(nome)
+    return funcao
+
+
+def obter(nome):
+    """Como ``buscar``, mas levanta ValueError se a função não existir"""
+    funcao = buscar(nome)
+    if funcao is None:
+        raise ValueError(f"Função desconhecida: {nome}")
+    return funcao
+
+
+def com_botao():
+    """Funções já registradas que têm posição no teclado científico"""
+    return [funcao for funcao in _funcoes.values() if funcao.posicao is not None]
+
+# ===== FUNÇÕES EMBUTIDAS =====
+#
+# Operandos inteiros ficam exatos quando o resultado também é inteiro
+# (ver motor.OPERACOES); os demais viram float.
+
+def _quadrado(x):
+    if type(x) is int:
+        inteiros.verificar_potencia(x, 2)
+    return x ** 2
+
+def _raiz(x):
+    if type(x) is int and x >= 0:
+        r = math.isqrt(x)
+        if r * r == x:
+            return r
+    return math.sqrt(x)
+
+def _exp10(x):
+    if type(x) is int:
+        inteiros.verificar_potencia(10, x)
+    return 10 ** x
+
+
+registrar(Funcao('quadrado', "sqr({})", _quadrado, vetorizada=lambda np: np.square,
+                 rotulo='x²', posicao=(0, 0), apelidos=('sqr',)))
+registrar(Funcao('raiz', "√({})", _raiz, lambda x: x < 0, lambda np: np.sqrt,
+                 rotulo='√x', posicao=(0, 1), apelidos=('√', 'sqrt')))
+registrar(Funcao('log', "log({})", math.log10, lambda x: x <= 0, lambda np: np.log10,
+                 posicao=(0, 2)))
+registrar(Funcao('ln', "ln({})", math.log, lambda x: x <= 0, lambda np: np.log,
+                 posicao=(0, 3)))
+registrar(Funcao('exp10', "10^({})", _exp10, vetorizada=lambda np: lambda x: np.power(10.0, x),
+                 rotulo='10ˣ', posicao=(1, 1), apelidos=('10^x',)))
+registrar(Funcao('exp', "e^({})", math.exp, vetorizada=lambda np: np.exp,
+                 rotulo='eˣ', posicao=(1, 2), apelidos=('e^x',)))
+registrar(Funcao('sinh', "sinh({})", math.sinh, vetorizada=lambda np: np.sinh,
+                 posicao=(2, 0)))
+registrar(Funcao('gamma', "gamma({})", math.gamma, rotulo='Γ(x)', posicao=(2, 1)))
+registrar(Funcao('erf', "erf({})", math.erf, posicao=(2, 2)))
@@ -0,0 +1,182 @@
+"""Gravação de sessões e reprodução sem interface.
+
+Com ``calc --gravar-sessao ARQUIVO``, cada ação da janela (teclas, botões,
+expressões, colagens, cliques no histórico) é gravada como uma linha JSON
+com o nome da ação do motor (ver motor.ACOES). Ao fechar, a última linha
+guarda o display e as operações acrescentadas ao histórico na sessão.
+
+``reproduzir`` executa a gravação contra o MotorCalculadora, sem GTK e sem
+pausas, medindo a latência de cada ação, e confere se o display e o
+histórico finais batem com os gravados:
+
+    python -m calc.gravacao sessao.jsonl
+"""
+import json
+import sys
+import time
+
+from . import inteiros
+from .motor import MotorCalculadora, formatar_resultado, para_numero
+
+VERSAO = 1
+
+# Ação da janela (não do motor) registrada na gravação
+LIMPAR_HISTORICO = 'limpar_historico'
+
+PERCENTIS = (50, 90, 99, 99.9)
+
+
+def _serializar(argumento):
+    # Números (ex.: valor carregado do histórico) vão como texto exato
+    if type(argumento) is int:
+        return {'numero': inteiros.para_texto(argumento)}
+    if type(argumento) is float:
+        return {'numero': repr(argumento)}
+    return argumento
+
+
+def _desserializar(argumento):
+    if isinstance(argumento, dict):
+        return para_numero(argumento['numero'])
+    return argumento
+
+
+class GravadorSessao:
+    """Grava as ações de uma sessão em JSON Lines"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, 'w', encoding='utf-8')
+        self._inicio = time.perf_counter()
+        self._escrever({'versao': VERSAO, 'inicio': time.time()})
+
+    def _escrever(self, registro):
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    def registrar(self, acao, argumento=None, origem=None):
+        self._escrever({
+            't': round(time.perf_counter() - self._inicio, 6),
+            'acao': acao,
+            'arg': _serializar(argumento),
+            'origem': origem,
+        })
+
+    def registrar_limpeza_historico(self):
+        self.registrar(LIMPAR_HISTORICO, origem='menu')
+
+    def finalizar(self, motor, historico):
+        """Grava o estado final; ``historico`` são os HistoricoItem da sessão, do mais antigo ao mais novo"""
+        self._escrever({
+            'fim': True,
+            'display': motor.valor_atual,
+            'operacao': motor.texto_operacao(),
+            'historico': [[item.expressao, item.resultado] for item in historico],
+        })
+        self._arquivo.close()
+
+
+def carregar(caminho):
+    """Lê uma gravação: ``(eventos, final)``; eventos são pares ``(acao, argumento)``"""
+    eventos = []
+    final = None
+    with open(caminho, encoding='utf-8') as f:
+        for linha in f:
+            registro = json.loads(linha)
+            if 'acao' in registro:
+                eventos.append((registro['acao'], _desserializar(registro['arg'])))
+            elif registro.get('fim'):
+                final = registro
+    return eventos, final
+
+
+def _percentil(ordenados, p):
+    # Método do posto mais próximo
+    indice = max(0, min(len(ordenados) - 1, -(-len(ordenados) * p // 100) - 1))
+    return ordenados[int(indice)]
+
+
+def reproduzir(eventos, final=None):
+    """Executa os eventos num motor novo e devolve um relatório (dict).
+
+    A latência de cada ação inclui o que a janela faria em seguida: montar
+    o texto da operação (o do display a própria ação já monta). Se ``final`` for dado, o relatório
+    traz em ``divergencias`` as diferenças em relação ao estado gravado.
+    """
+    historico = []
+    motor = MotorCalculadora(ao_registrar=lambda expressao, resultado: historico.append((expressao, resultado)))
+    latencias = []
+    relogio = time.perf_counter_ns
+    executar = motor.executar
+
+    inicio_total = relogio()
+    for acao, argumento in eventos:
+        inicio = relogio()
+        if acao == LIMPAR_HISTORICO:
+            historico.clear()
+        elif acao == 'avaliar_lote':
+            historico.extend(executar(acao, argumento)[0])
+        else:
+            executar(acao, argumento)
+        motor.texto_operacao()
+        latencias.append(relogio() - inicio)
+    total = (relogio() - inicio_total) / 1e9
+
+    latencias.sort()
+    latencia_us = {}
+    if latencias:
+        for p in PERCENTIS:
+            latencia_us[f"p{p:g}"] = _percentil(latencias, p) / 1000
+        latencia_us['max'] = latencias[-1] / 1000
+    relatorio = {
+        'acoes': len(eventos),
+        'segundos': total,
+        'acoes_por_segundo': len(eventos) / total if total else 0.0,
+        'latencia_us': latencia_us,
+        'divergencias': [],
+    }
+
+    if final is not None:
+        divergencias = relatorio['divergencias']
+        if motor.valor_atual != final['display']:
+            divergencias.append(f"display: {motor.valor_atual!r} != {final['display']!r}")
+        if motor.texto_operacao() != final['operacao']:
+            divergencias.append(f"operação: {motor.texto_operacao()!r} != {final['operacao']!r}")
+        obtido = [[expressao, formatar_resultado(resultado)] for expressao, resultado in historico]
+        if obtido != final['historico']:
+            divergencias.append(
+                f"histórico: {len(obtido)} operações reproduzidas, {len(final['historico'])} gravadas"
+                + ("" if len(obtido) != len(final['historico']) else " (com valores diferentes)")
+            )
+    return relatorio
+
+
+def _imprimir(caminho, relatorio):
+    print(f"{caminho}: {relatorio['acoes']} ações em {relatorio['segundos'] * 1000:.1f} ms "
+          f"({relatorio['acoes_por_segundo']:,.0f} ações/s)")
+    for nome, valor in relatorio['latencia_us'].items():
+        print(f"  {nome:>6}  {valor:10.1f} µs")
+    for divergencia in relatorio['divergencias']:
+        print(f"  DIVERGÊNCIA {divergencia}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reproduz gravações de sessão sem interface.")
+    parser.add_argument('gravacoes', nargs='+', metavar='ARQUIVO')
+    args = parser.parse_args(argv)
+
+    status = 0
+    for caminho in args.gravacoes:
+        eventos, final = carregar(caminho)
+        relatorio = reproduzir(eventos, final)
+        _imprimir(caminho, relatorio)
+        if final is None:
+            print("  (gravação sem estado final: sessão não foi encerrada)")
+        if relatorio['divergencias']:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
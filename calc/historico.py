@@ -0,0 +1,278 @@
+"""Armazenamento compacto do histórico de operações.
+
+O histórico é guardado em colunas: instantes (epoch) e resultados em
+``array('d')``, expressões internadas numa lista. Cada nova operação é
+acrescentada ao fim das colunas em O(1); as consultas enxergam o
+histórico do mais recente para o mais antigo, sem inserções no início.
+Páginas antigas lidas do disco (ver persistencia.py) também entram só
+por acréscimo, numa segunda série de colunas.
+
+Os objetos ``HistoricoItem`` só são criados sob demanda, para as linhas
+exibidas ou exportadas. O índice de busca (busca.py) também: é montado na
+primeira busca, de uma vez ou em partes (``indexar``), e a partir daí
+atualizado a cada acréscimo.
+"""
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from operator import neg
+
+from .motor import formatar_resultado
+
+# Tipo de cada resultado guardado na coluna de valores
+_FLOAT = 0
+_INTEIRO = 1   # int exato em double (|n| <= 2**53)
+_EXATO = 2     # guardado à parte em _exatos (int grande)
+
+_MAIOR_INTEIRO_EXATO = 2 ** 53
+
+
+def valor_em_float(valor):
+    """O float mais próximo do resultado (±inf para inteiros grandes demais)"""
+    try:
+        return float(valor)
+    except OverflowError:
+        return math.inf if valor > 0 else -math.inf
+
+
+class HistoricoItem:
+    """Uma operação do histórico"""
+    __slots__ = ('expressao', 'valor', 'timestamp')
+
+    def __init__(self, expressao, valor, timestamp=None):
+        self.expressao = expressao
+        self.valor = valor
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def resultado(self):
+        """Resultado formatado como no display"""
+        return formatar_resultado(self.valor)
+
+    @property
+    def data_hora(self):
+        return datetime.fromtimestamp(self.timestamp)
+
+
+class _Colunas:
+    """Colunas de um trecho do histórico, preenchidas só por acréscimo"""
+
+    def __init__(self):
+        self.instantes = array('d')
+        self.valores = array('d')
+        self.tipos = bytearray()
+        self.exatos = {}
+        self.expressoes = []
+
+    def __len__(self):
+        return len(self.instantes)
+
+    def acrescentar(self, expressao, valor, timestamp):
+        posicao = len(self.instantes)
+        if type(valor) is int:
+            if -_MAIOR_INTEIRO_EXATO <= valor <= _MAIOR_INTEIRO_EXATO:
+                self.valores.append(valor)
+                self.tipos.append(_INTEIRO)
+            else:
+                self.valores.append(0.0)
+                self.tipos.append(_EXATO)
+                self.exatos[posicao] = valor
+        else:
+            self.valores.append(valor)
+            self.tipos.append(_FLOAT)
+        self.instantes.append(timestamp)
+        self.expressoes.append(sys.intern(expressao))
+
+    def valor(self, posicao):
+        tipo = self.tipos[posicao]
+        if tipo == _FLOAT:
+            return self.valores[posicao]
+        if tipo == _INTEIRO:
+            return int(self.valores[posicao])
+        return self.exatos[posicao]
+
+    def item(self, posicao):
+        return HistoricoItem(
+            self.expressoes[posicao], self.valor(posicao), self.instantes[posicao]
+        )
+
+
+class Historico:
+    """Histórico em colunas; índice 0 é a operação mais recente.
+
+    As operações da sessão são acrescentadas em ``_recentes`` (do mais
+    antigo para o mais novo). Páginas mais antigas carregadas do disco vão
+    para ``_antigos`` (do mais novo para o mais antigo), de modo que os dois
+    lados crescem só por acréscimo.
+    """
+
+    def __init__(self):
+        self._recentes = _Colunas()
+        self._antigos = _Colunas()
+        self._indice = None
+        # Índice em montagem: [IndiceHistorico, recentes já indexados, antigos já indexados]
+        self._montagem = None
+
+    def __len__(self):
+        return len(self._recentes) + len(self._antigos)
+
+    def adicionar(self, expressao, valor, timestamp=None):
+        """Acrescenta uma operação nova (O(1), mais O(log n) com o índice de
+        busca montado) e devolve o item correspondente"""
+        if timestamp is None:
+            timestamp = time.time()
+        if self._indice is not None:
+            self._indice.adicionar(len(self._recentes), expressao, valor)
+        self._recentes.acrescentar(expressao, valor, timestamp)
+        return HistoricoItem(expressao, valor, timestamp)
+
+    def acrescentar_antigos(self, itens):
+        """Acrescenta ao fim (lado mais antigo) itens em ordem do mais novo ao mais antigo"""
+        antigos, indice = self._antigos, self._indice
+        for item in itens:
+            if indice is not None:
+                indice.adicionar(-1 - len(antigos), item.expressao, item.valor)
+            antigos.acrescentar(item.expressao, item.valor, item.timestamp)
+
+    def limpar(self):
+        self._recentes = _Colunas()
+        self._antigos = _Colunas()
+        self._indice = None
+        self._montagem = None
+
+    def indexar(self, quantidade=None):
+        """Avança a montagem do índice de busca em até ``quantidade``
+        operações (todas, se None); devolve True quando ele está pronto.
+
+        Permite montar o índice aos poucos, no laço principal da interface.
+        O que for acrescentado durante a montagem entra nela, já que as
+        colunas só crescem pelo fim; quando ela alcança o fim das duas
+        colunas, o índice passa a ser atualizado a cada acréscimo.
+        """
+        if self._indice is not None:
+            return True
+        if self._montagem is None:
+            from .busca import IndiceHistorico
+            self._montagem = [IndiceHistorico(), 0, 0]
+        indice, recentes, antigos = self._montagem
+        restante = len(self) if quantidade is None else quantidade
+
+        fim = min(len(self._recentes), recentes + restante)
+        indice.acrescentar_colunas(self._recentes, recentes, fim, antigas=False)
+        restante -= fim - recentes
+        recentes = fim
+        fim = min(len(self._antigos), antigos + restante)
+        indice.acrescentar_colunas(self._antigos, antigos, fim, antigas=True)
+        antigos = fim
+
+        if recentes == len(self._recentes) and antigos == len(self._antigos):
+            self._indice, self._montagem = indice, None
+            return True
+        self._montagem[1:] = recentes, antigos
+        return False
+
+    def progresso_indexacao(self):
+        """Fração do histórico já indexada (1.0 com o índice pronto)"""
+        if self._indice is not None:
+            return 1.0
+        if self._montagem is None or not len(self):
+            return 0.0
+        return (self._montagem[1] + self._montagem[2]) / len(self)
+
+    def indice(self):
+        """Índice de busca (busca.IndiceHistorico), montado no primeiro uso"""
+        if self._indice is None:
+            self.indexar()
+        return self._indice
+
+    def colunas(self):
+        """Todo o histórico em colunas, do mais recente ao mais antigo:
+        ``(instantes, valores, expressoes)``, os dois primeiros em
+        ``array('d')`` (ver valor_em_float). Montadas por cópia das colunas
+        internas, sem criar um objeto por operação."""
+        recentes, antigos = self._recentes, self._antigos
+        instantes = recentes.instantes[::-1] + antigos.instantes
+        valores = recentes.valores[::-1] + antigos.valores
+        expressoes = recentes.expressoes[::-1] + antigos.expressoes
+        ultima = len(recentes) - 1
+        for posicao, valor in recentes.exatos.items():
+            valores[ultima - posicao] = valor_em_float(valor)
+        for posicao, valor in antigos.exatos.items():
+            valores[ultima + 1 + posicao] = valor_em_float(valor)
+        return instantes, valores, expressoes
+
+    # ===== CHAVES =====
+    #
+    # Cada operação tem uma chave estável até o histórico ser limpo: a
+    # posição p em _recentes vira p, e a posição q em _antigos vira -1 - q.
+    # As chaves crescem do mais antigo para o mais recente.
+
+    def indice_da_chave(self, chave):
+        """Índice (0 = mais recente) da operação com essa chave"""
+        return len(self._recentes) - 1 - chave
+
+    def item_da_chave(self, chave):
+        if chave >= 0:
+            return self._recentes.item(chave)
+        return self._antigos.item(-1 - chave)
+
+    def expressao_da_chave(self, chave):
+        if chave >= 0:
+            return self._recentes.expressoes[chave]
+        return self._antigos.expressoes[-1 - chave]
+
+    def valor_da_chave(self, chave):
+        if chave >= 0:
+            return self._recentes.valor(chave)
+        return self._antigos.valor(-1 - chave)
+
+    def tamanhos(self):
+        """``(recentes, antigos)``: quantas operações há em cada lado"""
+        return len(self._recentes), len(self._antigos)
+
+    def posicoes_no_periodo(self, inicio, fim):
+        """Operações com instante em [inicio, fim]: ``(recentes, antigos)``,
+        dois ``range`` de posições (a chave de p em antigos é -1 - p). As
+        colunas de instantes já estão em ordem (crescente em _recentes,
+        decrescente em _antigos), então bastam buscas binárias."""
+        instantes = self._recentes.instantes
+        recentes = range(bisect_left(instantes, inicio), bisect_right(instantes, fim))
+        instantes = self._antigos.instantes
+        antigos = range(bisect_left(instantes, -fim, key=neg), bisect_right(instantes, -inicio, key=neg))
+        return recentes, antigos
+
+    def __getitem__(self, indice):
+        total = len(self)
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise IndexError("índice fora do histórico")
+        recentes = len(self._recentes)
+        if indice < recentes:
+            return self._recentes.item(recentes - 1 - indice)
+        return self._antigos.item(indice - recentes)
+
+    def __iter__(self):
+        """Do mais recente para o mais antigo"""
+        recentes, antigos = self._recentes, self._antigos
+        for posicao in range(len(recentes) - 1, -1, -1):
+            yield recentes.item(posicao)
+        for posicao in range(len(antigos)):
+            yield antigos.item(posicao)
+
+    def recentes(self):
+        """Operações acrescentadas nesta sessão, da mais antiga para a mais recente"""
+        recentes = self._recentes
+        for posicao in range(len(recentes)):
+            yield recentes.item(posicao)
+
+    def cronologico(self):
+        """Do mais antigo para o mais recente"""
+        recentes, antigos = self._recentes, self._antigos
+        for posicao in range(len(antigos) - 1, -1, -1):
+            yield antigos.item(posicao)
+        for posicao in range(len(recentes)):
+            yield recentes.item(posicao)
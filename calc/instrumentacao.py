@@ -0,0 +1,173 @@
+"""Medição opcional de latência dos pontos quentes da interface.
+
+Desligada por padrão: sem ``ativar()`` (``calc --instrumentar``) nada é
+envolvido e o custo é zero. Ligada, ``instrumentar`` troca os métodos
+escolhidos por versões que medem cada chamada com ``perf_counter_ns`` e
+acumulam o tempo num histograma no estilo HDR: baldes log-lineares, com
+32 subdivisões por potência de 2 (erro relativo abaixo de ~3%), memória
+fixa e registro em O(1), de nanossegundos a horas.
+"""
+import functools
+import threading
+import time
+
+SUBDIVISOES_BITS = 5   # 2^5 = 32 baldes por potência de 2
+
+PERCENTIS = (50, 90, 99, 99.9)
+
+_ativa = False
+_histogramas = {}
+_trava = threading.Lock()
+
+
+class Histograma:
+    """Histograma log-linear de durações em nanossegundos"""
+
+    def __init__(self):
+        self.contagens = []
+        self.total = 0
+        self.soma = 0
+        self.minimo = None
+        self.maximo = 0
+
+    @staticmethod
+    def _indice(valor):
+        expoente = max(0, valor.bit_length() - SUBDIVISOES_BITS - 1)
+        return (expoente << SUBDIVISOES_BITS) + (valor >> expoente)
+
+    @staticmethod
+    def _limite_inferior(indice):
+        expoente = max(0, (indice >> SUBDIVISOES_BITS) - 1)
+        return (indice - (expoente << SUBDIVISOES_BITS)) << expoente
+
+    def registrar(self, valor):
+        indice = self._indice(valor)
+        contagens = self.contagens
+        if indice >= len(contagens):
+            contagens.extend([0] * (indice + 1 - len(contagens)))
+        contagens[indice] += 1
+        self.total += 1
+        self.soma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, p):
+        """Valor (ns) abaixo do qual ficam ``p``% das medições (meio do balde)"""
+        if not self.total:
+            return 0
+        alvo = max(1, -(-self.total * p // 100))
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                inicio = self._limite_inferior(indice)
+                fim = self._limite_inferior(indice + 1)
+                return min((inicio + fim) // 2, self.maximo)
+        return self.maximo
+
+    def resumo(self):
+        """Contagem, média, percentis e extremos, em microssegundos"""
+        if not self.total:
+            return {'contagem': 0}
+        resumo = {
+            'contagem': self.total,
+            'media_us': self.soma / self.total / 1000,
+            'min_us': self.minimo / 1000,
+        }
+        for p in PERCENTIS:
+            resumo[f"p{p:g}_us"] = self.percentil(p) / 1000
+        resumo['max_us'] = self.maximo / 1000
+        return resumo
+
+    def baldes(self):
+        """Pares ``(limite_inferior_ns, contagem)`` dos baldes não vazios"""
+        return [
+            (self._limite_inferior(indice), contagem)
+            for indice, contagem in enumerate(self.contagens) if contagem
+        ]
+
+
+def ativar():
+    global _ativa
+    _ativa = True
+
+
+def ativa():
+    return _ativa
+
+
+def histograma(nome):
+    with _trava:
+        h = _histogramas.get(nome)
+        if h is None:
+            h = _histogramas[nome] = Histograma()
+        return h
+
+
+def medir(nome, funcao):
+    """Versão de ``funcao`` que registra a duração de cada chamada em ``nome``"""
+    h = histograma(nome)
+    relogio = time.perf_counter_ns
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        inicio = relogio()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            h.registrar(relogio() - inicio)
+    return medida
+
+
+def medir_com_nome(nomear, funcao):
+    """Como ``medir``, mas o histograma de cada chamada é ``nomear(*args)``"""
+    relogio = time.perf_counter_ns
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        nome = nomear(*args)
+        h = _histogramas.get(nome) or histograma(nome)
+        inicio = relogio()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            h.registrar(relogio() - inicio)
+    return medida
+
+
+def instrumentar(objeto, nomes, prefixo=''):
+    """Troca ``objeto.nome`` por uma versão medida, para cada nome (só se ativa).
+
+    Deve ser chamada antes que os métodos sejam conectados a sinais, já
+    que conexões anteriores guardam o método original.
+    """
+    if not _ativa:
+        return
+    for nome in nomes:
+        setattr(objeto, nome, medir(prefixo + nome, getattr(objeto, nome)))
+
+
+def resumo():
+    """``{nome: resumo}`` de todos os histogramas, em ordem alfabética"""
+    with _trava:
+        itens = sorted(_histogramas.items())
+    return {nome: h.resumo() for nome, h in itens}
+
+
+def salvar_json(caminho):
+    """Grava resumo e baldes de todos os histogramas em JSON"""
+    with _trava:
+        itens = sorted(_histogramas.items())
+    dados = {
+        'gerado_em': time.time(),
+        'subdivisoes_bits': SUBDIVISOES_BITS,
+        'operacoes': {
+            nome: {**h.resumo(), 'baldes_ns': h.baldes()} for nome, h in itens
+        },
+    }
+    import json
+
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=1)
@@ -0,0 +1,112 @@
+"""Utilitários para inteiros exatos de qualquer tamanho.
+
+Converter um inteiro de um milhão de dígitos com ``str()`` é lento e, a
+partir de ``sys.get_int_max_str_digits()`` dígitos (4300 por padrão),
+levanta ValueError. Aqui a contagem de dígitos e os dígitos iniciais e
+finais são obtidos aritmeticamente, sem converter o número inteiro, e as
+conversões completas (quando realmente necessárias) são feitas por
+divisão e conquista, em pedaços abaixo do limite.
+"""
+import math
+import re
+from functools import lru_cache
+
+# Acima deste número de dígitos o display mostra um resumo em vez do valor
+LIMITE_DIGITOS_TEXTO = 4000
+
+# Maior resultado aceito em potências e produtos exatos (~5 milhões de dígitos)
+LIMITE_BITS = 1 << 24
+
+DIGITOS_RESUMO = 12
+
+_LOG10_2 = math.log10(2)
+
+_INTEIRO = re.compile(r"[-+]?\d+")
+
+
+@lru_cache(maxsize=32)
+def potencia_de_10(expoente):
+    return 10 ** expoente
+
+
+def eh_texto_inteiro(texto):
+    """Verdadeiro se o texto é um inteiro literal, como '-123'"""
+    return _INTEIRO.fullmatch(texto) is not None
+
+
+def contar_digitos(n):
+    """Número de dígitos decimais de ``n`` (sem o sinal), sem converter para texto"""
+    n = abs(n)
+    if n < 10:
+        return 1
+    estimativa = int(n.bit_length() * _LOG10_2) + 1
+    if n < potencia_de_10(estimativa - 1):
+        return estimativa - 1
+    return estimativa
+
+
+def digitos_iniciais(n, quantidade, total=None):
+    """Os ``quantidade`` primeiros dígitos de ``n`` (sem o sinal), como texto"""
+    n = abs(n)
+    total = total or contar_digitos(n)
+    if total <= quantidade:
+        return para_texto(n)
+    # 10^(total-1) já está no cache (calculado por contar_digitos); dividi-lo
+    # por uma potência pequena sai bem mais barato que uma nova exponenciação
+    divisor = potencia_de_10(total - 1) // potencia_de_10(quantidade - 1)
+    return str(n // divisor)
+
+
+def digitos_finais(n, quantidade):
+    """Os ``quantidade`` últimos dígitos de ``n`` (sem o sinal), como texto"""
+    return str(abs(n) % potencia_de_10(quantidade)).zfill(quantidade)
+
+
+def resumir(n, quantidade=DIGITOS_RESUMO):
+    """Texto curto para inteiros enormes: '123…789 (1000000 dígitos)'"""
+    total = contar_digitos(n)
+    if total <= LIMITE_DIGITOS_TEXTO:
+        return str(n)
+    sinal = "-" if n < 0 else ""
+    inicio = digitos_iniciais(n, quantidade, total)
+    fim = digitos_finais(n, quantidade)
+    return f"{sinal}{inicio}…{fim} ({total} dígitos)"
+
+
+def para_texto(n):
+    """Todos os dígitos de ``n``, sem esbarrar no limite de conversão do Python"""
+    if n < 0:
+        return "-" + para_texto(-n)
+    total = contar_digitos(n)
+    if total <= LIMITE_DIGITOS_TEXTO:
+        return str(n)
+    metade = total // 2
+    alto, baixo = divmod(n, potencia_de_10(metade))
+    return para_texto(alto) + para_texto(baixo).zfill(metade)
+
+
+def de_texto(texto):
+    """Converte um inteiro literal de qualquer tamanho"""
+    texto = texto.strip()
+    if len(texto) <= LIMITE_DIGITOS_TEXTO:
+        return int(texto)
+    if texto[0] in '+-':
+        valor = de_texto(texto[1:])
+        return -valor if texto[0] == '-' else valor
+    metade = len(texto) // 2
+    alto = de_texto(texto[:-metade])
+    baixo = de_texto(texto[-metade:])
+    return alto * potencia_de_10(metade) + baixo
+
+
+def verificar_potencia(base, expoente):
+    """Levanta OverflowError se base ** expoente exato for grande demais"""
+    if expoente > 0 and abs(base) > 1:
+        if (abs(base).bit_length() - 1) * expoente > LIMITE_BITS:
+            raise OverflowError("Resultado grande demais")
+
+
+def verificar_produto(a, b):
+    """Levanta OverflowError se a * b exato for grande demais"""
+    if a.bit_length() + b.bit_length() > LIMITE_BITS:
+        raise OverflowError("Resultado grande demais")
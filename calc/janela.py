@@ -0,0 +1,1332 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import gi
+
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gdk, Gio, GLib, Gtk
+
+from . import cache, funcoes, instrumentacao
+from .motor import TECLAS, MotorCalculadora, formatar_resultado
+
+# Exportação (exportacao, reportlab, Pillow), o histórico (historico,
+# painel_historico) e o seu banco (persistencia, sqlite3) só são
+# importados no primeiro uso, fora do caminho até o primeiro quadro
+
+# CSS carregado em partes: o da calculadora antes do primeiro quadro, o do
+# histórico (painel_historico.CSS) e o da barra de exportação só quando
+# esses painéis são montados
+_CSS_CALCULADORA = b"""
+    .display {
+        font-size: 36px;
+        font-family: monospace;
+        padding: 20px;
+        background: #1e1e1e;
+        color: #ffffff;
+        border-radius: 8px;
+        margin: 10px;
+    }
+    .display-scientific {
+        font-size: 14px;
+        font-family: monospace;
+        padding: 5px 20px;
+        background: #2d2d2d;
+        color: #aaaaaa;
+        border-radius: 4px;
+        margin: 0 10px;
+    }
+    .entrada-expressao {
+        font-size: 16px;
+        font-family: monospace;
+        margin: 0 10px;
+    }
+    .btn-num {
+        background: #333333;
+        color: white;
+        font-size: 20px;
+        border-radius: 50%;
+        margin: 4px;
+        min-height: 60px;
+        min-width: 60px;
+    }
+    .btn-op {
+        background: #ff9500;
+        color: white;
+        font-size: 20px;
+        border-radius: 50%;
+        margin: 4px;
+        min-height: 60px;
+        min-width: 60px;
+    }
+    .btn-func {
+        background: #a5a5a5;
+        color: black;
+        font-size: 18px;
+        border-radius: 50%;
+        margin: 4px;
+        min-height: 60px;
+        min-width: 60px;
+    }
+    .btn-scientific {
+        background: #2c3e50;
+        color: #ecf0f1;
+        font-size: 16px;
+        border-radius: 12px;
+        margin: 4px;
+        min-height: 50px;
+        font-weight: bold;
+    }
+    button:hover {
+        opacity: 0.9;
+    }
+    .header-btn {
+        margin: 0 4px;
+        padding: 8px 16px;
+        background: #2c3e50;
+        color: white;
+        border-radius: 6px;
+    }
+    .menu-item {
+        padding: 8px 16px;
+    }
+"""
+
+_CSS_EXPORTACAO = b"""
+    .exportacao-barra {
+        padding: 8px 16px;
+        background: #2d2d2d;
+    }
+"""
+
+# Operações indexadas por vez, no laço principal, na montagem do índice de busca
+BLOCO_INDEXACAO = 5000
+
+# Formatos binários em colunas: nome do filtro e extensão do arquivo
+_FORMATOS_COLUNAS = {
+    'npz': ("NumPy (NPZ)", "npz"),
+    'arrow': ("Arrow IPC", "arrow"),
+    'parquet': ("Parquet", "parquet"),
+}
+
+
+def _nome_da_acao(acao, argumento=None, *args):
+    """Nome do histograma de uma ação do motor (ver CalculadoraWindow._instrumentar)"""
+    if acao == 'aplicar_funcao':
+        return f"acao.{acao}.{argumento}"
+    return f"acao.{acao}"
+
+
+def _imprimir_tempo(etapa, segundos):
+    print(f"{etapa:<40}{segundos * 1000:8.1f} ms", file=sys.stderr)
+
+
+def imprimir_tempos(tempos):
+    """Relatório de --startup-timings: duração de cada etapa até o primeiro quadro.
+
+    ``tempos`` é uma lista de ``(etapa, time.perf_counter())``; o primeiro
+    par marca o início da contagem.
+    """
+    inicio = anterior = tempos[0][1]
+    for etapa, instante in tempos[1:]:
+        _imprimir_tempo(etapa, instante - anterior)
+        anterior = instante
+    _imprimir_tempo("total até o primeiro quadro", anterior - inicio)
+
+class CalculadoraWindow(Gtk.ApplicationWindow):
+    def __init__(self, tempos=None, gravar=None, cache_disco=True, **kwargs):
+        super().__init__(**kwargs)
+        self.set_title("Calculadora Científica")
+        self.set_default_size(900, 700)
+        
+        self.tempos = tempos
+        if instrumentacao.ativa():
+            self._instrumentar()
+        self.historico = None
+        self.persistencia = None
+        self._menor_id_carregado = None
+        self._historico_esgotado = True
+        self.historico_box = None
+        self.historico_visivel = True
+        self._consulta = ""
+        self._id_carga_restante = 0
+        self._id_indexacao = 0
+        self.exportacao_revealer = None
+        self._cancelar_exportacao = None
+        
+        # Gravação da sessão (--gravar-sessao), ver gravacao.py
+        self.gravador = None
+        if gravar:
+            from .gravacao import GravadorSessao
+            self.gravador = GravadorSessao(gravar)
+        
+        # Resultados já calculados (nesta sessão ou, em disco, nas anteriores)
+        arquivo_cache = cache.caminho_padrao() if cache_disco else None
+        self.cache = cache.CacheResultados(arquivo_cache)
+        
+        # Display: atualizado no máximo uma vez por quadro (atualizar_display)
+        self._id_tick_display = 0
+        self._texto_display = "0"
+        self._texto_operacao = ""
+        
+        self._carregar_css(_CSS_CALCULADORA)
+        self._setup_header_bar()
+        self._setup_content()
+        self._setup_aceleradores()
+        self._marcar_tempo("janela construída")
+        
+        # O painel do histórico (e o banco) só é montado depois do primeiro
+        # quadro, ou antes, se for usado
+        self.connect("realize", self._on_realize)
+        self.connect("close-request", self._on_fechar)
+    
+    def _instrumentar(self):
+        """Mede os pontos quentes da janela (só com --instrumentar).
+
+        As ações do motor são medidas em ``_executar``, por onde passam
+        tanto os botões quanto as teclas: um histograma por ação (e por
+        função científica, em ``aplicar_funcao``).
+        """
+        instrumentacao.instrumentar(self, (
+            'adicionar_ao_historico',
+            'adicionar_lote_ao_historico',
+            'atualizar_display',
+            '_on_tick_display',
+        ), 'janela.')
+        self._executar = instrumentacao.medir_com_nome(_nome_da_acao, self._executar)
+    
+    def _marcar_tempo(self, etapa):
+        if self.tempos is not None:
+            self.tempos.append((etapa, time.perf_counter()))
+    
+    def _on_realize(self, window):
+        relogio = self.get_frame_clock()
+        self._id_primeiro_quadro = relogio.connect("after-paint", self._on_primeiro_quadro)
+    
+    def _on_primeiro_quadro(self, relogio):
+        relogio.disconnect(self._id_primeiro_quadro)
+        if self.tempos is not None:
+            self._marcar_tempo("primeiro quadro")
+            imprimir_tempos(self.tempos)
+        GLib.idle_add(self._montar_historico_adiado)
+    
+    def _montar_historico_adiado(self):
+        inicio = time.perf_counter()
+        self._garantir_historico()
+        # O cache em disco abre numa thread própria, já com a janela pintada
+        self.cache.abrir_disco()
+        if self.tempos is not None:
+            _imprimir_tempo("painel do histórico (após o 1º quadro)", time.perf_counter() - inicio)
+        return False
+    
+    def _garantir_historico(self):
+        """Monta o painel do histórico e abre o banco, se ainda não foi feito"""
+        if self.historico_box is not None:
+            return
+        from . import painel_historico
+        from .historico import Historico
+        
+        self.historico = Historico()
+        self._carregar_css(painel_historico.CSS)
+        self._avisou_falha_gravacao = False
+        self.persistencia = self._abrir_persistencia()
+        self._historico_esgotado = self.persistencia is None
+        self.historico_box = self._criar_historico_panel()
+        if self.historico_visivel:
+            self.paned.set_end_child(self.historico_box)
+        self._carregar_pagina_historico()
+    
+    def _abrir_persistencia(self):
+        """Abre o histórico em disco; sem ele, o histórico fica só na memória"""
+        import sqlite3
+
+        from .persistencia import HistoricoPersistente
+        try:
+            return HistoricoPersistente(ao_falhar=self._on_falha_gravacao)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Histórico persistente indisponível: {e}")
+            return None
+
+    def _on_falha_gravacao(self, erro, quantidade):
+        """Chamado na thread de gravação; avisa só na primeira falha"""
+        if not self._avisou_falha_gravacao:
+            self._avisou_falha_gravacao = True
+            o_que = f"{quantidade} operações não foram gravadas" if quantidade else "O histórico não foi limpo"
+            GLib.idle_add(self._mostrar_erro, "Erro ao gravar o histórico", f"{o_que} no disco: {erro}")
+    
+    def _on_fechar(self, window):
+        if self.gravador is not None:
+            recentes = self.historico.recentes() if self.historico is not None else []
+            self.gravador.finalizar(self.motor, recentes)
+            self.gravador = None
+        if self.persistencia is not None:
+            self.persistencia.fechar()
+        self.cache.fechar()
+        return False
+        
+    def _carregar_css(self, dados):
+        css_provider = Gtk.CssProvider()
+        css_provider.load_from_data(dados)
+        Gtk.StyleContext.add_provider_for_display(
+            Gdk.Display.get_default(),
+            css_provider,
+            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+        )
+
+    def _setup_header_bar(self):
+        """Configura a barra de cabeçalho com menu"""
+        header = Gtk.HeaderBar()
+        self.set_titlebar(header)
+        
+        # Menu button
+        menu_button = Gtk.MenuButton()
+        menu_button.set_icon_name("open-menu-symbolic")
+        menu_button.add_css_class("header-btn")
+        
+        # Criar menu
+        menu = Gio.Menu.new()
+        
+        # Submenu Histórico
+        menu_historico = Gio.Menu.new()
+        menu_historico.append("Visualizar Histórico", "win.toggle-historico")
+        menu_historico.append("Limpar Histórico", "win.limpar-historico")
+        menu_historico.append_section("Exportar", self._criar_menu_exportar())
+        
+        menu.append_submenu("📜 Histórico", menu_historico)
+        menu.append("🧠 Cache de resultados", "win.cache")
+        if instrumentacao.ativa():
+            menu.append("🐞 Desempenho (depuração)", "win.desempenho")
+        menu.append("Sobre", "win.sobre")
+        
+        menu_button.set_menu_model(menu)
+        self._id_menu_aberto = menu_button.connect("notify::active", self._on_menu_aberto)
+        header.pack_end(menu_button)
+        
+        # Toggle histórico button (atalho rápido)
+        hist_btn = Gtk.Button(label="📜 Histórico")
+        hist_btn.add_css_class("header-btn")
+        hist_btn.connect("clicked", self.on_toggle_historico)
+        header.pack_start(hist_btn)
+        
+        # Ações
+        self._setup_acoes()
+
+    def _criar_menu_exportar(self):
+        """Cria submenu de exportação"""
+        menu_export = Gio.Menu.new()
+        menu_export.append("📄 Exportar como TXT", "win.exportar::txt")
+        menu_export.append("📊 Exportar como CSV", "win.exportar::csv")
+        menu_export.append("🧾 Exportar como JSON Lines", "win.exportar::jsonl")
+        menu_export.append("📑 Exportar como PDF", "win.exportar::pdf")
+        menu_export.append("🖼️  Exportar como PNG", "win.exportar::png")
+        
+        # Colunas binárias, para análise (Arrow e Parquet só com pyarrow,
+        # verificado na primeira abertura do menu)
+        self._menu_colunas = Gio.Menu.new()
+        self._menu_colunas.append("NumPy (NPZ)", "win.exportar::npz")
+        menu_export.append_submenu("🔢 Exportar colunas", self._menu_colunas)
+        
+        # Incremental: só acrescenta ao arquivo as operações novas
+        menu_incremental = Gio.Menu.new()
+        menu_incremental.append("TXT", "win.exportar-incremental::txt")
+        menu_incremental.append("CSV", "win.exportar-incremental::csv")
+        menu_incremental.append("JSON Lines", "win.exportar-incremental::jsonl")
+        menu_export.append_submenu("➕ Acrescentar novas operações", menu_incremental)
+        return menu_export
+
+    def _on_menu_aberto(self, menu_button, _param):
+        """Na primeira abertura do menu, oferece Arrow e Parquet se houver pyarrow"""
+        if not menu_button.get_active():
+            return
+        menu_button.disconnect(self._id_menu_aberto)
+        if importlib.util.find_spec('pyarrow') is not None:
+            self._menu_colunas.append("Arrow IPC", "win.exportar::arrow")
+            self._menu_colunas.append("Parquet", "win.exportar::parquet")
+
+    def _setup_acoes(self):
+        """Configura ações da janela"""
+        # Toggle histórico
+        acao_toggle = Gio.SimpleAction.new("toggle-historico", None)
+        acao_toggle.connect("activate", self.on_toggle_historico)
+        self.add_action(acao_toggle)
+        
+        # Limpar histórico
+        acao_limpar = Gio.SimpleAction.new("limpar-historico", None)
+        acao_limpar.connect("activate", self.on_limpar_historico_action)
+        self.add_action(acao_limpar)
+        
+        # Exportações: uma única ação, com o formato como parâmetro
+        acao_exportar = Gio.SimpleAction.new("exportar", GLib.VariantType.new("s"))
+        acao_exportar.connect("activate", lambda a, p: self.on_exportar(p.get_string()))
+        self.add_action(acao_exportar)
+        acao_incremental = Gio.SimpleAction.new("exportar-incremental", GLib.VariantType.new("s"))
+        acao_incremental.connect("activate", lambda a, p: self.on_exportar(p.get_string(), True))
+        self.add_action(acao_incremental)
+        
+        # Estatísticas do cache de resultados
+        acao_cache = Gio.SimpleAction.new("cache", None)
+        acao_cache.connect("activate", self.on_cache)
+        self.add_action(acao_cache)
+        
+        # Depuração: latências medidas (só com --instrumentar)
+        if instrumentacao.ativa():
+            acao_desempenho = Gio.SimpleAction.new("desempenho", None)
+            acao_desempenho.connect("activate", self.on_desempenho)
+            self.add_action(acao_desempenho)
+        
+        # Sobre
+        acao_sobre = Gio.SimpleAction.new("sobre", None)
+        acao_sobre.connect("activate", self.on_sobre)
+        self.add_action(acao_sobre)
+
+    def _setup_content(self):
+        """Configura o conteúdo principal"""
+        self.conteudo = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        self.set_child(self.conteudo)
+        
+        self.paned = Gtk.Paned(orientation=Gtk.Orientation.HORIZONTAL)
+        self.paned.set_vexpand(True)
+        self.conteudo.append(self.paned)
+        
+        # Calculadora
+        self.calc_box = self._criar_calculadora()
+        self.paned.set_start_child(self.calc_box)
+        self.paned.set_position(500)
+        
+        # O histórico (inicialmente visível) entra em _garantir_historico, e
+        # a barra de exportação em _garantir_barra_exportacao
+
+    def _garantir_barra_exportacao(self):
+        """Barra de progresso (com cancelar) exibida durante exportações"""
+        if self.exportacao_revealer is not None:
+            return
+        self._carregar_css(_CSS_EXPORTACAO)
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        box.add_css_class("exportacao-barra")
+        
+        self.exportacao_progresso = Gtk.ProgressBar()
+        self.exportacao_progresso.set_show_text(True)
+        self.exportacao_progresso.set_hexpand(True)
+        self.exportacao_progresso.set_valign(Gtk.Align.CENTER)
+        box.append(self.exportacao_progresso)
+        
+        self.exportacao_cancelar = Gtk.Button(label="Cancelar")
+        self.exportacao_cancelar.add_css_class("header-btn")
+        self.exportacao_cancelar.connect("clicked", self.on_cancelar_exportacao)
+        box.append(self.exportacao_cancelar)
+        
+        self.exportacao_revealer = Gtk.Revealer()
+        self.exportacao_revealer.set_child(box)
+        self.exportacao_revealer.set_reveal_child(False)
+        self.conteudo.append(self.exportacao_revealer)
+
+    def _criar_calculadora(self):
+        """Cria a calculadora"""
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        vbox.set_margin_top(20)
+        vbox.set_margin_bottom(20)
+        vbox.set_margin_start(20)
+        vbox.set_margin_end(20)
+        
+        self.display_scientific = Gtk.Label()
+        self.display_scientific.add_css_class("display-scientific")
+        self.display_scientific.set_xalign(1.0)
+        self.display_scientific.set_text("")
+        vbox.append(self.display_scientific)
+        
+        self.display = Gtk.Entry()
+        self.display.set_alignment(1.0)
+        self.display.set_editable(False)
+        self.display.add_css_class("display")
+        self.display.set_text("0")
+        vbox.append(self.display)
+        
+        # Entrada de expressões completas, ex.: 2*(3+4)^2 - log(100)
+        self.entrada_expressao = Gtk.Entry()
+        self.entrada_expressao.set_placeholder_text("Expressão, ex.: 2*(3+4)^2 - log(100)")
+        self.entrada_expressao.set_alignment(1.0)
+        self.entrada_expressao.add_css_class("entrada-expressao")
+        self.entrada_expressao.connect('activate', self.on_expressao)
+        vbox.append(self.entrada_expressao)
+        
+        grid = Gtk.Grid()
+        grid.set_row_homogeneous(True)
+        grid.set_column_homogeneous(True)
+        grid.set_row_spacing(6)
+        grid.set_column_spacing(6)
+        vbox.append(grid)
+        
+        self.motor = MotorCalculadora(ao_registrar=self.adicionar_ao_historico, cache=self.cache)
+        
+        # Teclado científico: funções do registro (funcoes.py) nas posições
+        # que declaram; o teclado numérico fica logo abaixo
+        botoes = [
+            (funcao.rotulo, *funcao.posicao, 1, 'btn-scientific',
+             lambda b, nome=funcao.nome: self.on_funcao(nome))
+            for funcao in funcoes.com_botao()
+        ]
+        botoes += [
+            ('x^y', 1, 0, 1, 'btn-scientific', lambda b: self.on_operator('^')),
+            ('π', 1, 3, 1, 'btn-scientific', self.on_pi),
+        ]
+        base = max(linha for _, linha, *_ in botoes) + 1
+        
+        botoes += [
+            ('C', base, 0, 1, 'btn-func', self.on_clear),
+            ('CE', base, 1, 1, 'btn-func', self.on_clear_entry),
+            ('⌫', base, 2, 1, 'btn-func', self.on_backspace),
+            ('÷', base, 3, 1, 'btn-op', lambda b: self.on_operator('÷')),
+            
+            ('7', base + 1, 0, 1, 'btn-num', lambda b: self.on_numero('7')),
+            ('8', base + 1, 1, 1, 'btn-num', lambda b: self.on_numero('8')),
+            ('9', base + 1, 2, 1, 'btn-num', lambda b: self.on_numero('9')),
+            ('×', base + 1, 3, 1, 'btn-op', lambda b: self.on_operator('×')),
+            
+            ('4', base + 2, 0, 1, 'btn-num', lambda b: self.on_numero('4')),
+            ('5', base + 2, 1, 1, 'btn-num', lambda b: self.on_numero('5')),
+            ('6', base + 2, 2, 1, 'btn-num', lambda b: self.on_numero('6')),
+            ('-', base + 2, 3, 1, 'btn-op', lambda b: self.on_operator('-')),
+            
+            ('1', base + 3, 0, 1, 'btn-num', lambda b: self.on_numero('1')),
+            ('2', base + 3, 1, 1, 'btn-num', lambda b: self.on_numero('2')),
+            ('3', base + 3, 2, 1, 'btn-num', lambda b: self.on_numero('3')),
+            ('+', base + 3, 3, 1, 'btn-op', lambda b: self.on_operator('+')),
+            
+            ('±', base + 4, 0, 1, 'btn-func', self.on_negate),
+            ('0', base + 4, 1, 1, 'btn-num', lambda b: self.on_numero('0')),
+            ('.', base + 4, 2, 1, 'btn-num', self.on_decimal),
+            ('=', base + 4, 3, 1, 'btn-op', self.on_igual),
+        ]
+        
+        for label, row, col, width, style, callback in botoes:
+            btn = Gtk.Button(label=label)
+            btn.add_css_class(style)
+            btn.set_hexpand(True)
+            btn.set_vexpand(True)
+            grid.attach(btn, col, row, width, 1)
+            btn.connect('clicked', callback)
+        
+        return vbox
+
+    def _criar_historico_panel(self):
+        """Cria o painel de histórico"""
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        vbox.add_css_class("historico-container")
+        vbox.set_size_request(300, -1)
+        
+        # Header
+        header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        header_box.set_margin_start(12)
+        header_box.set_margin_end(12)
+        header_box.set_margin_top(12)
+        header_box.set_margin_bottom(12)
+        
+        title = Gtk.Label()
+        title.set_text("📜 Histórico")
+        title.add_css_class("historico-header")
+        title.set_hexpand(True)
+        title.set_xalign(0.0)
+        
+        header_box.append(title)
+        vbox.append(header_box)
+        
+        # Busca (ver busca.py): o índice só é montado na primeira consulta
+        self.busca_entry = Gtk.SearchEntry()
+        self.busca_entry.set_placeholder_text("Buscar: log, > 1e6, entre 10:00 e 11:00")
+        self.busca_entry.set_margin_start(12)
+        self.busca_entry.set_margin_end(12)
+        self.busca_entry.connect("search-changed", self._on_busca_alterada)
+        vbox.append(self.busca_entry)
+        
+        self.busca_status = Gtk.Label()
+        self.busca_status.add_css_class("historico-time")
+        self.busca_status.set_xalign(0.0)
+        self.busca_status.set_margin_start(12)
+        self.busca_status.set_margin_top(4)
+        self.busca_status.set_visible(False)
+        vbox.append(self.busca_status)
+        
+        # Lista
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        
+        # Só as linhas visíveis são criadas; o ListView as recicla na rolagem
+        from .painel_historico import HistoricoModelo, ResultadosModelo
+        self.historico_modelo = HistoricoModelo(self.historico)
+        self.historico_modelo.connect("items-changed", self._on_historico_alterado)
+        self.resultados_modelo = ResultadosModelo(self.historico)
+        self._selecao_historico = Gtk.NoSelection(model=self.historico_modelo)
+        self._selecao_resultados = Gtk.NoSelection(model=self.resultados_modelo)
+        
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_historico_setup)
+        factory.connect("bind", self._on_historico_bind)
+        
+        self.historico_listview = Gtk.ListView(
+            model=self._selecao_historico,
+            factory=factory,
+        )
+        self.historico_listview.add_css_class("historico-lista")
+        scroll.set_child(self.historico_listview)
+        scroll.get_vadjustment().connect("value-changed", self._on_historico_rolagem)
+        
+        self.placeholder = Gtk.Label()
+        self.placeholder.set_text("Nenhuma operação realizada")
+        self.placeholder.add_css_class("historico-vazio")
+        self.placeholder.set_valign(Gtk.Align.START)
+        self.placeholder.set_can_target(False)
+        
+        overlay = Gtk.Overlay()
+        overlay.set_vexpand(True)
+        overlay.set_child(scroll)
+        overlay.add_overlay(self.placeholder)
+        vbox.append(overlay)
+        
+        return vbox
+
+    def _on_historico_setup(self, factory, list_item):
+        from .painel_historico import HistoricoRow
+        list_item.set_child(HistoricoRow(self))
+
+    def _on_historico_bind(self, factory, list_item):
+        list_item.get_child().vincular(list_item.get_item().item)
+
+    def _on_historico_alterado(self, model, position, removed, added):
+        # Durante a carga do histórico restante, a busca só é refeita no fim
+        if self._consulta and not self._id_carga_restante:
+            self._aplicar_busca()
+        else:
+            self._atualizar_placeholder()
+
+    def _atualizar_placeholder(self):
+        if self._consulta:
+            self.placeholder.set_text("Nenhum resultado")
+            self.placeholder.set_visible(self.resultados_modelo.get_n_items() == 0)
+        else:
+            self.placeholder.set_text("Nenhuma operação realizada")
+            self.placeholder.set_visible(self.historico_modelo.get_n_items() == 0)
+
+    def _on_busca_alterada(self, entry):
+        self._consulta = entry.get_text().strip()
+        if self._consulta:
+            self._carregar_historico_restante()
+        self._aplicar_busca()
+
+    def _aplicar_busca(self):
+        """Mostra no painel o resultado da consulta atual (ou o histórico inteiro)"""
+        if not self._consulta:
+            self.resultados_modelo.trocar([])
+            self.historico_listview.set_model(self._selecao_historico)
+            self.busca_status.set_visible(False)
+            self._atualizar_placeholder()
+            return
+        # O índice é montado aos poucos (ver _indexar_bloco); a busca só
+        # roda com ele pronto
+        if not self.historico.indexar(BLOCO_INDEXACAO):
+            self._indexar_em_segundo_plano()
+            return
+        from . import busca
+        
+        try:
+            total, chaves = busca.buscar(self.historico, self._consulta)
+        except ValueError as e:
+            total, chaves = 0, []
+            status = f"Consulta inválida: {e}"
+        else:
+            status = f"{total} resultado{'s' if total != 1 else ''}"
+            if total > len(chaves):
+                status += f" (os {len(chaves)} mais recentes)"
+        if self._id_carga_restante:
+            status += " · carregando histórico…"
+        self.resultados_modelo.trocar(chaves)
+        self.historico_listview.set_model(self._selecao_resultados)
+        self.busca_status.set_text(status)
+        self.busca_status.set_visible(True)
+        self._atualizar_placeholder()
+
+    def _indexar_em_segundo_plano(self):
+        self._mostrar_progresso_indexacao()
+        if not self._id_indexacao:
+            self._id_indexacao = GLib.idle_add(self._indexar_bloco)
+
+    def _indexar_bloco(self):
+        if not self.historico.indexar(BLOCO_INDEXACAO):
+            self._mostrar_progresso_indexacao()
+            return True
+        self._id_indexacao = 0
+        self._aplicar_busca()
+        return False
+
+    def _mostrar_progresso_indexacao(self):
+        self.busca_status.set_text(
+            f"Indexando o histórico… {self.historico.progresso_indexacao():.0%}"
+        )
+        self.busca_status.set_visible(True)
+
+    def _carregar_historico_restante(self):
+        """Carrega aos poucos, no laço principal, as páginas do banco ainda
+        não exibidas, para que a busca alcance o histórico inteiro"""
+        if self._historico_esgotado or self._id_carga_restante:
+            return
+        self._id_carga_restante = GLib.idle_add(self._carregar_bloco_restante)
+
+    def _carregar_bloco_restante(self):
+        from .persistencia import TAMANHO_BLOCO_LEITURA
+        self._carregar_pagina_historico(TAMANHO_BLOCO_LEITURA)
+        if not self._historico_esgotado:
+            return True
+        self._id_carga_restante = 0
+        if self._consulta:
+            self._aplicar_busca()
+        return False
+
+    def _on_historico_rolagem(self, adjustment):
+        """Carrega a próxima página antiga ao chegar perto do fim da lista"""
+        restante = adjustment.get_upper() - (adjustment.get_value() + adjustment.get_page_size())
+        if restante < adjustment.get_page_size():
+            self._carregar_pagina_historico()
+
+    def _carregar_pagina_historico(self, limite=None):
+        """Acrescenta ao fim do painel a próxima página de operações gravadas"""
+        if self._historico_esgotado:
+            return
+        if limite is None:
+            itens, menor_id = self.persistencia.carregar_pagina(antes_de=self._menor_id_carregado)
+        else:
+            itens, menor_id = self.persistencia.carregar_pagina(self._menor_id_carregado, limite)
+        if menor_id is None:
+            self._historico_esgotado = True
+            return
+        self._menor_id_carregado = menor_id
+        posicao = len(self.historico)
+        self.historico.acrescentar_antigos(itens)
+        self.historico_modelo.items_changed(posicao, 0, len(itens))
+
+    def _setup_aceleradores(self):
+        """Configura atalhos de teclado"""
+        key_controller = Gtk.EventControllerKey()
+        key_controller.connect('key-pressed', self.on_key_pressed)
+        self.add_controller(key_controller)
+
+    # ===== AÇÕES DO MENU =====
+    
+    def on_toggle_historico(self, action=None, param=None):
+        """Mostra/esconde o painel de histórico e redimensiona a janela"""
+        if self.historico_visivel:
+            self.paned.set_end_child(None)
+            self.historico_visivel = False
+            # Reduz a largura da janela
+            self.set_default_size(550, 700)
+            self.set_size_request(550, 700)
+        else:
+            self.historico_visivel = True
+            self._garantir_historico()
+            self.paned.set_end_child(self.historico_box)
+            # Aumenta a largura da janela para mostrar o histórico
+            self.set_default_size(900, 700)
+            self.set_size_request(900, 700)
+
+    def on_limpar_historico_action(self, action, param):
+        """Limpa o histórico via menu"""
+        self.limpar_historico()
+
+    def on_exportar(self, formato, incremental=False):
+        """Abre diálogo de exportação (``incremental``: ver exportacao.exportar_incremental)"""
+        self._garantir_historico()
+        if incremental and self.persistencia is None:
+            self._mostrar_erro(
+                "Histórico em disco indisponível",
+                "A exportação incremental só funciona com o histórico salvo em disco.",
+            )
+            return
+        if not self.historico and not incremental:
+            self._mostrar_erro("Histórico vazio", "Não há operações para exportar.")
+            return
+        if self._cancelar_exportacao is not None:
+            self._mostrar_erro("Exportação em andamento", "Aguarde o fim da exportação atual ou cancele-a.")
+            return
+        
+        dialog = Gtk.FileDialog()
+        dialog.set_title(f"Exportar como {formato.upper()}")
+        
+        # Filtros
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        
+        if formato == "txt":
+            filter_txt = Gtk.FileFilter()
+            filter_txt.set_name("Arquivo de texto")
+            filter_txt.add_pattern("*.txt")
+            filters.append(filter_txt)
+            dialog.set_default_filter(filter_txt)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            
+        elif formato == "csv":
+            filter_csv = Gtk.FileFilter()
+            filter_csv.set_name("CSV")
+            filter_csv.add_pattern("*.csv")
+            filters.append(filter_csv)
+            dialog.set_default_filter(filter_csv)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            
+        elif formato == "jsonl":
+            filter_jsonl = Gtk.FileFilter()
+            filter_jsonl.set_name("JSON Lines")
+            filter_jsonl.add_pattern("*.jsonl")
+            filters.append(filter_jsonl)
+            dialog.set_default_filter(filter_jsonl)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+            
+        elif formato == "pdf":
+            filter_pdf = Gtk.FileFilter()
+            filter_pdf.set_name("PDF")
+            filter_pdf.add_pattern("*.pdf")
+            filters.append(filter_pdf)
+            dialog.set_default_filter(filter_pdf)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            
+        elif formato == "png":
+            filter_png = Gtk.FileFilter()
+            filter_png.set_name("PNG")
+            filter_png.add_pattern("*.png")
+            filters.append(filter_png)
+            dialog.set_default_filter(filter_png)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            
+        elif formato in _FORMATOS_COLUNAS:
+            nome_filtro, extensao = _FORMATOS_COLUNAS[formato]
+            filter_colunas = Gtk.FileFilter()
+            filter_colunas.set_name(nome_filtro)
+            filter_colunas.add_pattern(f"*.{extensao}")
+            filters.append(filter_colunas)
+            dialog.set_default_filter(filter_colunas)
+            nome_padrao = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extensao}"
+        
+        if incremental:
+            # Nome fixo: a mesma exportação, repetida, só cresce
+            nome_padrao = f"historico.{formato}"
+        
+        dialog.set_filters(filters)
+        dialog.set_initial_name(nome_padrao)
+        
+        dialog.save(self, None, self._on_exportar_resposta, (formato, incremental))
+
+    def _registros_para_exportar(self):
+        """Todo o histórico, do mais recente ao mais antigo: ``(total, gerador)``.
+
+        Com o histórico em disco, lê direto do banco (inclusive as páginas
+        ainda não carregadas no painel); senão, usa o que está na memória.
+        Roda na thread de exportação.
+        """
+        if self.persistencia is not None:
+            self.persistencia.sincronizar()
+            return self.persistencia.contar(), self.persistencia.iterar()
+        return len(self.historico), iter(self.historico)
+
+    def _colunas_para_exportar(self):
+        """Fonte das colunas (ver exportacao._colunas): o banco, se houver,
+        senão o histórico em memória. Roda na thread de exportação."""
+        if self.persistencia is not None:
+            self.persistencia.sincronizar()
+            return self.persistencia
+        return self.historico
+
+    def _on_exportar_resposta(self, dialog, result, opcoes):
+        """Callback do diálogo de exportação: inicia a exportação em segundo plano"""
+        try:
+            file = dialog.save_finish(result)
+        except GLib.Error:
+            return  # Diálogo cancelado
+        if file:
+            formato, incremental = opcoes
+            self._iniciar_exportacao(formato, file.get_path(), incremental)
+
+    # ===== EXPORTAÇÃO EM SEGUNDO PLANO =====
+
+    def _iniciar_exportacao(self, formato, filepath, incremental=False):
+        cancelar = threading.Event()
+        self._cancelar_exportacao = cancelar
+        self._garantir_barra_exportacao()
+        self.exportacao_progresso.set_fraction(0.0)
+        self.exportacao_progresso.set_text(f"Exportando {formato.upper()}…")
+        self.exportacao_cancelar.set_sensitive(True)
+        self.exportacao_revealer.set_reveal_child(True)
+        
+        thread = threading.Thread(
+            target=self._exportar_em_segundo_plano,
+            args=(formato, filepath, cancelar, incremental),
+            name="exportacao",
+            daemon=True,
+        )
+        thread.start()
+
+    def _exportar_em_segundo_plano(self, formato, filepath, cancelar, incremental=False):
+        """Executa o exportador fora da thread da interface"""
+        from .exportacao import ExportacaoCancelada, ExportadorHistorico, acompanhar
+        
+        if incremental:
+            self._exportar_incremental(formato, filepath, cancelar)
+            return
+        
+        destino = filepath
+        try:
+            if formato in _FORMATOS_COLUNAS:
+                # Em bloco, a partir das colunas: sem progresso por registro
+                exportar = getattr(ExportadorHistorico, f"exportar_{formato}")
+                if instrumentacao.ativa():
+                    exportar = instrumentacao.medir(f"exportacao.exportar_{formato}", exportar)
+                exportar(self._colunas_para_exportar(), filepath)
+                if cancelar.is_set():
+                    raise ExportacaoCancelada()
+                GLib.idle_add(self._on_exportacao_fim, destino, None, False)
+                return
+            
+            total, registros = self._registros_para_exportar()
+            registros = acompanhar(
+                registros,
+                lambda n: GLib.idle_add(self._on_exportacao_progresso, n, total),
+                cancelar,
+            )
+            
+            exportador = ExportadorHistorico()
+            instrumentacao.instrumentar(exportador, (
+                'exportar_txt', 'exportar_csv', 'exportar_jsonl', 'exportar_pdf', 'exportar_png',
+            ), 'exportacao.')
+            
+            if formato == "txt":
+                exportador.exportar_txt(registros, filepath)
+            elif formato == "csv":
+                exportador.exportar_csv(registros, filepath)
+            elif formato == "jsonl":
+                exportador.exportar_jsonl(registros, filepath)
+            elif formato == "pdf":
+                exportador.exportar_pdf(registros, filepath)
+            elif formato == "png":
+                arquivos = exportador.exportar_png(registros, filepath)
+                if len(arquivos) > 1:
+                    destino = f"{arquivos[0]}\n… {arquivos[-1]}\n({len(arquivos)} imagens)"
+            
+        except ExportacaoCancelada:
+            self._remover_parcial(filepath)
+            GLib.idle_add(self._on_exportacao_fim, filepath, None, True)
+        except Exception as e:
+            self._remover_parcial(filepath)
+            GLib.idle_add(self._on_exportacao_fim, filepath, str(e), False)
+        else:
+            GLib.idle_add(self._on_exportacao_fim, destino, None, False)
+
+    def _exportar_incremental(self, formato, filepath, cancelar):
+        """Acrescenta as operações novas a ``filepath`` (na thread de exportação).
+
+        Em caso de erro ou cancelamento o próprio exportar_incremental
+        devolve o arquivo ao estado anterior, então nada é removido aqui.
+        """
+        from .exportacao import ExportacaoCancelada, exportar_incremental
+        
+        exportar = exportar_incremental
+        if instrumentacao.ativa():
+            exportar = instrumentacao.medir('exportacao.exportar_incremental', exportar)
+        try:
+            novas = exportar(
+                self.persistencia, formato, filepath,
+                lambda n, total: GLib.idle_add(self._on_exportacao_progresso, n, total),
+                cancelar,
+            )
+        except ExportacaoCancelada:
+            GLib.idle_add(self._on_exportacao_fim, filepath, None, True)
+        except Exception as e:
+            GLib.idle_add(self._on_exportacao_fim, filepath, str(e), False)
+        else:
+            GLib.idle_add(
+                self._on_exportacao_fim, f"{filepath}\n({novas} operações novas)", None, False
+            )
+
+    @staticmethod
+    def _remover_parcial(filepath):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+
+    def _on_exportacao_progresso(self, exportados, total):
+        if self._cancelar_exportacao is None:
+            return False
+        if total:
+            self.exportacao_progresso.set_fraction(min(exportados / total, 1.0))
+        self.exportacao_progresso.set_text(f"{exportados} de {total} operações")
+        return False
+
+    def on_cancelar_exportacao(self, btn):
+        if self._cancelar_exportacao is not None:
+            self._cancelar_exportacao.set()
+            self.exportacao_cancelar.set_sensitive(False)
+            self.exportacao_progresso.set_text("Cancelando…")
+
+    def _on_exportacao_fim(self, filepath, erro, cancelada):
+        self._cancelar_exportacao = None
+        self.exportacao_revealer.set_reveal_child(False)
+        if erro is not None:
+            self._mostrar_erro("Erro na exportação", erro)
+        elif not cancelada:
+            self._mostrar_sucesso("Exportado com sucesso!", f"Arquivo salvo em:\n{filepath}")
+        return False
+
+    def on_sobre(self, action, param):
+        """Diálogo sobre"""
+        dialog = Gtk.AlertDialog()
+        dialog.set_message("🧮 Calculadora Científica GTK4")
+        dialog.set_detail(
+            "Uma calculadora científica moderna desenvolvida com Python e GTK4.\n\n"
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            "📋 Projeto: Calculadora Científica\n"
+            "👤 Autor: Edius Ferreira\n"
+            "📧 Email: edisuferreira@gmail.com\n"
+            "🔗 GitHub: https://github.com/edius1987\n"
+            "📦 Repositório: https://github.com/edius1987/calc.git\n"
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+            "⌨️ Atalhos de Teclado:\n"
+            "• Ctrl+H: Mostrar/Esconder histórico\n"
+            "• Ctrl+V: Colar número ou expressões (uma por linha)\n"
+            "• Esc: Limpar tudo\n"
+            "• Enter: Calcular resultado\n"
+            "• Backspace: Apagar último dígito\n\n"
+            "🛠️ Tecnologias: Python, GTK4, UV"
+        )
+        dialog.set_buttons(["OK"])
+        dialog.set_modal(True)
+        dialog.show(self)
+
+    def on_cache(self, action, param):
+        """Diálogo com a taxa de acertos e a ocupação do cache de resultados"""
+        est = self.cache.estatisticas()
+        linhas = [
+            f"Consultas: {est['consultas']}",
+            f"Taxa de acertos: {est['taxa_acertos']:.1%}",
+            f"Acertos na memória: {est['acertos_memoria']}",
+            f"Acertos no disco: {est['acertos_disco']}",
+            f"Tempo economizado: {est['segundos_economizados']:.3f} s",
+            "",
+            f"Memória: {est['itens_memoria']} resultados, {est['bytes_memoria'] / 2**20:.1f} MB",
+        ]
+        if est['bytes_disco'] is not None:
+            linhas.append(
+                f"Disco: {est['itens_disco']} resultados, {est['bytes_disco'] / 2**20:.1f} MB"
+            )
+        elif self.cache.arquivo is None and self.cache.erro_disco is None:
+            linhas.append("Disco: desativado")
+        if self.cache.erro_disco is not None:
+            linhas.append(f"Disco: erro ({self.cache.erro_disco})")
+        
+        dialog = Gtk.AlertDialog()
+        dialog.set_message("🧠 Cache de resultados")
+        dialog.set_detail("\n".join(linhas))
+        dialog.set_buttons(["Fechar", "Limpar cache"])
+        dialog.set_cancel_button(0)
+        dialog.set_default_button(0)
+        dialog.set_modal(True)
+        dialog.choose(self, None, self._on_cache_resposta)
+
+    def _on_cache_resposta(self, dialog, result):
+        try:
+            botao = dialog.choose_finish(result)
+        except GLib.Error:
+            return
+        if botao == 1:
+            self.cache.limpar()
+
+    def on_desempenho(self, action, param):
+        """Diálogo de depuração com as latências medidas por operação"""
+        linhas = [f"{'operação':<34}{'n':>7}{'p50':>9}{'p99':>9}{'máx':>9}  (µs)"]
+        for nome, resumo in instrumentacao.resumo().items():
+            if resumo['contagem']:
+                linhas.append(
+                    f"{nome:<34}{resumo['contagem']:>7}{resumo['p50_us']:>9.1f}"
+                    f"{resumo['p99_us']:>9.1f}{resumo['max_us']:>9.1f}"
+                )
+        if len(linhas) == 1:
+            linhas.append("Nenhuma medição ainda.")
+        
+        dialog = Gtk.AlertDialog()
+        dialog.set_message("🐞 Desempenho por operação")
+        dialog.set_detail("\n".join(linhas))
+        dialog.set_buttons(["Fechar", "Salvar JSON…"])
+        dialog.set_cancel_button(0)
+        dialog.set_default_button(0)
+        dialog.set_modal(True)
+        dialog.choose(self, None, self._on_desempenho_resposta)
+
+    def _on_desempenho_resposta(self, dialog, result):
+        try:
+            botao = dialog.choose_finish(result)
+        except GLib.Error:
+            return
+        if botao != 1:
+            return
+        salvar = Gtk.FileDialog()
+        salvar.set_title("Salvar medições")
+        salvar.set_initial_name(f"desempenho_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        salvar.save(self, None, self._on_desempenho_salvar)
+
+    def _on_desempenho_salvar(self, dialog, result):
+        try:
+            file = dialog.save_finish(result)
+        except GLib.Error:
+            return  # Diálogo cancelado
+        if file:
+            try:
+                instrumentacao.salvar_json(file.get_path())
+            except OSError as e:
+                self._mostrar_erro("Erro ao salvar medições", str(e))
+
+    def _mostrar_erro(self, titulo, mensagem):
+        """Mostra diálogo de erro"""
+        dialog = Gtk.AlertDialog()
+        dialog.set_message(f"❌ {titulo}")
+        dialog.set_detail(mensagem)
+        dialog.set_buttons(["OK"])
+        dialog.set_modal(True)
+        dialog.show(self)
+
+    def _mostrar_sucesso(self, titulo, mensagem):
+        """Mostra diálogo de sucesso"""
+        dialog = Gtk.AlertDialog()
+        dialog.set_message(f"✅ {titulo}")
+        dialog.set_detail(mensagem)
+        dialog.set_buttons(["OK"])
+        dialog.set_modal(True)
+        dialog.show(self)
+
+    # ===== MÉTODOS DO HISTÓRICO =====
+
+    def adicionar_ao_historico(self, expressao, resultado):
+        """Adiciona operação ao histórico"""
+        self._garantir_historico()
+        item = self.historico.adicionar(expressao, resultado)
+        self.historico_modelo.items_changed(0, 0, 1)
+        if self.persistencia is not None:
+            self.persistencia.gravar(item)
+
+    def adicionar_lote_ao_historico(self, registros):
+        """Adiciona várias operações ``(expressao, resultado)`` com uma única
+        atualização do modelo e uma única ida à fila de gravação"""
+        if not registros:
+            return
+        self._garantir_historico()
+        itens = [self.historico.adicionar(expressao, resultado) for expressao, resultado in registros]
+        self.historico_modelo.items_changed(0, 0, len(itens))
+        if self.persistencia is not None:
+            self.persistencia.gravar_lote(itens)
+
+    def limpar_historico(self):
+        """Limpa o histórico"""
+        if self.gravador is not None:
+            self.gravador.registrar_limpeza_historico()
+        self._garantir_historico()
+        removidos = len(self.historico)
+        self.historico.limpar()
+        self.historico_modelo.items_changed(0, removidos, 0)
+        if self.persistencia is not None:
+            self.persistencia.limpar()
+            self._historico_esgotado = True
+
+    def avaliar_remoto(self, texto):
+        """Avalia uma expressão vinda da linha de comando, sem mexer no display.
+
+        O resultado entra no histórico; devolve None se a expressão for inválida.
+        """
+        return self._executar('avaliar_remoto', texto, 'remoto', atualizar=False)
+
+    def carregar_valor(self, valor):
+        """Carrega valor do histórico"""
+        self._executar('carregar', valor, 'historico')
+
+    # ===== OPERAÇÕES DA CALCULADORA =====
+
+    def _executar(self, acao, argumento=None, origem='botao', atualizar=True):
+        """Executa uma ação do motor (ver motor.ACOES), gravando-a se a
+        gravação de sessão estiver ativa"""
+        if self.gravador is not None:
+            self.gravador.registrar(acao, argumento, origem)
+        resultado = self.motor.executar(acao, argumento)
+        if atualizar:
+            self.atualizar_display()
+        return resultado
+
+    def atualizar_display(self):
+        """Agenda a atualização do display para o próximo quadro.
+
+        O motor já guarda o estado exato; várias teclas num mesmo quadro
+        (auto-repetição, colagem, entrada por script) resultam numa única
+        troca de texto, feita pelo relógio de quadros.
+        """
+        if not self._id_tick_display:
+            self._id_tick_display = self.add_tick_callback(self._on_tick_display)
+
+    def _on_tick_display(self, widget, relogio):
+        self._id_tick_display = 0
+        valor = self.motor.valor_atual
+        if valor != self._texto_display:
+            self._texto_display = valor
+            self.display.set_text(valor)
+        operacao = self.motor.texto_operacao()
+        if operacao != self._texto_operacao:
+            self._texto_operacao = operacao
+            self.display_scientific.set_text(operacao)
+        return GLib.SOURCE_REMOVE
+
+    def on_numero(self, num):
+        self._executar('digitar', num)
+
+    def on_decimal(self, btn):
+        self._executar('decimal')
+
+    def on_clear(self, btn):
+        self._executar('limpar')
+
+    def on_clear_entry(self, btn):
+        self._executar('limpar_entrada')
+
+    def on_backspace(self, btn):
+        self._executar('apagar')
+
+    def on_negate(self, btn):
+        self._executar('negar')
+
+    def on_pi(self, btn):
+        self._executar('inserir_pi')
+
+    def on_funcao(self, nome):
+        self._executar('aplicar_funcao', nome)
+
+    def on_operator(self, op):
+        self._executar('operador', op)
+
+    def on_igual(self, btn):
+        self._executar('igual')
+
+    def on_expressao(self, entry):
+        """Avalia a expressão digitada ao pressionar Enter"""
+        texto = entry.get_text()
+        if not texto.strip():
+            return
+        entry.set_text("")
+        self._executar('avaliar_expressao', texto, 'expressao')
+
+    def on_colar(self):
+        """Lê a área de transferência (assíncrono) e trata o texto colado"""
+        self.get_clipboard().read_text_async(None, self._on_colar_texto)
+
+    def _on_colar_texto(self, clipboard, result):
+        try:
+            texto = clipboard.read_text_finish(result)
+        except GLib.Error:
+            return
+        linhas = [linha for linha in (texto or "").splitlines() if linha.strip()]
+        if not linhas:
+            return
+        
+        if len(linhas) == 1:
+            self._executar('colar', linhas[0], 'colar')
+            return
+        registros, erros = self._executar('avaliar_lote', linhas, 'colar')
+        self.adicionar_lote_ao_historico(registros)
+        if erros:
+            self._mostrar_erro(
+                "Linhas inválidas",
+                f"{erros} de {len(linhas)} linhas coladas não puderam ser avaliadas.",
+            )
+
+    def on_key_pressed(self, controller, keyval, keycode, state):
+        key = Gdk.keyval_name(keyval)
+        
+        # Ctrl+H para toggle histórico
+        if key == 'h' and state & Gdk.ModifierType.CONTROL_MASK:
+            self.on_toggle_historico()
+            return True
+        
+        # Ctrl+F para buscar no histórico
+        if key == 'f' and state & Gdk.ModifierType.CONTROL_MASK:
+            if not self.historico_visivel:
+                self.on_toggle_historico()
+            self._garantir_historico()
+            self.busca_entry.grab_focus()
+            return True
+        
+        # Ctrl+V para colar números ou expressões
+        if key == 'v' and state & Gdk.ModifierType.CONTROL_MASK:
+            self.on_colar()
+            return True
+        
+        acao = TECLAS.get(key)
+        if acao is None:
+            return False
+        self._executar(*acao, 'tecla')
+        return True
+
+class CalculadoraApp(Gtk.Application):
+    """Aplicação de instância única.
+
+    Com HANDLES_COMMAND_LINE, ``calc "2^10"`` executado com a calculadora
+    já aberta não inicia outro GTK: os argumentos vão por D-Bus para a
+    instância principal, que avalia as expressões, acrescenta-as ao
+    histórico e devolve os resultados para o terminal de quem chamou.
+    """
+    def __init__(self, tempos=None, gravar=None, cache_disco=True):
+        super().__init__(
+            application_id='com.exemplo.calculadora.historico',
+            flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE,
+        )
+        self.tempos = tempos
+        self.gravar = gravar
+        self.cache_disco = cache_disco
+    
+    def do_activate(self):
+        win = self.get_active_window()
+        if win is None:
+            if self.tempos is not None:
+                self.tempos.append(("inicialização do GTK", time.perf_counter()))
+            win = CalculadoraWindow(
+                application=self, tempos=self.tempos, gravar=self.gravar,
+                cache_disco=self.cache_disco,
+            )
+        win.present()
+    
+    def do_command_line(self, linha_comando):
+        """Roda na instância principal, para esta ou para outra invocação de ``calc``"""
+        expressoes = linha_comando.get_arguments()[1:]
+        if expressoes[:1] == ['--']:
+            expressoes = expressoes[1:]
+        
+        win = self.get_active_window()
+        if win is None or not expressoes:
+            self.activate()
+            win = self.get_active_window()
+        
+        status = 0
+        for texto in expressoes:
+            resultado = win.avaliar_remoto(texto)
+            if resultado is None:
+                status = 1
+                linha_comando.print_literal("Erro\n")
+            else:
+                linha_comando.print_literal(formatar_resultado(resultado) + "\n")
+        return status
+
+def main(tempos=None, expressoes=(), gravar=None, cache_disco=True):
+    """Abre a interface gráfica (ou repassa ``expressoes`` à instância aberta).
+
+    ``tempos`` (lista de ``(etapa, instante)``, ver imprimir_tempos) ativa o
+    relatório de --startup-timings, impresso no primeiro quadro. ``gravar``
+    é o arquivo onde gravar a sessão (ver gravacao.py). Sem ``cache_disco``,
+    o cache de resultados (ver cache.py) fica só na memória.
+    """
+    if tempos is not None:
+        tempos.append(("importação do GTK e da interface", time.perf_counter()))
+    app = CalculadoraApp(tempos, gravar, cache_disco)
+    # '--' impede que expressões como "-2+3" sejam lidas como opções
+    return app.run([sys.argv[0], '--', *expressoes] if expressoes else [sys.argv[0]])
+
+if __name__ == '__main__':
+    sys.exit(main(expressoes=sys.argv[1:]))
\ No newline at end of file
@@ -0,0 +1,391 @@
+"""Motor de cálculo da calculadora, independente de GTK.
+
+Concentra a máquina de estados do teclado (valor atual, valor anterior,
+operação pendente) e as operações aritméticas e científicas, para que a
+mesma lógica possa ser usada pela janela, por testes e por scripts.
+"""
+import math
+import re
+
+from . import formatacao, funcoes, inteiros
+
+# ===== OPERAÇÕES =====
+#
+# Operandos inteiros são mantidos como int do Python (precisão exata e
+# exponenciação rápida por quadrados); os demais viram float. As funções
+# científicas ficam no registro de funcoes.py. Um float que estoura (inf)
+# é erro, como na avaliação em lote (ver vetorizado.py).
+
+def _finito(resultado):
+    if type(resultado) is float and not math.isfinite(resultado):
+        raise OverflowError("Resultado fora do intervalo")
+    return resultado
+
+def _multiplicacao(a, b):
+    if type(a) is int and type(b) is int:
+        inteiros.verificar_produto(a, b)
+    return _finito(a * b)
+
+def _divisao(a, b):
+    if type(a) is int and type(b) is int and b and a % b == 0:
+        return a // b
+    return _finito(a / b)
+
+def _potencia(a, b):
+    if type(a) is int and type(b) is int:
+        inteiros.verificar_potencia(a, b)
+    resultado = a ** b
+    if isinstance(resultado, complex):
+        raise ValueError("Resultado complexo")
+    return _finito(resultado)
+
+OPERACOES = {
+    '+': lambda a, b: _finito(a + b),
+    '-': lambda a, b: _finito(a - b),
+    '×': _multiplicacao,
+    '÷': _divisao,
+    '^': _potencia,
+}
+
+# Símbolo exibido no display científico para cada operação
+SIMBOLOS_DISPLAY = {'^': '^', '÷': '/', '×': '*'}
+
+# Exceções que representam um cálculo inválido ("Erro" no display)
+ERROS_CALCULO = funcoes.ERROS_CALCULO
+
+# Ações do motor acionáveis por nome (teclas, botões, gravações de sessão;
+# ver MotorCalculadora.executar): nome -> recebe argumento?
+ACOES = {
+    'digitar': True,
+    'decimal': False,
+    'limpar': False,
+    'limpar_entrada': False,
+    'apagar': False,
+    'negar': False,
+    'inserir_pi': False,
+    'carregar': True,
+    'aplicar_funcao': True,
+    'operador': True,
+    'avaliar_expressao': True,
+    'avaliar_remoto': True,
+    'colar': True,
+    'avaliar_lote': True,
+    'igual': False,
+}
+
+# Tecla (nome do keyval do GDK) -> (ação, argumento)
+TECLAS = {
+    **{digito: ('digitar', digito) for digito in '0123456789'},
+    'period': ('decimal', None),
+    'comma': ('decimal', None),
+    'plus': ('operador', '+'),
+    'KP_Add': ('operador', '+'),
+    'minus': ('operador', '-'),
+    'KP_Subtract': ('operador', '-'),
+    'asterisk': ('operador', '×'),
+    'KP_Multiply': ('operador', '×'),
+    'slash': ('operador', '÷'),
+    'KP_Divide': ('operador', '÷'),
+    'asciicircum': ('operador', '^'),
+    'Return': ('igual', None),
+    'KP_Enter': ('igual', None),
+    'equal': ('igual', None),
+    'Escape': ('limpar', None),
+    'BackSpace': ('apagar', None),
+}
+
+# Número literal colado (já normalizado por expressao.normalizar)
+_NUMERO = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?")
+
+
+def calcular(operacao, a, b):
+    """Aplica uma operação binária; levanta ValueError/ArithmeticError se inválida"""
+    try:
+        funcao = OPERACOES[operacao]
+    except KeyError:
+        raise ValueError(f"Operação desconhecida: {operacao}") from None
+    return funcao(a, b)
+
+
+def aplicar(nome, valor):
+    """Aplica uma função científica; levanta ValueError/ArithmeticError se inválida"""
+    return funcoes.obter(nome).aplicar(valor)
+
+
+def para_numero(texto):
+    """Converte o texto do display: int se for um inteiro literal, senão float"""
+    if inteiros.eh_texto_inteiro(texto):
+        return inteiros.de_texto(texto)
+    return float(texto)
+
+# ===== FORMATAÇÃO =====
+
+def formatar_num(num):
+    """Formata um operando para a expressão do histórico (ver formatacao.EXATO)"""
+    if isinstance(num, str):
+        try:
+            num = para_numero(num)
+        except ValueError:
+            return num
+    return formatacao.formatar_exato(num)
+
+
+# Formata um resultado para o display (ver formatacao.DISPLAY)
+formatar_resultado = formatacao.formatar
+
+# ===== MÁQUINA DE ESTADOS =====
+
+class MotorCalculadora:
+    """Estado e operações da calculadora, sem nenhuma dependência de interface.
+
+    ``ao_registrar(expressao, resultado)`` é chamado a cada operação concluída,
+    com o resultado numérico exato, para que quem usa o motor (a janela, por
+    exemplo) alimente o histórico. Com ``cache`` (cache.CacheResultados),
+    operações, funções e expressões já calculadas não são recalculadas,
+    mas continuam sendo registradas.
+    """
+
+    def __init__(self, ao_registrar=None, cache=None):
+        self.ao_registrar = ao_registrar
+        self.cache = cache
+        self.valor_atual = "0"
+        self.valor_anterior = None
+        self.operacao = None
+        self.novo_numero = True
+        # Valor exato do último resultado; o display pode mostrar só um resumo
+        self._valor_exato = None
+
+    def executar(self, acao, argumento=None):
+        """Executa uma ação pelo nome (ver ACOES) e devolve o que ela devolver"""
+        metodo = getattr(self, acao)
+        if ACOES[acao]:
+            return metodo(argumento)
+        return metodo()
+
+    def _calcular(self, operacao, a, b):
+        if self.cache is None:
+            return calcular(operacao, a, b)
+        return self.cache.calcular((operacao, a, b), calcular, operacao, a, b)
+
+    def _aplicar(self, funcao, valor):
+        if self.cache is None:
+            return funcao.aplicar(valor)
+        return self.cache.calcular((funcao.nome, valor), funcao.aplicar, valor)
+
+    def _avaliar(self, texto):
+        from . import expressao
+
+        if self.cache is None:
+            return expressao.avaliar(texto)
+        return self.cache.calcular(('expressao', expressao.normalizar(texto)), expressao.avaliar, texto)
+
+    def _registrar(self, expressao, resultado):
+        if self.ao_registrar is not None:
+            self.ao_registrar(expressao, resultado)
+
+    def _erro(self):
+        self.valor_atual = "Erro"
+        self._valor_exato = None
+        self.novo_numero = True
+
+    def _mostrar(self, resultado):
+        """Exibe um resultado, guardando o valor exato por trás do texto"""
+        self.valor_atual = formatar_resultado(resultado)
+        self._valor_exato = resultado
+        self.novo_numero = True
+
+    def valor(self):
+        """Valor numérico do display (exato, mesmo quando o display mostra um resumo)"""
+        if self._valor_exato is not None:
+            return self._valor_exato
+        return para_numero(self.valor_atual)
+
+    def texto_operacao(self):
+        """Texto da operação pendente, exibido acima do display"""
+        if self.valor_anterior is not None and self.operacao:
+            op_str = SIMBOLOS_DISPLAY.get(self.operacao, self.operacao)
+            return f"{formatar_num(self.valor_anterior)} {op_str}"
+        return ""
+
+    # ===== ENTRADA =====
+
+    def digitar(self, num):
+        self._valor_exato = None
+        if self.novo_numero:
+            self.valor_atual = num
+            self.novo_numero = False
+        elif self.valor_atual == "0":
+            self.valor_atual = num
+        else:
+            self.valor_atual += num
+
+    def decimal(self):
+        self._valor_exato = None
+        if self.novo_numero:
+            self.valor_atual = "0."
+            self.novo_numero = False
+        elif "." not in self.valor_atual:
+            self.valor_atual += "."
+
+    def limpar(self):
+        self.valor_atual = "0"
+        self._valor_exato = None
+        self.valor_anterior = None
+        self.operacao = None
+        self.novo_numero = True
+
+    def limpar_entrada(self):
+        self.valor_atual = "0"
+        self._valor_exato = None
+        self.novo_numero = True
+
+    def apagar(self):
+        n = self._valor_exato
+        if type(n) is int and inteiros.contar_digitos(n) > inteiros.LIMITE_DIGITOS_TEXTO:
+            # Display resumido: remove o último dígito do valor exato
+            self._mostrar(-(-n // 10) if n < 0 else n // 10)
+            return
+        self._valor_exato = None
+        if len(self.valor_atual) > 1:
+            self.valor_atual = self.valor_atual[:-1]
+        else:
+            self.valor_atual = "0"
+            self.novo_numero = True
+
+    def negar(self):
+        if self._valor_exato is not None:
+            self._mostrar(-self._valor_exato)
+            return
+        if self.valor_atual != "0":
+            if self.valor_atual.startswith("-"):
+                self.valor_atual = self.valor_atual[1:]
+            else:
+                self.valor_atual = "-" + self.valor_atual
+
+    def inserir_pi(self):
+        self._mostrar(math.pi)
+
+    def carregar(self, valor):
+        """Carrega um valor (por exemplo, vindo do histórico) no display"""
+        if isinstance(valor, (int, float)):
+            self._mostrar(valor)
+            return
+        self.valor_atual = str(valor)
+        self._valor_exato = None
+        self.novo_numero = True
+
+    # ===== OPERAÇÕES =====
+
+    def aplicar_funcao(self, nome):
+        """Aplica uma função científica (ver funcoes.py) ao valor atual"""
+        try:
+            funcao = funcoes.obter(nome)
+            val = self.valor()
+            resultado = self._aplicar(funcao, val)
+        except ERROS_CALCULO:
+            self._erro()
+            return
+        self._mostrar(resultado)
+        self._registrar(funcao.historico.format(formatar_num(val)), resultado)
+
+    def operador(self, op):
+        try:
+            if self.operacao is not None and not self.novo_numero:
+                self.valor_anterior = self._calcular_intermediario()
+            else:
+                self.valor_anterior = self.valor()
+        except ERROS_CALCULO:
+            self.limpar()
+            self._erro()
+            return
+        self.operacao = op
+        self.novo_numero = True
+
+    def _calcular_intermediario(self):
+        """Resolve a operação pendente ao encadear operadores (ex.: 2 + 3 +)"""
+        resultado = self._calcular(self.operacao, self.valor_anterior, self.valor())
+        self._mostrar(resultado)
+        return resultado
+
+    def avaliar_expressao(self, texto):
+        """Avalia uma expressão completa digitada ou colada (ver expressao.py)"""
+        texto = texto.strip()
+        try:
+            resultado = self._avaliar(texto)
+        except ERROS_CALCULO:
+            self._erro()
+            return
+        self._mostrar(resultado)
+        self._registrar(texto, resultado)
+        self.valor_anterior = None
+        self.operacao = None
+
+    def avaliar_remoto(self, texto):
+        """Avalia uma expressão vinda de fora (ex.: linha de comando) sem
+        mexer no display; registra e devolve o resultado (None se inválida)"""
+        texto = texto.strip()
+        try:
+            resultado = self._avaliar(texto)
+        except ERROS_CALCULO:
+            return None
+        self._registrar(texto, resultado)
+        return resultado
+
+    def colar(self, texto):
+        """Uma linha colada: um número vai direto para o display (em uma
+        única conversão, mesmo com centenas de dígitos); qualquer outra
+        coisa é avaliada como expressão"""
+        from . import expressao
+
+        normalizado = expressao.normalizar(texto)
+        if _NUMERO.fullmatch(normalizado):
+            numero = para_numero(normalizado)
+            if type(numero) is int or math.isfinite(numero):
+                self.carregar(numero)
+                return
+        self.avaliar_expressao(texto)
+
+    def avaliar_lote(self, linhas):
+        """Avalia várias expressões (ex.: várias linhas coladas) de uma vez.
+
+        Não chama ``ao_registrar``: devolve ``(registros, erros)``, com os
+        pares ``(expressao, resultado)`` válidos, na ordem, e o número de
+        linhas inválidas, para que quem chamou registre tudo de uma vez. O
+        display fica com o último resultado.
+        """
+        registros = []
+        erros = 0
+        for linha in linhas:
+            texto = linha.strip()
+            if not texto:
+                continue
+            try:
+                registros.append((texto, self._avaliar(texto)))
+            except ERROS_CALCULO:
+                erros += 1
+        if registros:
+            self._mostrar(registros[-1][1])
+            self.valor_anterior = None
+            self.operacao = None
+        elif erros:
+            self._erro()
+        return registros, erros
+
+    def igual(self):
+        if self.operacao is None or self.valor_anterior is None:
+            return
+
+        try:
+            atual = self.valor()
+            resultado = self._calcular(self.operacao, self.valor_anterior, atual)
+        except ERROS_CALCULO:
+            self._erro()
+            return
+
+        expr_str = f"{formatar_num(self.valor_anterior)} {self.operacao} {formatar_num(atual)}"
+        self._mostrar(resultado)
+
+        self._registrar(expr_str, resultado)
+
+        self.operacao = None
+        self.valor_anterior = None
@@ -0,0 +1,160 @@
+"""Painel do histórico da janela: modelo de lista e linhas recicláveis.
+
+Importado só quando o painel é montado (depois do primeiro quadro, ou
+antes, se o histórico for usado), junto com o próprio Historico.
+"""
+import gi
+
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gio, GObject, Gtk
+
+CSS = b"""
+    .historico-container {
+        background: #252525;
+        border-left: 2px solid #333;
+    }
+    .historico-header {
+        font-size: 16px;
+        font-weight: bold;
+        color: #ecf0f1;
+        padding: 15px;
+        background: #2c3e50;
+    }
+    .historico-lista {
+        background: transparent;
+    }
+    .historico-row {
+        background: #333;
+        border-radius: 8px;
+        margin: 4px 8px;
+        padding: 8px;
+    }
+    .historico-row:hover {
+        background: #444;
+    }
+    .historico-expr {
+        font-size: 13px;
+        color: #aaa;
+        font-family: monospace;
+    }
+    .historico-res {
+        font-size: 18px;
+        color: #fff;
+        font-family: monospace;
+        font-weight: bold;
+    }
+    .historico-time {
+        font-size: 11px;
+        color: #666;
+        font-family: monospace;
+    }
+    .historico-vazio {
+        color: #666;
+        font-style: italic;
+        padding: 20px;
+    }
+"""
+
+class HistoricoObjeto(GObject.Object):
+    """Item do histórico entregue pelo HistoricoModelo ao ListView"""
+    def __init__(self, item):
+        super().__init__()
+        self.item = item
+
+class HistoricoModelo(GObject.Object, Gio.ListModel):
+    """Gio.ListModel sobre as colunas do Historico.
+
+    Os HistoricoObjeto são criados só quando o ListView pede uma posição
+    (as linhas visíveis), em vez de um objeto por operação.
+    """
+    def __init__(self, historico):
+        super().__init__()
+        self.historico = historico
+
+    def do_get_item_type(self):
+        return HistoricoObjeto.__gtype__
+
+    def do_get_n_items(self):
+        return len(self.historico)
+
+    def do_get_item(self, posicao):
+        if posicao >= len(self.historico):
+            return None
+        return HistoricoObjeto(self.historico[posicao])
+
+class ResultadosModelo(GObject.Object, Gio.ListModel):
+    """Gio.ListModel com as operações encontradas por uma busca, pelas
+    chaves do Historico (ver busca.buscar)"""
+    def __init__(self, historico):
+        super().__init__()
+        self.historico = historico
+        self.chaves = []
+
+    def do_get_item_type(self):
+        return HistoricoObjeto.__gtype__
+
+    def do_get_n_items(self):
+        return len(self.chaves)
+
+    def do_get_item(self, posicao):
+        if posicao >= len(self.chaves):
+            return None
+        return HistoricoObjeto(self.historico.item_da_chave(self.chaves[posicao]))
+
+    def trocar(self, chaves):
+        removidas = len(self.chaves)
+        self.chaves = chaves
+        self.items_changed(0, removidas, len(chaves))
+
+class HistoricoRow(Gtk.Box):
+    """Widget reutilizável para os itens do histórico.
+
+    O Gtk.ListView cria só as linhas visíveis e as recicla durante a
+    rolagem: cada linha é vinculada a um item diferente por ``vincular``.
+    """
+    def __init__(self, parent_window):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        self.item = None
+        self.parent_window = parent_window
+        
+        self.set_margin_top(6)
+        self.set_margin_bottom(6)
+        self.set_margin_start(12)
+        self.set_margin_end(12)
+        
+        # Label da expressão
+        self.label_expr = Gtk.Label()
+        self.label_expr.set_xalign(1.0)
+        self.label_expr.add_css_class("historico-expr")
+        
+        # Label do resultado
+        self.label_res = Gtk.Label()
+        self.label_res.set_xalign(1.0)
+        self.label_res.add_css_class("historico-res")
+        
+        # Label do timestamp
+        self.label_time = Gtk.Label()
+        self.label_time.set_xalign(1.0)
+        self.label_time.add_css_class("historico-time")
+        
+        self.append(self.label_expr)
+        self.append(self.label_res)
+        self.append(self.label_time)
+        
+        # Gesture para detectar clique
+        gesture = Gtk.GestureClick()
+        gesture.connect("pressed", self.on_clicked)
+        self.add_controller(gesture)
+        
+        self.add_css_class("historico-row")
+    
+    def vincular(self, item):
+        """Exibe ``item`` nesta linha (chamado pela fábrica do ListView)"""
+        self.item = item
+        self.label_expr.set_text(item.expressao)
+        self.label_res.set_text(f"= {item.resultado}")
+        self.label_time.set_text(item.data_hora.strftime("%H:%M:%S"))
+    
+    def on_clicked(self, gesture, n_press, x, y):
+        if self.item is not None:
+            self.parent_window.carregar_valor(self.item.valor)
@@ -0,0 +1,317 @@
+"""Histórico persistente em SQLite.
+
+As operações são gravadas num banco SQLite em modo WAL, só por acréscimo,
+com índice por instante. A gravação acontece numa thread própria, em
+lotes (uma transação por lote), de modo que quem chama ``gravar`` nunca
+espera pelo disco. A leitura é paginada do mais recente para o mais
+antigo, pela chave primária: carregar a primeira página custa o mesmo com
+100 ou 10 milhões de registros.
+"""
+import math
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from .historico import HistoricoItem, valor_em_float
+
+TAMANHO_PAGINA = 200
+TAMANHO_LOTE = 1000        # registros por transação
+INTERVALO_LOTE = 0.5       # segundos de espera para juntar um lote
+TAMANHO_BLOCO_LEITURA = 5000
+TENTATIVAS_GRAVACAO = 3    # por lote, antes de desistir dele
+ESPERA_NOVA_TENTATIVA = 0.5  # segundos (multiplicados pela tentativa)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS historico (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    expressao TEXT NOT NULL,
+    valor
+);
+CREATE INDEX IF NOT EXISTS historico_timestamp ON historico (timestamp);
+"""
+
+_LIMPAR = object()
+_FECHAR = object()
+
+_MAIOR_INT64 = 2 ** 63 - 1
+
+
+def caminho_padrao():
+    """Arquivo do histórico em $XDG_DATA_HOME/calc (ou ~/.local/share/calc)"""
+    base = os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share'
+    return Path(base) / 'calc' / 'historico.sqlite3'
+
+
+def valor_para_banco(valor):
+    # Inteiros que não cabem em 64 bits vão como BLOB (bytes com sinal)
+    if type(valor) is int and not -_MAIOR_INT64 <= valor <= _MAIOR_INT64:
+        tamanho = (valor.bit_length() + 8) // 8
+        return valor.to_bytes(tamanho, 'little', signed=True)
+    # O SQLite grava NaN como NULL: floats não finitos vão como texto
+    if type(valor) is float and not math.isfinite(valor):
+        return repr(valor)
+    return valor
+
+
+def valor_do_banco(valor):
+    if isinstance(valor, bytes):
+        return int.from_bytes(valor, 'little', signed=True)
+    if isinstance(valor, str):
+        return float(valor)
+    if valor is None:
+        # NaN gravado antes de ir como texto
+        return math.nan
+    return valor
+
+
+def conectar(caminho):
+    conexao = sqlite3.connect(caminho, check_same_thread=False)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    # Em WAL, NORMAL só faz fsync nos checkpoints
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    return conexao
+
+
+class HistoricoPersistente:
+    """Histórico gravado em disco, com gravação em lote numa thread própria.
+
+    Se um lote não puder ser gravado (disco cheio, banco travado) mesmo
+    após novas tentativas, ele é descartado e ``ao_falhar(erro, quantidade)``
+    é chamado na thread de gravação; sem ``ao_falhar``, o erro vai para a
+    saída de erro. As gravações seguintes continuam normalmente.
+    """
+
+    def __init__(self, caminho=None, ao_falhar=None):
+        self.caminho = Path(caminho) if caminho else caminho_padrao()
+        self.ao_falhar = ao_falhar
+        self.ultimo_erro = None
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        self._leitura = conectar(self.caminho)
+        self._leitura.executescript(_ESQUEMA)
+        self._leitura.commit()
+
+        self._fila = queue.Queue()
+        self._gravador = threading.Thread(
+            target=self._gravar_em_lotes, name="historico-gravador", daemon=True
+        )
+        self._gravador.start()
+
+    # ===== GRAVAÇÃO =====
+
+    def gravar(self, item):
+        """Enfileira um HistoricoItem para gravação (não bloqueia)"""
+        self._fila.put((item.timestamp, item.expressao, valor_para_banco(item.valor)))
+
+    def gravar_lote(self, itens):
+        """Enfileira vários HistoricoItem de uma vez"""
+        for item in itens:
+            self.gravar(item)
+
+    def limpar(self):
+        """Apaga todo o histórico gravado (na ordem das gravações pendentes)"""
+        self._fila.put(_LIMPAR)
+
+    def sincronizar(self):
+        """Espera até que todas as gravações enfileiradas estejam no banco"""
+        self._fila.join()
+
+    def fechar(self):
+        """Grava o que estiver pendente e encerra a thread de gravação"""
+        self._fila.put(_FECHAR)
+        self._gravador.join()
+        self._leitura.close()
+
+    def _gravar_em_lotes(self):
+        conexao = None
+        try:
+            while True:
+                comando = self._fila.get()
+                lote = []
+                try:
+                    while comando is not _FECHAR and comando is not _LIMPAR:
+                        lote.append(comando)
+                        if len(lote) >= TAMANHO_LOTE:
+                            comando = None
+                            break
+                        try:
+                            comando = self._fila.get(timeout=INTERVALO_LOTE)
+                        except queue.Empty:
+                            comando = None
+                            break
+
+                    if lote:
+                        conexao = self._executar(
+                            conexao,
+                            "INSERT INTO historico (timestamp, expressao, valor) VALUES (?, ?, ?)",
+                            lote,
+                        )
+                    if comando is _LIMPAR:
+                        conexao = self._executar(conexao, "DELETE FROM historico")
+                finally:
+                    # Marca como concluídos o lote e o comando que o encerrou,
+                    # mesmo se a gravação falhou: senão sincronizar() não volta
+                    for _ in range(len(lote) + (comando is not None)):
+                        self._fila.task_done()
+                if comando is _FECHAR:
+                    return
+        finally:
+            if conexao is not None:
+                conexao.close()
+
+    def _executar(self, conexao, sql, lote=None):
+        """Executa numa transação, com novas tentativas; devolve a conexão
+        (None se nem conectar foi possível)"""
+        for tentativa in range(1, TENTATIVAS_GRAVACAO + 1):
+            try:
+                if conexao is None:
+                    conexao = conectar(self.caminho)
+                with conexao:
+                    if lote is None:
+                        conexao.execute(sql)
+                    else:
+                        conexao.executemany(sql, lote)
+                return conexao
+            except sqlite3.Error as e:
+                erro = e
+                if tentativa < TENTATIVAS_GRAVACAO:
+                    time.sleep(ESPERA_NOVA_TENTATIVA * tentativa)
+
+        self.ultimo_erro = erro
+        quantidade = len(lote) if lote is not None else 0
+        if self.ao_falhar is not None:
+            self.ao_falhar(erro, quantidade)
+        elif quantidade:
+            print(f"Histórico: {quantidade} operações não gravadas: {erro}", file=sys.stderr)
+        else:
+            print(f"Histórico: falha ao limpar: {erro}", file=sys.stderr)
+        return conexao
+
+    # ===== LEITURA =====
+
+    def carregar_pagina(self, antes_de=None, limite=TAMANHO_PAGINA):
+        """Uma página do histórico, do mais recente para o mais antigo.
+
+        ``antes_de`` é o menor id já carregado (None para a página mais
+        recente). Devolve ``(itens, menor_id)``; ``menor_id`` é None quando
+        não há mais registros.
+        """
+        if antes_de is None:
+            linhas = self._leitura.execute(
+                "SELECT id, timestamp, expressao, valor FROM historico "
+                "ORDER BY id DESC LIMIT ?", (limite,)
+            ).fetchall()
+        else:
+            linhas = self._leitura.execute(
+                "SELECT id, timestamp, expressao, valor FROM historico "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?", (antes_de, limite)
+            ).fetchall()
+        itens = [
+            HistoricoItem(expressao, valor_do_banco(valor), timestamp)
+            for _, timestamp, expressao, valor in linhas
+        ]
+        return itens, (linhas[-1][0] if linhas else None)
+
+    def contar(self, depois_de=0, ate=None):
+        """Número de registros gravados (com conexão própria, como ``iterar``),
+        opcionalmente só os de id em (depois_de, ate]"""
+        conexao = conectar(self.caminho)
+        try:
+            return conexao.execute(
+                "SELECT COUNT(*) FROM historico WHERE id > ? AND id <= ?",
+                (depois_de, _MAIOR_INT64 if ate is None else ate),
+            ).fetchone()[0]
+        finally:
+            conexao.close()
+
+    def ultimo_registro(self):
+        """``(id, timestamp)`` do registro mais recente, ou None se não houver"""
+        conexao = conectar(self.caminho)
+        try:
+            return conexao.execute(
+                "SELECT id, timestamp FROM historico ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        finally:
+            conexao.close()
+
+    def instante_do_registro(self, id_registro):
+        """Timestamp do registro com esse id (None se não existir mais)"""
+        conexao = conectar(self.caminho)
+        try:
+            linha = conexao.execute(
+                "SELECT timestamp FROM historico WHERE id = ?", (id_registro,)
+            ).fetchone()
+            return linha[0] if linha else None
+        finally:
+            conexao.close()
+
+    def iterar(self, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+        """Todos os registros, do mais recente para o mais antigo, em blocos.
+
+        Usa uma conexão própria, então pode ser consumido em outra thread.
+        """
+        conexao = conectar(self.caminho)
+        try:
+            cursor = conexao.execute(
+                "SELECT timestamp, expressao, valor FROM historico ORDER BY id DESC"
+            )
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                for timestamp, expressao, valor in linhas:
+                    yield HistoricoItem(expressao, valor_do_banco(valor), timestamp)
+        finally:
+            conexao.close()
+
+    def colunas(self, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+        """Todos os registros em colunas, do mais recente para o mais antigo,
+        como ``Historico.colunas`` (com conexão própria, como ``iterar``)"""
+        instantes, valores, expressoes = array('d'), array('d'), []
+        conexao = conectar(self.caminho)
+        try:
+            cursor = conexao.execute(
+                "SELECT timestamp, expressao, valor FROM historico ORDER BY id DESC"
+            )
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                bloco_instantes, bloco_expressoes, bloco_valores = zip(*linhas)
+                instantes.extend(bloco_instantes)
+                expressoes.extend(bloco_expressoes)
+                antes = len(valores)
+                try:
+                    valores.extend(bloco_valores)
+                except (TypeError, OverflowError):
+                    # Bloco com inteiros grandes (BLOB): convertidos um a um
+                    del valores[antes:]
+                    valores.extend([valor_em_float(valor_do_banco(v)) for v in bloco_valores])
+        finally:
+            conexao.close()
+        return instantes, valores, expressoes
+
+    def iterar_cronologico(self, depois_de=0, ate=None, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+        """Registros de id em (depois_de, ate], do mais antigo para o mais
+        recente, em blocos e com conexão própria (ver exportacao.exportar_incremental)"""
+        conexao = conectar(self.caminho)
+        try:
+            cursor = conexao.execute(
+                "SELECT timestamp, expressao, valor FROM historico "
+                "WHERE id > ? AND id <= ? ORDER BY id",
+                (depois_de, _MAIOR_INT64 if ate is None else ate),
+            )
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                for timestamp, expressao, valor in linhas:
+                    yield HistoricoItem(expressao, valor_do_banco(valor), timestamp)
+        finally:
+            conexao.close()
@@ -0,0 +1,72 @@
+"""Avaliação em lote das operações da calculadora sobre arrays NumPy.
+
+Aplica as mesmas operações do motor (``+ - × ÷ ^`` e toda função do
+registro de funcoes.py: x², √x, log, ln, eˣ, 10ˣ, sinh, Γ, erf e plugins)
+a arrays inteiros de uma vez. As regras de domínio do motor são
+mantidas: onde o motor mostraria "Erro" (raiz de negativo, log de não
+positivo, divisão por zero, estouro) o resultado é NaN e a máscara de
+erros é verdadeira. Um float que estoura, como ``1e308 × 10``, é erro nos
+dois caminhos.
+
+Usa NumPy, dependência do projeto.
+"""
+from . import funcoes
+
+# Apelidos aceitos -> nome canônico (o mesmo de motor.OPERACOES); funções
+# são procuradas por nome, rótulo ou apelido no registro (funcoes.buscar)
+APELIDOS = {'*': '×', '/': '÷', '**': '^'}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise Exception("Biblioteca numpy não instalada. Execute: uv add numpy")
+    return np
+
+
+def _binarias(np):
+    return {
+        '+': (np.add, None),
+        '-': (np.subtract, None),
+        '×': (np.multiply, None),
+        '÷': (np.divide, lambda a, b: b == 0),
+        '^': (np.power, None),
+    }
+
+
+def avaliar_array(operacao, a, b=None):
+    """Aplica ``operacao`` elemento a elemento.
+
+    ``a`` (e ``b``, nas operações binárias) podem ser arrays ou escalares,
+    combinados segundo as regras de broadcast do NumPy. Devolve a tupla
+    ``(resultado, erros)``: um array float64 com NaN nas posições inválidas
+    e a máscara booleana dessas posições.
+    """
+    np = _numpy()
+    operacao = APELIDOS.get(operacao, operacao)
+
+    binarias = _binarias(np)
+    if operacao in binarias:
+        if b is None:
+            raise ValueError(f"A operação {operacao} precisa de dois operandos")
+        funcao, dominio = binarias[operacao]
+        operandos = (np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    else:
+        registrada = funcoes.buscar(operacao)
+        if registrada is None:
+            raise ValueError(f"Operação desconhecida: {operacao}")
+        funcao, dominio = registrada.vetorizada(np), registrada.fora_do_dominio
+        operandos = (np.asarray(a, dtype=np.float64),)
+
+    with np.errstate(all='ignore'):
+        resultado = np.asarray(funcao(*operandos), dtype=np.float64)
+        # Estouros, NaN de entrada e potências complexas (base negativa com
+        # expoente fracionário) também são erro, como no motor
+        erros = ~np.isfinite(resultado)
+        if dominio is not None:
+            erros |= dominio(*operandos)
+
+    if erros.any():
+        resultado[erros] = np.nan
+    return resultado, erros
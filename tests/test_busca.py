@@ -0,0 +1,81 @@
+import math
+import random
+import re
+import unittest
+
+from calc import busca
+from calc.historico import Historico, HistoricoItem
+
+
+def _buscar_por_forca_bruta(historico, texto):
+    """Todas as chaves que casam com a consulta, da mais recente à mais antiga"""
+    consulta = busca.Consulta(texto)
+    padroes = [re.compile(rf"(?<![\d.]){re.escape(n)}(?![\d.])") for n in consulta.numeros]
+    recentes, antigos = historico.tamanhos()
+    encontradas = []
+    for chave in [*range(recentes - 1, -1, -1), *range(-1, -1 - antigos, -1)]:
+        item = historico.item_da_chave(chave)
+        palavras = busca.palavras(item.expressao)
+        if not all(any(p.startswith(prefixo) for p in palavras) for prefixo in consulta.palavras):
+            continue
+        if not all(padrao.search(item.expressao) for padrao in padroes):
+            continue
+        if consulta.resultado is not None:
+            minimo, maximo, inclui_minimo, inclui_maximo = consulta.resultado
+            valor = busca._como_float(item.valor)
+            if not ((minimo < valor or (inclui_minimo and valor == minimo))
+                    and (valor < maximo or (inclui_maximo and valor == maximo))):
+                continue
+        if consulta.periodo is not None and not consulta.periodo[0] <= item.timestamp <= consulta.periodo[1]:
+            continue
+        encontradas.append(chave)
+    return encontradas
+
+
+class TestBusca(unittest.TestCase):
+    def setUp(self):
+        aleatorio = random.Random(7)
+        modelos = ["log({})", "{}+{}", "sin({})×2", "√{}", "sqrt({})^2", "{}.5*{}", "ln({})"]
+        self.historico = Historico()
+        inicio = 1_750_000_000.0
+        self.historico.acrescentar_antigos(
+            HistoricoItem(
+                aleatorio.choice(modelos).format(aleatorio.randrange(200), aleatorio.randrange(50)),
+                aleatorio.choice([aleatorio.uniform(-1000, 1000), aleatorio.randrange(100), math.nan, 10 ** 400]),
+                inicio - i,
+            )
+            for i in range(1, 1500)
+        )
+        for i in range(2500):
+            self.historico.adicionar(
+                aleatorio.choice(modelos).format(aleatorio.randrange(200), aleatorio.randrange(50)),
+                aleatorio.choice([aleatorio.uniform(-1000, 1000), aleatorio.randrange(100), -10 ** 400]),
+                inicio + i,
+            )
+        self.consultas = [
+            "log", "s", "sin 12", "log 7", "99", "= 42", "> 500", "<= 0", "entre 10 e 20",
+            "sqrt > 0", "ln 3 < 100", "√", "7.5", "sin entre -100 e 100", "log sin",
+            "> 2025-06-15", "log entre 2025-06-01 e 2025-06-16", "12 > 1000",
+        ]
+
+    def _conferir(self):
+        for consulta in self.consultas:
+            esperado = _buscar_por_forca_bruta(self.historico, consulta)
+            for limite in (1, 10, 1000):
+                total, chaves = busca.buscar(self.historico, consulta, limite)
+                self.assertEqual(total, len(esperado), consulta)
+                self.assertEqual(chaves, esperado[:limite], consulta)
+
+    def test_igual_a_forca_bruta(self):
+        self._conferir()
+
+    def test_indice_em_partes_e_acrescimos(self):
+        while not self.historico.indexar(300):
+            self.historico.adicionar("log(5)", 5, 1_760_000_000.0)
+        self.historico.adicionar("sin(12)×2", 24, 1_760_000_001.0)
+        self.historico.acrescentar_antigos([HistoricoItem("log(7)", 7, 1_700_000_000.0)])
+        self._conferir()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from calc.cache import CacheResultados
+
+
+class TestCacheEmDisco(unittest.TestCase):
+    def setUp(self):
+        self._pasta = tempfile.TemporaryDirectory()
+        self.arquivo = os.path.join(self._pasta.name, 'resultados.sqlite3')
+        self.chamadas = 0
+
+    def tearDown(self):
+        self._pasta.cleanup()
+
+    def _potencia(self, expoente):
+        self.chamadas += 1
+        return 3 ** expoente
+
+    def test_resultado_volta_do_disco_em_outra_sessao(self):
+        cache = CacheResultados(self.arquivo, limiar=0)
+        cache.abrir_disco()
+        self.assertEqual(cache.calcular(('^', 3, 5000), self._potencia, 5000), 3 ** 5000)
+        cache.fechar()
+
+        cache = CacheResultados(self.arquivo, limiar=0)
+        # Antes de o disco estar pronto, a consulta não espera: recalcula
+        self.assertEqual(cache.calcular(('^', 3, 5000), self._potencia, 5000), 3 ** 5000)
+        self.assertTrue(cache._pronto.wait(5))
+        cache._memoria.clear()
+        self.assertEqual(cache.calcular(('^', 3, 5000), self._potencia, 5000), 3 ** 5000)
+        self.assertEqual(cache.acertos_disco, 1)
+        cache.fechar()
+        self.assertIsNone(cache.erro_disco)
+
+    def test_limpar(self):
+        cache = CacheResultados(self.arquivo, limiar=0)
+        cache.calcular(('^', 3, 7), self._potencia, 7)
+        cache.limpar()
+        cache.fechar()
+
+        cache = CacheResultados(self.arquivo, limiar=0)
+        cache.abrir_disco()
+        self.assertTrue(cache._pronto.wait(5))
+        self.assertEqual(cache.estatisticas()['itens_disco'], 0)
+        self.assertEqual(cache.estatisticas()['bytes_disco'], 0)
+        cache.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from calc.exportacao import ExportacaoCancelada, exportar_incremental
+from calc.historico import HistoricoItem
+from calc.persistencia import HistoricoPersistente
+
+
+class TestExportacaoIncremental(unittest.TestCase):
+    def setUp(self):
+        self._pasta = tempfile.TemporaryDirectory()
+        self.pasta = self._pasta.name
+        self.persistencia = HistoricoPersistente(os.path.join(self.pasta, 'h.sqlite3'))
+        for i in range(5):
+            self.persistencia.gravar(HistoricoItem(f"{i}+1", i + 1, 1000.0 + i))
+
+    def tearDown(self):
+        self.persistencia.fechar()
+        self._pasta.cleanup()
+
+    def test_acrescenta_so_o_novo(self):
+        arquivo = os.path.join(self.pasta, 'h.csv')
+        self.assertEqual(exportar_incremental(self.persistencia, 'csv', arquivo), 5)
+        self.assertEqual(exportar_incremental(self.persistencia, 'csv', arquivo), 0)
+        self.persistencia.gravar(HistoricoItem("9*9", 81, 2000.0))
+        self.assertEqual(exportar_incremental(self.persistencia, 'csv', arquivo), 1)
+        with open(arquivo, encoding='utf-8') as f:
+            linhas = f.read().splitlines()
+        self.assertEqual(len(linhas), 7)
+        self.assertTrue(linhas[-1].startswith("6,"))
+
+    def test_reescrita_cancelada_preserva_o_arquivo(self):
+        arquivo = os.path.join(self.pasta, 'h.jsonl')
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            f.write("exportação anterior\n")
+        cancelar = threading.Event()
+        cancelar.set()
+        with self.assertRaises(ExportacaoCancelada):
+            exportar_incremental(self.persistencia, 'jsonl', arquivo, cancelar=cancelar)
+        with open(arquivo, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "exportação anterior\n")
+        self.assertFalse(os.path.exists(arquivo + ".tmp"))
+
+
+if __name__ == '__main__':
+    unittest.main()
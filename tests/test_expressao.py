@@ -0,0 +1,37 @@
+import unittest
+
+from calc import expressao
+from calc.cli import avaliar_linha
+
+
+class TestAninhamento(unittest.TestCase):
+    def test_parenteses_demais(self):
+        texto = "(" * 600 + "1" + ")" * 600
+        with self.assertRaises(expressao.ErroSintaxe):
+            expressao.avaliar(texto)
+        self.assertEqual(avaliar_linha(texto), "Erro")
+
+    def test_menos_unarios_demais(self):
+        texto = "-" * 5000 + "1"
+        with self.assertRaises(expressao.ErroSintaxe):
+            expressao.avaliar(texto)
+        self.assertEqual(avaliar_linha(texto), "Erro")
+
+    def test_dentro_do_limite(self):
+        profundidade = expressao.MAXIMO_ANINHAMENTO - 1
+        self.assertEqual(expressao.avaliar("(" * profundidade + "2" + ")" * profundidade), 2)
+        self.assertEqual(expressao.avaliar("-" * 150 + "1"), 1)
+
+    def test_cadeias_longas(self):
+        self.assertEqual(avaliar_linha("+".join(["1"] * 5000)), "5000")
+        self.assertEqual(expressao.avaliar("*".join(["2"] * 5000)), 2 ** 5000)
+        self.assertEqual(expressao.avaliar("1" + "-1+2*3/3" * 3000), 3001)
+
+    def test_precedencia_nas_cadeias(self):
+        self.assertEqual(expressao.avaliar("1-2*3+4"), -1)
+        self.assertEqual(expressao.avaliar("2^3^2-10/5/2"), 511)
+        self.assertEqual(expressao.avaliar("-2^2+8/2*2"), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import math
+import random
+import unittest
+
+from calc.formatacao import DISPLAY, EXATO
+
+
+class TestIdaEVolta(unittest.TestCase):
+    def _valores(self):
+        aleatorio = random.Random(5)
+        yield from (0.0, -0.0, 1.0, -3.0, 0.1 + 0.2, 1e15, 1e16, 1e-4, 5e-324, 1.7976931348623157e308)
+        for _ in range(20000):
+            yield aleatorio.choice((1, -1)) * aleatorio.random() * 10.0 ** aleatorio.randint(-320, 308)
+
+    def test_exato(self):
+        valores = list(self._valores())
+        for valor, texto in zip(valores, EXATO.lote(valores)):
+            self.assertEqual(EXATO(valor), texto)
+            self.assertEqual(float(texto), valor, texto)
+            self.assertEqual(math.copysign(1.0, float(texto)), math.copysign(1.0, valor), texto)
+
+    def test_display(self):
+        self.assertEqual(DISPLAY(-0.0), "0")
+        self.assertEqual(DISPLAY(0.1 + 0.2), "0.3")
+        self.assertEqual(EXATO(-0.0), "-0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from calc import expressao, funcoes, inteiros, motor
+
+
+class TestQuadrado(unittest.TestCase):
+    def test_inteiro_exato(self):
+        self.assertEqual(funcoes.obter('quadrado').aplicar(10 ** 30), 10 ** 60)
+        self.assertEqual(expressao.avaliar("sqr(2^100)"), 2 ** 200)
+
+    def test_limite_de_tamanho(self):
+        # Mesmo limite de x^2: não calcula um inteiro com mais de LIMITE_BITS bits
+        grande = 1 << (inteiros.LIMITE_BITS // 2 + 1)
+        with self.assertRaises(OverflowError):
+            funcoes.obter('quadrado').aplicar(grande)
+        with self.assertRaises(OverflowError):
+            funcoes.obter('quadrado').aplicar(1e200)
+
+
+class TestHistoricoReutilizavel(unittest.TestCase):
+    def test_rotulo_do_historico_volta_como_expressao(self):
+        # Uma linha do histórico digitada de novo dá o mesmo resultado
+        for funcao in funcoes.com_botao():
+            for valor in ("3", "0.5"):
+                registros = []
+                teclado = motor.MotorCalculadora(ao_registrar=lambda e, r: registros.append(e))
+                teclado.carregar(motor.para_numero(valor))
+                teclado.aplicar_funcao(funcao.nome)
+                self.assertEqual(len(registros), 1, funcao)
+
+                digitado = motor.MotorCalculadora()
+                digitado.avaliar_expressao(registros[0])
+                self.assertEqual(digitado.valor_atual, teclado.valor_atual, registros[0])
+                self.assertNotEqual(digitado.valor_atual, "Erro", registros[0])
+
+
+class TestProduto(unittest.TestCase):
+    def test_limite_de_tamanho(self):
+        with self.assertRaises(OverflowError):
+            expressao.avaliar("(2^16000000)*(2^16000000)")
+        with self.assertRaises(OverflowError):
+            motor.OPERACOES['×'](-(1 << inteiros.LIMITE_BITS), 3)
+
+    def test_dentro_do_limite(self):
+        self.assertEqual(motor.OPERACOES['×'](2 ** 5000, -(3 ** 100)), -(2 ** 5000) * 3 ** 100)
+        self.assertEqual(motor.OPERACOES['×'](2.5, 4), 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
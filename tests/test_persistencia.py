@@ -0,0 +1,66 @@
+import math
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from calc import persistencia
+from calc.historico import Historico, HistoricoItem
+from calc.persistencia import HistoricoPersistente, valor_do_banco, valor_para_banco
+
+
+class TestValoresNoBanco(unittest.TestCase):
+    def test_ida_e_volta(self):
+        for valor in (0, -7, 2.5, 2 ** 63, -(10 ** 400), math.inf, -math.inf):
+            self.assertEqual(valor_do_banco(valor_para_banco(valor)), valor)
+        self.assertTrue(math.isnan(valor_do_banco(valor_para_banco(math.nan))))
+
+    def test_nan_gravado_e_recarregado(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            persistencia = HistoricoPersistente(os.path.join(pasta, 'h.sqlite3'))
+            for expressao, valor in (("1e308*10-1e308*10", math.nan),
+                                     ("1e308*10", math.inf), ("-1e308*10", -math.inf)):
+                persistencia.gravar(HistoricoItem(expressao, valor, 1.0))
+            persistencia.sincronizar()
+
+            itens, _ = persistencia.carregar_pagina()
+            valores = [item.valor for item in itens]
+            self.assertEqual(valores[:2], [-math.inf, math.inf])
+            self.assertTrue(math.isnan(valores[2]))
+
+            historico = Historico()
+            historico.acrescentar_antigos(itens)
+            self.assertTrue(math.isnan(historico[2].valor))
+
+            _, colunas_valores, _ = persistencia.colunas()
+            self.assertEqual(list(colunas_valores[:2]), [-math.inf, math.inf])
+            self.assertTrue(math.isnan(colunas_valores[2]))
+            persistencia.fechar()
+
+
+class TestFalhaNaGravacao(unittest.TestCase):
+    @mock.patch.object(persistencia, 'ESPERA_NOVA_TENTATIVA', 0)
+    def test_lote_com_erro_nao_trava_nem_para_a_gravacao(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            falhas = []
+            banco = HistoricoPersistente(os.path.join(pasta, 'h.sqlite3'),
+                                         ao_falhar=lambda erro, n: falhas.append(n))
+            banco._leitura.execute("DROP TABLE historico")
+            banco.gravar(HistoricoItem("1+1", 2, 1.0))
+
+            sincronizado = threading.Thread(target=banco.sincronizar, daemon=True)
+            sincronizado.start()
+            sincronizado.join(timeout=10)
+            self.assertFalse(sincronizado.is_alive())
+            self.assertEqual(falhas, [1])
+
+            banco._leitura.executescript(persistencia._ESQUEMA)
+            banco.gravar(HistoricoItem("2+2", 4, 2.0))
+            banco.sincronizar()
+            self.assertEqual([item.expressao for item in banco.carregar_pagina()[0]], ["2+2"])
+            banco.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()
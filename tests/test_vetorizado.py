@@ -0,0 +1,55 @@
+import math
+import unittest
+
+from calc import funcoes, motor
+from calc.vetorizado import avaliar_array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _escalar(operacao, a, b=None):
+    """Resultado do motor como float, ou NaN onde o motor mostraria "Erro" """
+    try:
+        if b is None:
+            return float(motor.aplicar(operacao, a))
+        return float(motor.calcular(operacao, a, b))
+    except motor.ERROS_CALCULO:
+        return math.nan
+
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TestIgualAoMotor(unittest.TestCase):
+    VALORES = (0.0, -2.5, 0.5, 3.0, 700.0, 1e154, 1e200, 1e308, -1e308, 1.5e-308)
+
+    def _conferir(self, operacao, resultado, erros, esperado):
+        for obtido, erro, valor in zip(resultado, erros, esperado):
+            if math.isnan(valor):
+                self.assertTrue(erro, operacao)
+            else:
+                self.assertFalse(erro, operacao)
+                self.assertAlmostEqual(obtido, valor, delta=abs(valor) * 1e-12)
+
+    def test_operacoes_com_estouro(self):
+        a = [x for x in self.VALORES for _ in self.VALORES]
+        b = [y for _ in self.VALORES for y in self.VALORES]
+        for operacao in motor.OPERACOES:
+            resultado, erros = avaliar_array(operacao, np.array(a), np.array(b))
+            self._conferir(operacao, resultado, erros,
+                           [_escalar(operacao, x, y) for x, y in zip(a, b)])
+
+    def test_funcoes_com_estouro(self):
+        for funcao in funcoes.com_botao():
+            resultado, erros = avaliar_array(funcao.nome, np.array(self.VALORES))
+            self._conferir(funcao.nome, resultado, erros,
+                           [_escalar(funcao.nome, x) for x in self.VALORES])
+
+    def test_exemplo(self):
+        self.assertTrue(avaliar_array('×', np.array([1e308]), 10)[1][0])
+        self.assertTrue(math.isnan(_escalar('×', 1e308, 10)))
+
+
+if __name__ == '__main__':
+    unittest.main()